@@ -0,0 +1,149 @@
+#    VenviPy - A Virtual Environment Manager for Python.
+#    Copyright (C) 2021 - Youssef Serestou - sinusphi.sq@gmail.com
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License or any
+#    later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of the GNU General Public License version 3 named LICENSE is
+#    in the root directory of VenviPy.
+#    If not, see <https://www.gnu.org/licenses/licenses.en.html#GPL>.
+
+# -*- coding: utf-8 -*-
+"""
+Benchmark of reading the METADATA of installed packages (user-035).
+
+Copies the METADATA files of the running interpreter's packages into
+synthetic dist-infos (every 10th one padded to ~2 MiB, like boto3 or
+botocore) and times the former `readlines()` parser against
+`get_data.read_metadata_headers()`. Rows are checked against
+`email.parser`.
+
+    python benchmarks/bench_metadata.py [--dists 500] [--repeat 5]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import importlib.metadata
+from email.parser import HeaderParser
+from pathlib import Path
+
+# keep the catalog and `py-installs` away from the real home
+os.environ["HOME"] = tempfile.mkdtemp(prefix="venvipy-bench-home-")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "venvipy"))
+
+import get_data  # noqa: E402
+
+
+PADDING = "Lorem ipsum: dolor sit amet. Name: not this one\n"
+
+
+def source_metadata():
+    texts = []
+    for dist in importlib.metadata.distributions():
+        text = dist.read_text("METADATA")
+        if text and "\n\n" in text:
+            texts.append(text)
+    if not texts:
+        sys.exit("no METADATA files found to copy")
+    return texts
+
+
+def make_dists(root, count):
+    texts = source_metadata()
+    for i in range(count):
+        dist_info = root / f"pkg{i:04d}-1.0.dist-info"
+        dist_info.mkdir()
+        text = texts[i % len(texts)]
+        if i % 10 == 0:
+            text += PADDING * (2 * 1024 ** 2 // len(PADDING))
+        (dist_info / "METADATA").write_text(text, encoding="utf-8")
+
+
+def old_parser(meta_file):
+    """The former parser: `readlines()` and substring matches.
+    """
+    with open(meta_file, "r", encoding="utf-8") as f:
+        meta_data = f.readlines()
+
+    pkg_name = ""
+    pkg_version = ""
+    pkg_info_2 = ""
+    pkg_summary = ""
+    for line in meta_data:
+        if "Name: " in line:
+            pkg_name = line[5:].strip()
+        if "Version: " in line:
+            pkg_version = line[8:].strip()
+        if "Author: " in line:
+            pkg_info_2 = line[7:].strip()
+        if "Summary: " in line:
+            pkg_summary = line[8:].strip()
+    return pkg_name, pkg_version, pkg_info_2, pkg_summary
+
+
+def new_parser(meta_file):
+    headers = get_data.read_metadata_headers(meta_file)
+    return tuple(
+        headers.get(field, [""])[0]
+        for field in ("name", "version", "author", "summary")
+    )
+
+
+def expected_row(meta_file):
+    with open(meta_file, "r", encoding="utf-8") as f:
+        message = HeaderParser().parse(f)
+    return tuple(
+        " ".join((message.get(field) or "").split())
+        for field in ("Name", "Version", "Author", "Summary")
+    )
+
+
+def normalized(row):
+    return tuple(" ".join(value.split()) for value in row)
+
+
+def measure(name, parser, meta_files, expected, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = [parser(meta_file) for meta_file in meta_files]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    wrong = sum(
+        normalized(row) != want for row, want in zip(rows, expected)
+    )
+    print(f"{name:<22} {best:.3f} s  ({wrong} of {len(rows)} rows wrong)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dists", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="venvipy-bench-") as tmp:
+        root = Path(tmp)
+        make_dists(root, args.dists)
+        meta_files = sorted(root.glob("*.dist-info/METADATA"))
+        total = sum(f.stat().st_size for f in meta_files) / 1024 ** 2
+        print(f"{len(meta_files)} dist-infos, {total:.1f} MiB, "
+              f"best of {args.repeat}")
+
+        expected = [expected_row(meta_file) for meta_file in meta_files]
+        measure("old readlines parser", old_parser, meta_files, expected,
+                args.repeat)
+        measure("header-only parser", new_parser, meta_files, expected,
+                args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#    VenviPy - A Virtual Environment Manager for Python.
+#    Copyright (C) 2021 - Youssef Serestou - sinusphi.sq@gmail.com
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License or any
+#    later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of the GNU General Public License version 3 named LICENSE is
+#    in the root directory of VenviPy.
+#    If not, see <https://www.gnu.org/licenses/licenses.en.html#GPL>.
+
+# -*- coding: utf-8 -*-
+"""
+Benchmark of listing the installed packages of a venv (user-036).
+
+Builds a site-packages directory of synthetic dist-infos and times a
+serial read of every METADATA file against the thread pool behind
+`get_data.iter_installed_packages()`, with the packages snapshot
+removed before each run. `--latency` adds a delay to every METADATA
+read, to mimic network storage.
+
+    python benchmarks/bench_package_scan.py [--dists 500] [--latency 0.005]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# keep the catalog and the packages snapshots away from the real home
+os.environ["HOME"] = tempfile.mkdtemp(prefix="venvipy-bench-home-")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "venvipy"))
+
+import get_data  # noqa: E402
+
+
+METADATA = (
+    "Metadata-Version: 2.1\n"
+    "Name: pkg{i:04d}\n"
+    "Version: 1.{i}\n"
+    "Summary: Package number {i}\n"
+    "Author: Someone\n"
+    "\n"
+    "A long description.\n"
+)
+
+
+def make_site_packages(root, count):
+    for i in range(count):
+        dist_info = root / f"pkg{i:04d}-1.{i}.dist-info"
+        dist_info.mkdir()
+        (dist_info / "METADATA").write_text(
+            METADATA.format(i=i), encoding="utf-8"
+        )
+
+
+def add_latency(delay):
+    read_metadata_headers = get_data.read_metadata_headers
+
+    def slow_read(meta_file):
+        time.sleep(delay)
+        return read_metadata_headers(meta_file)
+
+    get_data.read_metadata_headers = slow_read
+
+
+def serial_scan(site_packages):
+    """The former way: read every dist-info one after the other.
+    """
+    start = time.perf_counter()
+    rows = []
+    for entry in sorted(os.listdir(site_packages)):
+        if entry.endswith(".dist-info"):
+            pkg_info = get_data.read_package_info(site_packages / entry)
+            if pkg_info is not None:
+                rows.append(pkg_info)
+    elapsed = time.perf_counter() - start
+    # the table was filled only once all of them were read
+    return elapsed, elapsed, len(rows)
+
+
+def pool_scan(site_packages, max_workers):
+    get_data._snapshot_file(site_packages).unlink(missing_ok=True)
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in get_data._iter_location_packages(site_packages, max_workers):
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    return time.perf_counter() - start, first, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dists", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=get_data.SCAN_WORKERS)
+    args = parser.parse_args()
+
+    if args.latency:
+        add_latency(args.latency)
+
+    with tempfile.TemporaryDirectory(prefix="venvipy-bench-") as tmp:
+        site_packages = Path(tmp)
+        make_site_packages(site_packages, args.dists)
+        print(f"{args.dists} dist-infos, {args.latency * 1000:g} ms per "
+              f"file, {args.workers} workers")
+
+        for name, scan in (
+                ("serial", lambda: serial_scan(site_packages)),
+                ("pool", lambda: pool_scan(site_packages, args.workers))
+        ):
+            total, first, count = scan()
+            print(f"{name:<8} first row {first:.3f} s, all {total:.3f} s "
+                  f"({count} packages)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#    VenviPy - A Virtual Environment Manager for Python.
+#    Copyright (C) 2021 - Youssef Serestou - sinusphi.sq@gmail.com
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License or any
+#    later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of the GNU General Public License version 3 named LICENSE is
+#    in the root directory of VenviPy.
+#    If not, see <https://www.gnu.org/licenses/licenses.en.html#GPL>.
+
+# -*- coding: utf-8 -*-
+"""
+Benchmark of installing a requirements file with pip and uv (user-049).
+
+Creates a new venv for every run and installs the requirements through
+`manage_pip.PipManager` with `--no-index --find-links <dir>`, once with
+pip and once with uv (`VENVIPY_UV`). The first uv run starts with an
+empty uv cache, the later ones reuse it. The shared wheelhouse is
+turned off, so both backends read the same local directory.
+
+    python benchmarks/bench_uv_install.py requirements.txt \\
+        --find-links wheels/ [--runs 2] [--uv /path/to/uv]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+# keep the catalog, the wheelhouse and the pip helpers away from the
+# real home
+os.environ["HOME"] = tempfile.mkdtemp(prefix="venvipy-bench-home-")
+os.environ["VENVIPY_WHEELHOUSE"] = "0"
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "venvipy"))
+
+from PyQt6.QtCore import QEventLoop  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+import manage_pip  # noqa: E402
+
+
+def install(venv_dir, requirements, find_links):
+    """Install `requirements` into a new venv, return the time taken.
+    """
+    shutil.rmtree(venv_dir, ignore_errors=True)
+    subprocess.run(
+        [sys.executable, "-m", "venv", str(venv_dir)],
+        check=True
+    )
+
+    manager = manage_pip.PipManager(str(venv_dir.parent), venv_dir.name)
+    output = []
+    manager.text_changed.connect(output.append)
+    loop = QEventLoop()
+    manager.finished.connect(loop.quit)
+    manager.failed.connect(loop.quit)
+
+    start = time.perf_counter()
+    manager.run_pip("install", [
+        "--no-index", "--find-links", str(find_links), "-r", str(requirements)
+    ])
+    loop.exec()
+    elapsed = time.perf_counter() - start
+
+    text = "".join(output)
+    fallback = "running pip instead" in text
+    return elapsed, manager.exit_code, fallback
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("requirements", type=Path)
+    parser.add_argument("--find-links", type=Path, required=True)
+    parser.add_argument("--runs", type=int, default=2)
+    parser.add_argument("--backend", choices=("both", "pip", "uv"),
+                        default="both")
+    parser.add_argument("--uv", help="uv binary (default: uv on PATH)")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    if args.uv:
+        manage_pip._uv_path = args.uv
+    if args.backend != "pip" and manage_pip.find_uv() is None:
+        sys.exit("uv not found, pass --uv or use --backend pip")
+
+    backends = ["pip", "uv"] if args.backend == "both" else [args.backend]
+    with tempfile.TemporaryDirectory(prefix="venvipy-bench-") as tmp:
+        os.environ["UV_CACHE_DIR"] = os.path.join(tmp, "uv-cache")
+        venv_dir = Path(tmp) / "venvs" / "bench"
+        for backend in backends:
+            os.environ["VENVIPY_UV"] = "install" if backend == "uv" else "0"
+            for run in range(args.runs):
+                elapsed, exit_code, fallback = install(
+                    venv_dir, args.requirements, args.find_links
+                )
+                label = backend
+                if backend == "uv":
+                    label += " (cold cache)" if run == 0 else " (warm cache)"
+                note = ", fell back to pip" if fallback else ""
+                print(f"{label:<16} {elapsed:6.2f} s  (exit code "
+                      f"{exit_code}{note})")
+
+    manage_pip.shutdown_pip_helpers()
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#    VenviPy - A Virtual Environment Manager for Python.
+#    Copyright (C) 2021 - Youssef Serestou - sinusphi.sq@gmail.com
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License or any
+#    later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of the GNU General Public License version 3 named LICENSE is
+#    in the root directory of VenviPy.
+#    If not, see <https://www.gnu.org/licenses/licenses.en.html#GPL>.
+
+# -*- coding: utf-8 -*-
+"""
+Benchmark of filling and sorting the venv table model (user-030).
+
+Times populating and sorting `tables.VenvModel` against the former
+`QStandardItemModel` filled with `insertRow(0)` and one `QStandardItem`
+per cell. The memory is the growth of the resident set size (Linux
+only), so run each model in a separate process for clean numbers.
+
+    python benchmarks/bench_venv_model.py [--rows 5000] [--model both]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# keep the catalog and `py-installs` away from the real home
+os.environ["HOME"] = tempfile.mkdtemp(prefix="venvipy-bench-home-")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "venvipy"))
+
+from PyQt6.QtCore import Qt  # noqa: E402
+from PyQt6.QtGui import QStandardItem, QStandardItemModel  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+import get_data  # noqa: E402
+from tables import VenvModel  # noqa: E402
+
+
+def rss_mib():
+    """Return the resident set size in MiB, `None` if unknown.
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+
+def venv_infos(rows):
+    return [
+        get_data.VenvInfo(
+            f"venv-{(i * 7919) % rows:06d}",
+            f"Python 3.{8 + i % 6}.{i % 10}",
+            "isolated" if i % 3 else "global",
+            "yes" if i % 5 else "no",
+            f"comment {i}" if i % 4 == 0 else ""
+        )
+        for i in range(rows)
+    ]
+
+
+def fill_standard_model(infos):
+    """The former way: one `QStandardItem` per cell, rows prepended.
+    """
+    model = QStandardItemModel(0, 5)
+    for info in infos:
+        model.insertRow(0)
+        for i, text in enumerate((
+                info.venv_name,
+                info.venv_version,
+                info.site_packages,
+                info.is_installed,
+                info.venv_comment
+        )):
+            model.setItem(0, i, QStandardItem(text))
+    model.sort(0, Qt.SortOrder.AscendingOrder)
+    return model
+
+
+def fill_venv_model(infos):
+    model = VenvModel()
+    model.add_venvs(infos)
+    model.sort(0, Qt.SortOrder.AscendingOrder)
+    return model
+
+
+def measure(name, fill, infos):
+    before = rss_mib()
+    start = time.perf_counter()
+    model = fill(infos)
+    elapsed = time.perf_counter() - start
+    after = rss_mib()
+    memory = "" if before is None else f" / +{after - before:.1f} MiB"
+    print(f"{name:<20} {len(infos):>7} rows  {elapsed:.3f} s{memory}")
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument(
+        "--model", choices=("both", "standard", "venv"), default="both"
+    )
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    infos = venv_infos(args.rows)
+    # keep the models alive until the end, so neither is measured freeing
+    models = []
+    if args.model in ("both", "standard"):
+        models.append(measure("QStandardItemModel", fill_standard_model, infos))
+    if args.model in ("both", "venv"):
+        models.append(measure("VenvModel", fill_venv_model, infos))
+    del app
+
+
+if __name__ == "__main__":
+    main()
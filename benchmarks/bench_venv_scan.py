@@ -0,0 +1,131 @@
+#    VenviPy - A Virtual Environment Manager for Python.
+#    Copyright (C) 2021 - Youssef Serestou - sinusphi.sq@gmail.com
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License or any
+#    later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of the GNU General Public License version 3 named LICENSE is
+#    in the root directory of VenviPy.
+#    If not, see <https://www.gnu.org/licenses/licenses.en.html#GPL>.
+
+# -*- coding: utf-8 -*-
+"""
+Benchmark of scanning a directory for venvs (user-027).
+
+Builds a synthetic tree of venvs (a `pyvenv.cfg` each) and plain
+directories, then times the former `os.listdir()` loop, which opened
+`pyvenv.cfg` once per field, against `get_data.iter_venvs()` with cold
+and warm caches.
+
+    python benchmarks/bench_venv_scan.py [--venvs 5000] [--dirs 500]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# keep the catalog and `py-installs` away from the real home
+os.environ["HOME"] = tempfile.mkdtemp(prefix="venvipy-bench-home-")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "venvipy"))
+
+import get_data  # noqa: E402
+
+
+PYVENV_CFG = (
+    "home = /usr/bin\n"
+    "include-system-site-packages = false\n"
+    "version = 3.11.7\n"
+)
+
+
+def make_tree(root, venvs, dirs):
+    for i in range(venvs):
+        venv_dir = root / f"venv-{i:05d}"
+        venv_dir.mkdir()
+        (venv_dir / "pyvenv.cfg").write_text(PYVENV_CFG, encoding="utf-8")
+    for i in range(dirs):
+        (root / f"dir-{i:05d}").mkdir()
+
+
+def read_cfg(cfg_file):
+    with open(cfg_file, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    config = {}
+    for line in lines:
+        if "=" in line:
+            key, value = line.split("=", 1)
+            config[key.strip().lower()] = value.strip()
+    return config
+
+
+def baseline_scan(path):
+    """The former loop: `listdir()`, `isdir()`, one read per field.
+    """
+    found = []
+    for venv in os.listdir(path):
+        venv_dir = os.path.join(path, venv)
+        if not os.path.isdir(venv_dir):
+            continue
+        cfg_file = os.path.join(venv_dir, "pyvenv.cfg")
+        if not os.path.isfile(cfg_file):
+            continue
+        fields = [read_cfg(cfg_file) for _ in range(3)]
+        try:
+            with open(os.path.join(venv_dir, "venvipy.cfg"), "r") as f:
+                comment = f.read()
+        except OSError:
+            comment = ""
+        found.append((venv, fields, comment))
+    return found
+
+
+def scan(path):
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in get_data.iter_venvs(path):
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    return time.perf_counter() - start, first, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--venvs", type=int, default=5000)
+    parser.add_argument("--dirs", type=int, default=500)
+    args = parser.parse_args()
+
+    # the interpreter list is built once on the first start, not per scan
+    get_data.ensure_dbfile()
+
+    with tempfile.TemporaryDirectory(prefix="venvipy-bench-") as tmp:
+        root = Path(tmp)
+        make_tree(root, args.venvs, args.dirs)
+
+        start = time.perf_counter()
+        count = len(baseline_scan(root))
+        print(f"baseline loop      {time.perf_counter() - start:.3f} s "
+              f"({count} venvs)")
+
+        get_data._venv_config_cache.clear()
+        total, first, count = scan(root)
+        print(f"iter_venvs cold    {total:.3f} s, first record after "
+              f"{first:.3f} s ({count} venvs)")
+
+        total, first, count = scan(root)
+        print(f"iter_venvs warm    {total:.3f} s, first record after "
+              f"{first:.3f} s ({count} venvs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Test setup: the modules of VenviPy import each other by their plain
+names and keep their data in `~/.venvipy`, so the package directory is
+put on `sys.path` and the home directory is redirected to a temporary
+one before anything gets imported.
+"""
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import pytest
+
+
+_HOME = tempfile.mkdtemp(prefix="venvipy-tests-")
+os.environ["HOME"] = _HOME
+os.environ["USERPROFILE"] = _HOME
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# an empty interpreter list, so scans don't search for interpreters
+(Path(_HOME) / ".venvipy").mkdir()
+(Path(_HOME) / ".venvipy" / "py-installs").write_text("", encoding="utf-8")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "venvipy"))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The `QApplication` of the tests using Qt objects and signals.
+    """
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def wait_until(qapp):
+    """
+    Return a function processing Qt events until `condition()` is true,
+    failing the test after `timeout` seconds.
+    """
+    def wait_until(condition, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, "timed out"
+            qapp.processEvents()
+            time.sleep(0.005)
+    return wait_until
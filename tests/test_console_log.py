@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of indexing the lines of console log files (`ConsoleLogModel`).
+"""
+import pytest
+from PyQt6.QtCore import QModelIndex, Qt
+
+from dialogs import ConsoleLogModel
+
+
+@pytest.fixture
+def open_log(qapp, tmp_path):
+    models = []
+
+    def open_log(content):
+        path = tmp_path / "console.log"
+        path.write_bytes(content)
+        model = ConsoleLogModel(path)
+        models.append(model)
+        return model
+
+    yield open_log
+    for model in models:
+        model.close()
+
+
+def lines(model):
+    return [
+        model.data(model.index(row)) for row in range(model.rowCount())
+    ]
+
+
+@pytest.mark.parametrize("content, expected", [
+    (b"", []),
+    (b"\n", [""]),
+    (b"one", ["one"]),
+    (b"one\ntwo\n", ["one", "two"]),
+    (b"one\ntwo", ["one", "two"]),
+    (b"one\n\n\ntwo\n", ["one", "", "", "two"]),
+    (b"one\r\ntwo\r\n", ["one", "two"]),
+])
+def test_lines(open_log, content, expected):
+    assert lines(open_log(content)) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 7])
+def test_lines_across_chunks(open_log, monkeypatch, chunk_size):
+    monkeypatch.setattr(ConsoleLogModel, "CHUNK_SIZE", chunk_size)
+    content = "Collecting réquests\n\nSuccessfully installed ✓\nend"
+    model = open_log(content.encode("utf-8"))
+    assert lines(model) == content.split("\n")
+
+
+def test_rows_are_read_in_any_order(open_log):
+    model = open_log(b"".join(b"line %d\n" % i for i in range(1000)))
+    assert model.rowCount() == 1000
+    for row in (999, 0, 500, 1):
+        assert model.data(model.index(row)) == f"line {row}"
+
+
+def test_invalid_utf8_is_replaced(open_log):
+    model = open_log(b"caf\xe9\nok\n")
+    assert lines(model) == ["caf�", "ok"]
+
+
+def test_other_roles_and_indexes(open_log):
+    model = open_log(b"one\ntwo\n")
+    assert model.data(model.index(0), Qt.ItemDataRole.ToolTipRole) is None
+    assert model.data(QModelIndex()) is None
+    assert model.data(model.index(2)) is None
+    assert model.rowCount(model.index(0)) == 0
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of freezing the installed packages of a venv without running
+pip (`get_data.freeze_requirements()`).
+"""
+import os
+import json
+
+import pytest
+
+import get_data
+
+
+def make_venv(path, version="3.11.7"):
+    path.mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text(
+        f"home = /usr/bin\nversion = {version}\n", encoding="utf-8"
+    )
+    site_packages = get_data._site_packages_path(path)
+    site_packages.mkdir(parents=True)
+    return site_packages
+
+
+def add_dist(site_packages, name, version, direct_url=None):
+    dist_info = site_packages / f"{name.replace('-', '_')}-{version}.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n",
+        encoding="utf-8"
+    )
+    if direct_url is not None:
+        (dist_info / "direct_url.json").write_text(
+            json.dumps(direct_url), encoding="utf-8"
+        )
+
+
+def freeze(venv):
+    return get_data.freeze_requirements(venv.parent, venv.name)
+
+
+@pytest.mark.parametrize("version, expected", [
+    ("1.0", "1.0"),
+    ("1.0.0", "1.0.0"),
+    ("v1.0", "1.0"),
+    ("01.02", "1.2"),
+    ("1.0-beta1", "1.0b1"),
+    ("1.0.alpha", "1.0a0"),
+    ("1.0c2", "1.0rc2"),
+    ("1.0-1", "1.0.post1"),
+    ("1.0.rev3", "1.0.post3"),
+    ("1.0-dev", "1.0.dev0"),
+    ("0!1.0", "1.0"),
+    ("2!1.0", "2!1.0"),
+    ("1.0+Ubuntu-1", "1.0+ubuntu.1"),
+    ("1.0+local.007", "1.0+local.7"),
+    ("not a version", None),
+])
+def test_normalize_version(version, expected):
+    assert get_data.normalize_version(version) == expected
+
+
+def test_pins_sorted_by_name(tmp_path):
+    venv = tmp_path / "venv"
+    site_packages = make_venv(venv)
+    add_dist(site_packages, "requests", "2.31.0")
+    add_dist(site_packages, "Babel", "2.14.0")
+    add_dist(site_packages, "idna", "3.6-1")
+    add_dist(site_packages, "odd", "2013b")
+    add_dist(site_packages, "weird", "not-a-version")
+    assert freeze(venv) == [
+        "Babel==2.14.0",
+        "idna==3.6.post1",
+        "odd==2013b0",
+        "requests==2.31.0",
+        "weird===not-a-version",
+    ]
+
+
+@pytest.mark.parametrize("version, expected", [
+    ("3.11.7", ["requests==2.31.0"]),
+    ("3.12.1", ["requests==2.31.0", "setuptools==69.0.0"]),
+])
+def test_packaging_tools_are_skipped(tmp_path, version, expected):
+    venv = tmp_path / "venv"
+    site_packages = make_venv(venv, version)
+    add_dist(site_packages, "pip", "23.3.1")
+    add_dist(site_packages, "setuptools", "69.0.0")
+    add_dist(site_packages, "requests", "2.31.0")
+    assert freeze(venv) == expected
+
+
+def test_direct_urls(tmp_path):
+    venv = tmp_path / "venv"
+    site_packages = make_venv(venv)
+    add_dist(site_packages, "archive", "1.0", {
+        "url": "https://example.com/archive-1.0.tar.gz",
+        "archive_info": {"hash": "sha256=abc"},
+    })
+    add_dist(site_packages, "checkout", "2.0", {
+        "url": "https://example.com/checkout.git",
+        "vcs_info": {"vcs": "git", "commit_id": "0123abc"},
+        "subdirectory": "src",
+    })
+    assert freeze(venv) == [
+        "archive @ https://example.com/archive-1.0.tar.gz#sha256=abc",
+        "checkout @ git+https://example.com/checkout.git@0123abc"
+        "#subdirectory=src",
+    ]
+
+
+def test_editable_without_vcs(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    venv = tmp_path / "venv"
+    site_packages = make_venv(venv)
+    add_dist(site_packages, "project", "0.1", {
+        "url": project.as_uri(),
+        "dir_info": {"editable": True},
+    })
+    assert freeze(venv) == [
+        "# Editable install with no version control (project==0.1)",
+        f"-e {os.path.normcase(project)}",
+    ]
+
+
+def test_editable_git_checkout(tmp_path):
+    project = tmp_path / "repo" / "pkg"
+    project.mkdir(parents=True)
+    (project / "pyproject.toml").write_text("", encoding="utf-8")
+    git_dir = tmp_path / "repo" / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+    (git_dir / "refs" / "heads" / "main").write_text(
+        "0123abc\n", encoding="utf-8"
+    )
+    (git_dir / "config").write_text(
+        '[remote "origin"]\n\turl = git@example.com:me/repo.git\n',
+        encoding="utf-8"
+    )
+
+    venv = tmp_path / "venv"
+    site_packages = make_venv(venv)
+    add_dist(site_packages, "my-pkg", "0.1")
+    (site_packages / "my-pkg.egg-link").write_text(
+        f"{project}\n.\n", encoding="utf-8"
+    )
+    assert freeze(venv) == [
+        "-e git+ssh://git@example.com/me/repo.git@0123abc"
+        "#egg=my_pkg&subdirectory=pkg",
+    ]
+
+
+def test_save_requirements(tmp_path):
+    venv = tmp_path / "venv"
+    add_dist(make_venv(venv), "requests", "2.31.0")
+    save_path = tmp_path / "requirements.txt"
+    get_data.save_requirements(venv.parent, venv.name, save_path)
+    assert save_path.read_text(encoding="utf-8") == "requests==2.31.0\n"
+
+
+def test_freeze_without_probing(tmp_path, monkeypatch):
+    def probe(venv_path):
+        raise AssertionError("the interpreter was run")
+
+    monkeypatch.setattr(get_data, "_probe_venv_paths", probe)
+    venv = tmp_path / "venv"
+    site_packages = make_venv(venv, "3.12.1")
+    add_dist(site_packages, "setuptools", "69.0.0")
+    (site_packages / "legacy.egg-link").write_text(
+        f"{tmp_path}\n.\n", encoding="utf-8"
+    )
+    save_path = tmp_path / "requirements.txt"
+    get_data.save_requirements(venv.parent, venv.name, save_path, probe=False)
+    assert save_path.read_text(encoding="utf-8") == "setuptools==69.0.0\n"
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of running jobs by priority, cancelling them, tracking work done
+elsewhere and keeping the job history (`jobs`).
+"""
+import sys
+import time
+import threading
+
+import pytest
+from PyQt6 import sip
+from PyQt6.QtCore import QObject
+
+import get_data
+import jobs
+from jobs import (
+    Job,
+    JobManager,
+    JobScheduler,
+    JOB_CANCELLED,
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    PRIORITY_BACKGROUND
+)
+
+
+@pytest.fixture
+def scheduler(wait_until):
+    scheduler = JobScheduler(max_jobs=1)
+    yield scheduler
+    scheduler.shutdown()
+    wait_until(lambda: not scheduler.busy and not scheduler._tracked)
+
+
+@pytest.fixture
+def blocker():
+    """A callable job running until `release` is set."""
+    release = threading.Event()
+    job = Job(title="blocker", func=lambda: release.wait(10) and None)
+    job.release = release
+    yield job
+    release.set()
+
+
+def python_job(code, **kwargs):
+    return Job(
+        title=kwargs.pop("title", "python"),
+        program=sys.executable,
+        args=["-c", code],
+        **kwargs
+    )
+
+
+def test_interactive_jobs_run_before_background_jobs(wait_until, scheduler, blocker):
+    started = []
+    scheduler.job_started.connect(lambda job: started.append(job.title))
+    scheduler.submit(blocker)
+    background = scheduler.submit(Job(
+        title="background", func=lambda: None, priority=PRIORITY_BACKGROUND
+    ))
+    first = scheduler.submit(Job(title="first", func=lambda: None))
+    second = scheduler.submit(Job(title="second", func=lambda: None))
+    assert (background.state, first.state) == (JOB_QUEUED, JOB_QUEUED)
+
+    blocker.release.set()
+    wait_until(lambda: not scheduler.busy)
+    assert started == ["blocker", "first", "second", "background"]
+    assert second.state == background.state == JOB_DONE
+
+
+def test_max_jobs_can_be_raised(wait_until, scheduler, blocker):
+    scheduler.submit(blocker)
+    job = scheduler.submit(Job(title="next", func=lambda: None))
+    assert job.state == JOB_QUEUED
+    scheduler.set_max_jobs(2)
+    wait_until(lambda: job.state == JOB_DONE)
+
+
+def test_callable_results(wait_until, scheduler):
+    def fail():
+        raise OSError("disk full")
+
+    done = scheduler.submit(Job(title="done", func=lambda: "saved"))
+    failed = scheduler.submit(Job(title="failed", func=fail))
+    wait_until(lambda: not scheduler.busy)
+    assert (done.state, done.exit_code, done.output) == (
+        JOB_DONE, 0, ["saved\n"]
+    )
+    assert (failed.state, failed.exit_code, failed.output) == (
+        JOB_FAILED, 1, ["disk full\n"]
+    )
+
+
+def test_process_results(wait_until, scheduler):
+    done = scheduler.submit(python_job("print('hello')"))
+    failed = scheduler.submit(python_job("raise SystemExit(3)"))
+    missing = scheduler.submit(Job(title="missing", program="/no/such/tool"))
+    wait_until(lambda: not scheduler.busy)
+    assert done.state == JOB_DONE
+    assert "".join(done.output).strip() == "hello"
+    assert (failed.state, failed.exit_code) == (JOB_FAILED, 3)
+    assert missing.state == JOB_FAILED
+    assert "Could not start" in "".join(missing.output)
+
+
+def test_cancel_queued_job(wait_until, scheduler, blocker):
+    started = []
+    scheduler.job_started.connect(started.append)
+    scheduler.submit(blocker)
+    queued = scheduler.submit(Job(title="queued", func=lambda: None))
+    scheduler.cancel(queued)
+    assert queued.state == JOB_CANCELLED
+
+    blocker.release.set()
+    wait_until(lambda: not scheduler.busy)
+    assert started == [blocker]
+
+
+def test_cancel_running_callable(wait_until, scheduler, blocker):
+    scheduler.submit(blocker)
+    scheduler.cancel(blocker)
+    blocker.release.set()
+    wait_until(lambda: not scheduler.busy)
+    assert blocker.state == JOB_CANCELLED
+
+
+def test_cancel_running_process(wait_until, scheduler):
+    job = scheduler.submit(python_job(
+        "import sys, time; print('up', flush=True); time.sleep(30)"
+    ))
+    wait_until(lambda: job.output)
+    assert job.state == JOB_RUNNING
+    scheduler.cancel(job)
+    wait_until(lambda: not scheduler.busy)
+    assert job.state == JOB_CANCELLED
+
+
+def test_track_and_complete_from_threads(wait_until, scheduler):
+    finished = []
+    scheduler.job_finished.connect(finished.append)
+    done = Job(title="done")
+    failed = Job(title="failed")
+
+    def work():
+        for job, exit_code in ((done, 0), (failed, 2)):
+            scheduler.track(job)
+            scheduler.complete(job, exit_code)
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    wait_until(lambda: len(finished) == 2)
+    assert (done.state, failed.state, failed.exit_code) == (
+        JOB_DONE, JOB_FAILED, 2
+    )
+    assert not scheduler._tracked
+
+
+def test_tracked_job_of_destroyed_owner_is_cancelled(wait_until, scheduler):
+    owner = QObject()
+    job = scheduler.track(Job(title="owned"), owner=owner)
+    wait_until(lambda: job.state == JOB_RUNNING)
+    sip.delete(owner)
+    wait_until(lambda: job.state == JOB_CANCELLED)
+
+
+def test_cancel_tracked_job(wait_until, scheduler):
+    cancelled = []
+    job = scheduler.track(Job(
+        title="tracked", cancel_callback=lambda: cancelled.append(True)
+    ))
+    wait_until(lambda: job.state == JOB_RUNNING)
+    scheduler.cancel(job)
+    assert cancelled == [True]
+    scheduler.complete(job, 0)
+    wait_until(lambda: not scheduler._tracked)
+    assert job.state == JOB_CANCELLED
+
+
+def test_yield_to_interactive(wait_until, scheduler):
+    # no interactive job: returns right away
+    start = time.monotonic()
+    jobs.yield_to_interactive(poll=0.01, limit=5)
+    assert time.monotonic() - start < 1
+
+    job = scheduler.track(Job(title="interactive"))
+    wait_until(lambda: job.state == JOB_RUNNING)
+
+    # waits at most `limit` seconds for an interactive job
+    start = time.monotonic()
+    jobs.yield_to_interactive(poll=0.01, limit=0.3)
+    assert 0.3 <= time.monotonic() - start < 2
+
+    # stops waiting when cancelled
+    start = time.monotonic()
+    jobs.yield_to_interactive(lambda: True, poll=0.01, limit=5)
+    assert time.monotonic() - start < 1
+
+    # returns once the interactive job is done
+    waited = []
+    thread = threading.Thread(target=lambda: waited.append(
+        jobs.yield_to_interactive(poll=0.01, limit=5) or time.monotonic()
+    ))
+    start = time.monotonic()
+    thread.start()
+    scheduler.complete(job, 0)
+    wait_until(lambda: waited)
+    thread.join()
+    assert waited[0] - start < 2
+
+
+def test_background_jobs_dont_hold_back_background_threads(wait_until, scheduler):
+    job = scheduler.track(Job(title="bg", priority=PRIORITY_BACKGROUND))
+    wait_until(lambda: job.state == JOB_RUNNING)
+    start = time.monotonic()
+    jobs.yield_to_interactive(poll=0.01, limit=5)
+    assert time.monotonic() - start < 1
+    scheduler.complete(job, 0)
+
+
+@pytest.fixture
+def history_file(tmp_path, monkeypatch):
+    history_file = tmp_path / "job-history.json"
+    monkeypatch.setattr(get_data, "JOB_HISTORY", history_file)
+    return history_file
+
+
+def test_history_round_trip(history_file):
+    job = python_job(
+        "print()", title="Installing requests", venv="/venvs/app",
+        priority=PRIORITY_BACKGROUND, state=JOB_FAILED, exit_code=1,
+        started_at=10.0, finished_at=12.5,
+        output=["x" * jobs.HISTORY_OUTPUT_TAIL, "tail\n"]
+    )
+    jobs.save_job_history([job])
+    loaded, = jobs.load_job_history()
+
+    assert loaded.title == job.title
+    assert loaded.venv == job.venv
+    assert loaded.command == job.command
+    assert loaded.program == ""
+    assert (loaded.priority, loaded.state, loaded.exit_code) == (
+        PRIORITY_BACKGROUND, JOB_FAILED, 1
+    )
+    assert loaded.duration == 2.5
+    output, = loaded.output
+    assert len(output) == jobs.HISTORY_OUTPUT_TAIL
+    assert output.endswith("tail\n")
+
+
+def test_history_is_limited(history_file, monkeypatch):
+    monkeypatch.setattr(jobs, "HISTORY_LIMIT", 3)
+    jobs.save_job_history([Job(title=str(i)) for i in range(5)])
+    assert [job.title for job in jobs.load_job_history()] == ["2", "3", "4"]
+
+
+@pytest.mark.parametrize("content", ["", "{", "{}", "[1]"])
+def test_broken_history_is_ignored(history_file, content):
+    history_file.write_text(content, encoding="utf-8")
+    assert jobs.load_job_history() == []
+
+
+def test_manager_keeps_finished_jobs(wait_until, history_file):
+    manager = JobManager()
+    kept = manager.submit(Job(title="kept", func=lambda: None))
+    skipped = manager.submit(
+        Job(title="skipped", func=lambda: None, persist=False)
+    )
+    wait_until(lambda: not manager.busy)
+    assert manager.history == [kept]
+    assert manager.jobs == []
+    assert skipped.state == JOB_DONE
+
+    manager.shutdown()
+    assert [job.title for job in JobManager().history] == ["kept"]
+
+    manager.clear_history()
+    assert jobs.load_job_history() == []
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of reading the core metadata of installed distributions.
+"""
+import get_data
+
+
+METADATA = (
+    "Metadata-Version: 2.1\n"
+    "Name: sample\n"
+    "Version: 1.0\n"
+    "Summary: A sample\n"
+    "  package\n"
+    "Author: Jane Doe\n"
+    "Maintainer-Author: Not Jane\n"
+    "Requires-Dist: idna (>=2.5)\n"
+    "Requires-Dist: chardet ; extra == 'all'\n"
+    "\n"
+    "Name: from the body\n"
+    "Version: 9.9\n"
+)
+
+
+def test_fields_are_lower_cased_and_keep_all_values():
+    headers = get_data.parse_metadata_headers(METADATA)
+    assert headers["name"] == ["sample"]
+    assert headers["requires-dist"] == [
+        "idna (>=2.5)",
+        "chardet ; extra == 'all'"
+    ]
+    assert headers["maintainer-author"] == ["Not Jane"]
+    assert headers["author"] == ["Jane Doe"]
+
+
+def test_continuation_lines_are_unfolded():
+    headers = get_data.parse_metadata_headers(METADATA)
+    assert headers["summary"] == ["A sample package"]
+
+
+def test_body_is_ignored():
+    headers = get_data.parse_metadata_headers(METADATA)
+    assert headers["version"] == ["1.0"]
+
+
+def test_lines_without_colon_are_skipped():
+    headers = get_data.parse_metadata_headers(
+        "Name: a\nnot a field\n  folded\nVersion: 1\n"
+    )
+    assert headers == {"name": ["a"], "version": ["1"]}
+
+
+def test_read_stops_at_the_body(tmp_path, monkeypatch):
+    # a blank line split over two chunks must still end the headers
+    monkeypatch.setattr(get_data, "METADATA_CHUNK_SIZE", 7)
+    meta_file = tmp_path / "METADATA"
+    meta_file.write_bytes(METADATA.replace("\n", "\r\n").encode("utf-8"))
+    assert get_data.read_metadata_headers(meta_file) == (
+        get_data.parse_metadata_headers(METADATA)
+    )
+
+
+def test_read_is_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_data, "METADATA_CHUNK_SIZE", 16)
+    monkeypatch.setattr(get_data, "METADATA_MAX_HEADER", 32)
+    meta_file = tmp_path / "METADATA"
+    meta_file.write_text(
+        "Name: sample\n" + "Classifier: x\n" * 100 + "Version: 1.0\n",
+        encoding="utf-8"
+    )
+    headers = get_data.read_metadata_headers(meta_file)
+    assert headers["name"] == ["sample"]
+    assert "version" not in headers
+
+
+def test_read_package_info(tmp_path):
+    dist_info = tmp_path / "sample-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(METADATA, encoding="utf-8")
+    assert get_data.read_package_info(dist_info) == get_data.PackageInfo(
+        "sample", "1.0", "Jane Doe", "A sample package"
+    )
+
+
+def test_read_package_info_of_egg_info(tmp_path):
+    egg_info = tmp_path / "sample-1.0.egg-info"
+    egg_info.mkdir()
+    (egg_info / "PKG-INFO").write_text(METADATA, encoding="utf-8")
+    assert get_data.read_package_info(egg_info).pkg_name == "sample"
+
+
+def test_unreadable_or_nameless_metadata(tmp_path):
+    dist_info = tmp_path / "sample-1.0.dist-info"
+    dist_info.mkdir()
+    assert get_data.read_package_info(dist_info) is None
+    (dist_info / "METADATA").write_text("Version: 1.0\n", encoding="utf-8")
+    assert get_data.read_package_info(dist_info) is None
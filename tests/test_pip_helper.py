@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the pip helper: the JSON lines protocol of `pip_helper.py`
+and running, cancelling and restarting requests with `PipHelper`.
+
+The helper runs with the interpreter of the tests. Requests installing
+from a FIFO as requirements file block until it's opened for writing,
+which keeps them running as long as a test needs.
+"""
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+import manage_pip
+from manage_pip import PipHelper, PIP_HELPER_SCRIPT
+
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork") or not hasattr(os, "mkfifo"),
+    reason="needs os.fork() and os.mkfifo()"
+)
+
+SHOW_PIP = ["show", "--disable-pip-version-check", "pip"]
+
+
+@pytest.fixture
+def fifo(tmp_path):
+    path = tmp_path / "requirements.fifo"
+    os.mkfifo(path)
+    yield str(path)
+    # let a pip process still waiting for the requirements finish
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_NONBLOCK))
+    except OSError:
+        pass
+
+
+def blocking_install(fifo):
+    return ["install", "--disable-pip-version-check", "-r", fifo]
+
+
+
+#]===========================================================================[#
+#] PROTOCOL [#===============================================================[#
+#]===========================================================================[#
+
+@pytest.fixture
+def helper_process(tmp_path):
+    process = subprocess.Popen(
+        [sys.executable, str(PIP_HELPER_SCRIPT)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        cwd=tmp_path
+    )
+    yield process
+    process.kill()
+    process.wait()
+    process.stdin.close()
+    process.stdout.close()
+
+
+def send(process, *messages):
+    for message in messages:
+        process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+    process.stdin.flush()
+
+
+def events(process, until):
+    """Read events until one matches `until` and return them all.
+    """
+    received = []
+    while True:
+        line = process.stdout.readline()
+        assert line, f"helper exited after {received}"
+        event = json.loads(line)
+        received.append(event)
+        if all(event.get(key) == value for key, value in until.items()):
+            return received
+
+
+def test_helper_runs_requests(helper_process):
+    ready, = events(helper_process, {"event": "ready"})
+    assert ready["pid"] == helper_process.pid
+    assert ready["fork"] is True
+
+    send(helper_process, {"id": 1, "cmd": SHOW_PIP[0], "args": SHOW_PIP[1:]})
+    received = events(helper_process, {"event": "exit", "id": 1})
+    assert received[0] == {"event": "started", "id": 1}
+    assert received[-1] == {
+        "event": "exit", "id": 1, "code": 0, "restart": False
+    }
+    stdout = "".join(
+        event["text"] for event in received
+        if event["event"] == "output" and event["stream"] == "stdout"
+    )
+    assert "Name: pip" in stdout
+
+    send(helper_process, {"cmd": "exit"})
+    assert helper_process.wait(10) == 0
+
+
+def test_helper_rejects_unsupported_commands(helper_process):
+    send(
+        helper_process,
+        {"cmd": "install"},  # no id, ignored
+        {"id": 1, "cmd": "download", "args": ["pip"]},
+        {"id": 2, "cmd": "list", "args": "pip"},
+    )
+    received = events(helper_process, {"event": "exit", "id": 2})
+    assert [event["event"] for event in received] == [
+        "ready",
+        "started", "output", "exit",
+        "started", "output", "exit",
+    ]
+    assert received[2]["text"] == "Unsupported command: 'download'\n"
+    assert received[3] == {"event": "exit", "id": 1, "code": 2}
+    assert received[6]["code"] == 2
+
+
+def test_helper_cancels_requests(helper_process, fifo):
+    events(helper_process, {"event": "ready"})
+    send(
+        helper_process,
+        {"id": 1, "cmd": "install", "args": blocking_install(fifo)[1:]},
+        {"id": 2, "cmd": SHOW_PIP[0], "args": SHOW_PIP[1:]},
+        {"cmd": "cancel", "id": 2},
+    )
+    events(helper_process, {"event": "started", "id": 1})
+
+    send(helper_process, {"cmd": "cancel", "id": 1})
+    received = events(helper_process, {"event": "exit", "id": 1})
+    assert received[-1]["code"] < 0
+
+    # the queued request was dropped
+    send(helper_process, {"id": 3, "cmd": SHOW_PIP[0], "args": SHOW_PIP[1:]})
+    received = events(helper_process, {"event": "exit", "id": 3})
+    assert {"event": "started", "id": 2} not in received
+    assert received[0] == {"event": "started", "id": 3}
+
+
+def test_helper_stops_requests_when_stdin_closes(helper_process, fifo):
+    events(helper_process, {"event": "ready"})
+    send(
+        helper_process,
+        {"id": 1, "cmd": "install", "args": blocking_install(fifo)[1:]}
+    )
+    events(helper_process, {"event": "started", "id": 1})
+    helper_process.stdin.close()
+    received = events(helper_process, {"event": "exit", "id": 1})
+    assert received[-1]["code"] < 0
+    assert helper_process.wait(10) == 0
+
+
+
+#]===========================================================================[#
+#] PIP HELPER [#=============================================================[#
+#]===========================================================================[#
+
+class Recorder:
+    """Record the signals of a `PipHelper`."""
+    def __init__(self, helper):
+        self.signals = []
+        self.output = {}
+        helper.started.connect(lambda i: self.signals.append(("started", i)))
+        helper.finished.connect(
+            lambda i, code: self.signals.append(("finished", i, code))
+        )
+        helper.unavailable.connect(
+            lambda i: self.signals.append(("unavailable", i))
+        )
+        helper.output.connect(
+            lambda i, stream, text: self.output.setdefault(i, []).append(text)
+        )
+
+
+    def exit_code(self, request_id):
+        for signal in self.signals:
+            if signal[:2] == ("finished", request_id):
+                return signal[2]
+        return None
+
+
+@pytest.fixture
+def helper(qapp, tmp_path):
+    helper = PipHelper(sys.executable, tmp_path)
+    helper.recorder = Recorder(helper)
+    yield helper
+    helper.shutdown()
+
+
+def test_requests_run_one_after_another(helper, wait_until):
+    first = helper.submit(SHOW_PIP)
+    second = helper.submit(["bogus"])
+    assert helper.busy
+    wait_until(lambda: not helper.busy)
+
+    assert helper.recorder.signals == [
+        ("started", first), ("finished", first, 0),
+        ("started", second), ("finished", second, 2),
+    ]
+    assert "Name: pip" in "".join(helper.recorder.output[first])
+    assert helper.available
+
+
+def test_cancel_queued_request(helper, wait_until):
+    first = helper.submit(SHOW_PIP)
+    second = helper.submit(SHOW_PIP)
+    helper.cancel(second)
+    assert helper.recorder.signals == [("finished", second, -1)]
+    wait_until(lambda: not helper.busy)
+    assert helper.recorder.exit_code(first) == 0
+    assert ("started", second) not in helper.recorder.signals
+
+
+def test_cancel_running_request(helper, wait_until, fifo):
+    request_id = helper.submit(blocking_install(fifo))
+    wait_until(lambda: ("started", request_id) in helper.recorder.signals)
+    helper.cancel(request_id)
+    wait_until(lambda: helper.recorder.exit_code(request_id) is not None)
+    assert helper.recorder.exit_code(request_id) < 0
+
+
+def test_helper_restarts_after_dying(helper, wait_until, fifo):
+    running = helper.submit(blocking_install(fifo))
+    wait_until(lambda: ("started", running) in helper.recorder.signals)
+    queued = helper.submit(SHOW_PIP)
+    helper._process.kill()
+
+    wait_until(lambda: helper.recorder.exit_code(queued) is not None)
+    assert helper.recorder.exit_code(running) == -1
+    assert "stopped unexpectedly" in "".join(helper.recorder.output[running])
+    assert helper.recorder.exit_code(queued) == 0
+    assert helper.available
+
+
+def test_helper_that_cant_start_is_unavailable(qapp, tmp_path, wait_until):
+    helper = PipHelper(tmp_path / "missing" / "python", tmp_path)
+    recorder = Recorder(helper)
+    request_id = helper.submit(SHOW_PIP)
+    wait_until(lambda: recorder.signals)
+    assert recorder.signals == [("unavailable", request_id)]
+    assert helper._failed_starts == manage_pip.PIP_HELPER_START_ATTEMPTS
+    assert not helper.available
+    assert not helper.busy
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of following the progress of `pip install` from its output
+(`manage_pip.PipProgressParser`).
+"""
+import pytest
+
+import manage_pip
+from manage_pip import PipProgressParser
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def parser(clock):
+    return PipProgressParser(clock)
+
+
+def feed(parser, *lines):
+    return [parser.feed_line(line) for line in lines]
+
+
+def test_starts_resolving_without_a_fraction(parser):
+    progress = parser.snapshot()
+    assert progress.phase == manage_pip.PHASE_RESOLVING
+    assert progress.fraction is None
+    assert progress.eta is None
+
+
+def test_collecting(parser):
+    feed(
+        parser,
+        "Collecting requests>=2.0",
+        "  Requirement already satisfied: idna in ./site-packages",
+    )
+    assert parser.changed
+    progress = parser.snapshot()
+    assert not parser.changed
+    assert progress.package == "requests"
+    assert progress.collected == 2
+
+
+def test_unknown_lines_change_nothing(parser):
+    assert feed(parser, "", "  Some other output", "Progress x of y") == [
+        False, False, False
+    ]
+    assert not parser.changed
+
+
+def test_raw_progress_of_a_download(parser, clock):
+    hidden = feed(
+        parser,
+        "Collecting requests",
+        "  Downloading https://files.example.com/requests-2.31.0-py3-none-"
+        "any.whl (62 kB)",
+        "Progress 31000 of 62000",
+    )
+    assert hidden == [False, False, True]
+    progress = parser.snapshot()
+    assert progress.phase == manage_pip.PHASE_DOWNLOADING
+    assert progress.package == "requests-2.31.0-py3-none-any.whl"
+    assert (progress.package_done, progress.package_total) == (31000, 62000)
+    assert progress.fraction == pytest.approx(0.45)
+
+    clock.now = 1.0
+    parser.feed_line("Progress 51000 of 62000")
+    progress = parser.snapshot()
+    assert progress.throughput == pytest.approx(51000)
+    assert progress.eta == pytest.approx(11000 / 51000)
+
+
+def test_raw_progress_corrects_the_printed_size(parser):
+    feed(
+        parser,
+        "  Downloading https://example.com/big.tar.gz (1.5 MB)",
+        "Progress 100 of 2000000",
+    )
+    progress = parser.snapshot()
+    assert progress.total_bytes == 2000000
+    assert progress.done_bytes == 100
+
+
+def test_raw_progress_without_download_is_ignored(parser):
+    assert parser.feed_line("Progress 10 of 20")
+    assert parser.snapshot().done_bytes == 0
+
+
+def test_cached_files_count_as_done(parser):
+    feed(
+        parser,
+        "Collecting idna",
+        "  Using cached idna-3.6-py3-none-any.whl (61 kB)",
+    )
+    progress = parser.snapshot()
+    assert progress.package == "idna-3.6-py3-none-any.whl"
+    assert progress.done_bytes == progress.total_bytes == 61000
+    assert progress.eta is None
+
+
+def test_next_file_finishes_the_download(parser):
+    feed(
+        parser,
+        "  Downloading https://example.com/a.whl (10 kB)",
+        "Progress 5000 of 10000",
+        "Collecting b",
+    )
+    assert parser.snapshot().done_bytes == 10000
+
+
+def test_fraction_does_not_go_backwards(parser):
+    feed(parser, "  Using cached a.whl (10 kB)")
+    first = parser.snapshot().fraction
+    feed(parser, "  Downloading https://example.com/b.whl (90 kB)")
+    assert parser.snapshot().fraction == first
+
+
+def test_building(parser):
+    feed(parser, "Building wheel for legacy (setup.py) ... done")
+    progress = parser.snapshot()
+    assert progress.phase == manage_pip.PHASE_BUILDING
+    assert progress.package == "legacy"
+
+
+def test_installing_and_done(parser):
+    feed(
+        parser,
+        "  Using cached a.whl (10 kB)",
+        "Installing collected packages: idna, requests",
+        "  Attempting uninstall: idna",
+    )
+    progress = parser.snapshot()
+    assert progress.phase == manage_pip.PHASE_INSTALLING
+    assert progress.package == "idna"
+    assert progress.to_install == 2
+    assert progress.fraction == PipProgressParser.DOWNLOAD_SHARE
+
+    parser.feed_line("Successfully installed idna-3.6 requests-2.31.0")
+    progress = parser.snapshot()
+    assert progress.phase == manage_pip.PHASE_DONE
+    assert progress.installed == 2
+    assert progress.fraction == 1.0
+
+
+def test_error(parser):
+    feed(
+        parser,
+        "Collecting nothere",
+        "ERROR: No matching distribution found for nothere",
+    )
+    assert parser.snapshot().phase == manage_pip.PHASE_FAILED
+
+
+@pytest.mark.parametrize("pip_version, expected", [
+    ("24.1", ["--progress-bar", "raw"]),
+    ("25.0.1", ["--progress-bar", "raw"]),
+    ("24.0", []),
+    ("N/A", []),
+    (None, []),
+])
+def test_raw_progress_options(monkeypatch, pip_version, expected):
+    monkeypatch.setattr(
+        manage_pip.get_data, "get_pip_version",
+        lambda venv_path, probe=True: pip_version
+    )
+    assert manage_pip.raw_progress_options("venv") == expected
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the requirements the package installer builds from its
+install basket.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from pkg_installer import (
+    InstallBasket,
+    InstallPackagesMixin,
+    format_requirement
+)
+
+
+@pytest.fixture
+def basket(qapp):
+    basket = InstallBasket()
+    yield basket
+    basket.deleteLater()
+
+
+@pytest.mark.parametrize("args, expected", [
+    (("requests",), "requests"),
+    (("requests", "socks, security"), "requests[socks,security]"),
+    (("requests", " , "), "requests"),
+    (("requests", "", "2.31.0"), "requests==2.31.0"),
+    (("requests", "", " >=2.0,<3 "), "requests>=2.0,<3"),
+    (("requests", "socks", "~=2.31"), "requests[socks]~=2.31"),
+])
+def test_format_requirement(args, expected):
+    assert format_requirement(*args) == expected
+
+
+@pytest.mark.parametrize("args", [
+    ("requests", "", "2.31.0; python_version < '3'"),
+    ("requests", "so[cks"),
+    ("./project",),
+])
+def test_invalid_requirement(args):
+    with pytest.raises(ValueError):
+        format_requirement(*args)
+
+
+def test_basket_skips_packages_it_has(basket):
+    basket.add_packages(["requests", "rich", "Requests", ""])
+    assert basket.packages() == [("requests", "", ""), ("rich", "", "")]
+    assert basket.install_button.isEnabled()
+
+
+def test_basket_requirements(basket):
+    basket.add_packages(["requests", "rich"])
+    basket.model.item(0, 1).setText("socks")
+    basket.model.item(1, 2).setText("13.7.0")
+    assert basket.requirements() == ["requests[socks]", "rich==13.7.0"]
+
+    basket.clear()
+    assert basket.requirements() == []
+    assert not basket.install_button.isEnabled()
+
+
+@pytest.mark.parametrize("exit_code, expected", [
+    (0, []),
+    (1, [("requests", "", "")]),
+    (None, [("requests", "", "")]),
+])
+def test_basket_is_kept_if_the_install_fails(basket, exit_code, expected):
+    basket.add_packages(["requests"])
+    window = SimpleNamespace(basket=basket)
+    InstallPackagesMixin.on_basket_installed(
+        window, SimpleNamespace(exit_code=exit_code)
+    )
+    assert basket.packages() == expected
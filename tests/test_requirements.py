@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the PEP 508 requirements, environment markers and PEP 440
+version comparisons used by the dependency graph.
+"""
+import pytest
+
+import get_data
+
+
+ENVIRONMENT = {
+    "python_version": "3.11",
+    "python_full_version": "3.11.7",
+    "sys_platform": "linux",
+    "platform_system": "Linux",
+    "implementation_name": "cpython",
+    "extra": "",
+}
+
+
+@pytest.mark.parametrize("requirement, expected", [
+    ("requests", ("requests", (), "", "")),
+    ("requests >= 2.0, < 3", ("requests", (), ">=2.0,<3", "")),
+    ("requests[socks, security]>=2",
+     ("requests", ("socks", "security"), ">=2", "")),
+    ("idna (>=2.5)", ("idna", (), ">=2.5", "")),
+    ("chardet ; extra == 'all'", ("chardet", (), "", "extra == 'all'")),
+    ("pip @ https://example.com/pip.whl",
+     ("pip", (), "@ https://example.com/pip.whl", "")),
+])
+def test_parse_requirement(requirement, expected):
+    assert get_data.parse_requirement(requirement) == expected
+
+
+def test_parse_requirement_rejects_garbage():
+    assert get_data.parse_requirement(">=1.0") is None
+
+
+@pytest.mark.parametrize("marker, expected", [
+    ('python_version >= "3.8"', True),
+    ('python_version < "3.10"', False),
+    ('python_full_version == "3.11.*"', True),
+    ('sys_platform == "win32" or os_name == ""', True),
+    ('sys_platform == "linux" and (python_version < "3" or '
+     'implementation_name == "cpython")', True),
+    ('"linux" in sys_platform', True),
+    ('platform_system not in "Windows Darwin"', True),
+    ('extra == "all"', False),
+])
+def test_evaluate_marker(marker, expected):
+    assert get_data.evaluate_marker(marker, ENVIRONMENT) is expected
+
+
+def test_extras_are_compared_by_canonical_name():
+    environment = dict(ENVIRONMENT, extra="Socks_Proxy")
+    assert get_data.evaluate_marker('extra == "socks-proxy"', environment)
+
+
+@pytest.mark.parametrize("marker", [
+    'python_version >=',
+    'python_version "3.8"',
+    '(python_version >= "3.8"',
+    'python_version >= "3.8" python_version',
+])
+def test_evaluate_marker_rejects_invalid_markers(marker):
+    with pytest.raises(ValueError):
+        get_data.evaluate_marker(marker, ENVIRONMENT)
+
+
+def test_version_key_order():
+    versions = [
+        "1.0.post1", "1.0+local", "1.0", "1.0rc1", "1.0b2", "1.0a1",
+        "1.0.dev0", "0.9", "1!0.1",
+    ]
+    expected = [
+        "0.9", "1.0.dev0", "1.0a1", "1.0b2", "1.0rc1", "1.0",
+        "1.0+local", "1.0.post1", "1!0.1",
+    ]
+    assert sorted(versions, key=get_data._version_key) == expected
+
+
+def test_version_key_ignores_trailing_zeros():
+    assert get_data._version_key("1.0.0") == get_data._version_key("1")
+
+
+def test_version_key_of_invalid_version():
+    assert get_data._version_key("not a version") is None
+
+
+@pytest.mark.parametrize("lhs, op, rhs, expected", [
+    ("1.0", "==", "1.0.0", True),
+    ("1.0+local", "==", "1.0", True),
+    ("1.0+local", "==", "1.0+other", False),
+    ("3.11.7", "==", "3.11.*", True),
+    ("3.12", "!=", "3.11.*", True),
+    ("1.4.5", "~=", "1.4.2", True),
+    ("1.5", "~=", "1.4.2", False),
+    ("1.5", "~=", "1.4", True),
+    ("2.0", "~=", "1.4", False),
+    ("1.0rc1", "<", "1.0", False),
+    ("1.0rc1", "<", "1.0rc2", True),
+    ("0.9", "<", "1.0", True),
+    ("1.0.post1", ">", "1.0", False),
+    ("1.0+local", ">", "1.0", False),
+    ("1.0.post2", ">", "1.0.post1", True),
+    ("1.1", ">", "1.0", True),
+    ("1.0a1", ">=", "1.0.dev0", True),
+    ("anything", "===", "anything", True),
+    ("not a version", ">=", "1.0", None),
+])
+def test_compare_versions(lhs, op, rhs, expected):
+    assert get_data._compare_versions(lhs, op, rhs) is expected
+
+
+@pytest.mark.parametrize("version, specifier, expected", [
+    ("2.31.0", "", True),
+    ("2.31.0", ">=2.0,<3", True),
+    ("3.0", ">=2.0,<3", False),
+    ("1.0", "=>1.0", None),
+    ("junk", ">=1.0", None),
+])
+def test_specifier_matches(version, specifier, expected):
+    assert get_data.specifier_matches(version, specifier) is expected
+
+
+def add_dist(site_packages, name, version, *requires):
+    dist_info = site_packages / f"{name}-{version}.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+        + "".join(f"Requires-Dist: {req}\n" for req in requires),
+        encoding="utf-8"
+    )
+
+
+def test_dependency_graph_without_probing(tmp_path, monkeypatch):
+    def probe(venv_path):
+        raise AssertionError("the interpreter was run")
+
+    monkeypatch.setattr(get_data, "_probe_venv_paths", probe)
+    venv = tmp_path / "venv"
+    venv.mkdir()
+    (venv / "pyvenv.cfg").write_text(
+        "home = /usr/bin\nversion = 3.7.17\n", encoding="utf-8"
+    )
+    site_packages = get_data._site_packages_path(venv)
+    site_packages.mkdir(parents=True)
+    add_dist(
+        site_packages, "requests", "2.31.0",
+        "idna (<4,>=2.5)",
+        'importlib-metadata; python_version < "3.8"',
+        'chardet; extra == "all"',
+    )
+    add_dist(site_packages, "idna", "3.6")
+
+    graph = get_data.get_dependency_graph(tmp_path, "venv", probe=False)
+    assert graph.requires["requests"] == [
+        ("idna", "idna", "<4,>=2.5"),
+        ("importlib-metadata", "importlib-metadata", ""),
+    ]
+    assert graph.required_by["idna"] == [("requests", "<4,>=2.5")]
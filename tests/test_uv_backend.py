@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of choosing the uv backend and translating pip commands for it.
+"""
+import pytest
+
+import creator
+import manage_pip
+from manage_pip import BACKEND_PIP, BACKEND_UV
+
+
+UV = "/opt/uv/bin/uv"
+
+
+@pytest.fixture
+def uv(monkeypatch):
+    monkeypatch.setattr(manage_pip, "_uv_path", UV)
+    monkeypatch.delenv("VENVIPY_UV", raising=False)
+    return UV
+
+
+@pytest.fixture
+def no_uv(monkeypatch):
+    monkeypatch.setattr(manage_pip, "_uv_path", "")
+    monkeypatch.delenv("VENVIPY_UV", raising=False)
+
+
+@pytest.mark.parametrize("setting, operation, expected", [
+    (None, "install", BACKEND_PIP),
+    ("", "install", BACKEND_PIP),
+    ("1", "install", BACKEND_UV),
+    ("1", "wheel", BACKEND_PIP),
+    ("auto", "freeze", BACKEND_UV),
+    ("0", "install", BACKEND_PIP),
+    ("Off", "install", BACKEND_PIP),
+    ("install, venv", "venv", BACKEND_UV),
+    ("install,venv", "list", BACKEND_PIP),
+])
+def test_select_backend(uv, monkeypatch, setting, operation, expected):
+    if setting is not None:
+        monkeypatch.setenv("VENVIPY_UV", setting)
+    assert manage_pip.select_backend(operation) == expected
+
+
+def test_select_backend_without_uv(no_uv, monkeypatch):
+    monkeypatch.setenv("VENVIPY_UV", "1")
+    assert manage_pip.select_backend("install") == BACKEND_PIP
+
+
+@pytest.mark.parametrize("pip_args, expected", [
+    (["install", "-r", "requirements.txt"],
+     ["pip", "install", "--python", "py", "-r", "requirements.txt"]),
+    (["install", "--progress-bar", "raw", "--no-cache-dir", "requests"],
+     ["pip", "install", "--python", "py", "requests"]),
+    (["install", "--progress-bar=off", "requests"],
+     ["pip", "install", "--python", "py", "requests"]),
+    (["uninstall", "-y", "requests"],
+     ["pip", "uninstall", "--python", "py", "-y", "requests"]),
+    (["freeze"], ["pip", "freeze", "--python", "py"]),
+])
+def test_uv_pip_args(pip_args, expected):
+    assert manage_pip.uv_pip_args(pip_args, "py") == expected
+
+
+@pytest.mark.parametrize("pip_args", [
+    [],
+    ["wheel", "requests"],
+    ["install", "--user", "requests"],
+    ["install", "--upgrade-strategy=eager", "requests"],
+])
+def test_uv_pip_args_stay_on_pip(pip_args):
+    assert manage_pip.uv_pip_args(pip_args, "py") is None
+
+
+def test_venv_commands_with_uv(uv, monkeypatch):
+    monkeypatch.setenv("VENVIPY_UV", "venv")
+    assert creator.venv_commands(
+        "python3.11", "/venvs/new", with_pip=True, system_site_packages=True
+    ) == [
+        [uv, "venv", "--python", "python3.11", "/venvs/new", "--seed",
+         "--system-site-packages"],
+        ["python3.11", "-m", "venv", "/venvs/new", "--system-site-packages"],
+    ]
+
+
+def test_venv_commands_with_pip(uv):
+    assert creator.venv_commands(
+        "python3.11", "/venvs/new", backend=BACKEND_PIP
+    ) == [["python3.11", "-m", "venv", "/venvs/new", "--without-pip"]]
+
+
+def test_venv_commands_by_default(uv):
+    assert creator.venv_commands("python3.11", "/venvs/new") == [
+        ["python3.11", "-m", "venv", "/venvs/new", "--without-pip"]
+    ]
+
+
+def test_venv_commands_without_uv(no_uv):
+    assert creator.venv_commands("python3.11", "/venvs/new") == [
+        ["python3.11", "-m", "venv", "/venvs/new", "--without-pip"]
+    ]
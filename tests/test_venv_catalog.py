@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the venv catalog: storing scans, the round-trip through
+`venv-catalog.json` and telling which paths changed since.
+"""
+import os
+import json
+from operator import attrgetter
+
+import pytest
+
+import get_data
+
+
+PYVENV_CFG = "home = /usr/bin\nversion = 3.11.7\n"
+
+
+def make_venv(path):
+    path.mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text(PYVENV_CFG, encoding="utf-8")
+
+
+def touch(path):
+    """Move the modification time of `path` one second forward."""
+    mtime = os.stat(path).st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture(autouse=True)
+def catalog_file(tmp_path, monkeypatch):
+    catalog_file = tmp_path / "venv-catalog.json"
+    monkeypatch.setattr(get_data, "VENV_CATALOG", catalog_file)
+    monkeypatch.setattr(get_data, "_venv_catalog", None)
+    return catalog_file
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "venvs"
+    make_venv(root / "one")
+    make_venv(root / "two")
+    (root / "plain").mkdir()
+    return root
+
+
+def scan(root, depth=1):
+    dir_stamps = {}
+    found = list(get_data.iter_venvs(root, depth, dir_stamps=dir_stamps))
+    get_data.cache_venvs(root, depth, found, dir_stamps, full_scan=True)
+    return found
+
+
+def reload_catalog(monkeypatch):
+    get_data.save_venv_catalog()
+    monkeypatch.setattr(get_data, "_venv_catalog", None)
+
+
+def test_unscanned_dir_is_unknown(root):
+    assert get_data.get_cached_venvs(root) is None
+    assert get_data.stale_catalog_paths(root, 1) is None
+
+
+def test_round_trip(root, catalog_file, monkeypatch):
+    found = scan(root)
+    reload_catalog(monkeypatch)
+
+    assert catalog_file.is_file()
+    cached = get_data.get_cached_venvs(root)
+    key = attrgetter("venv_name")
+    assert sorted(cached, key=key) == sorted(found, key=key)
+    assert get_data.get_cached_venvs(root, depth=2) is None
+
+
+def test_unchanged_tree_has_no_stale_paths(root, monkeypatch):
+    scan(root)
+    reload_catalog(monkeypatch)
+    assert get_data.stale_catalog_paths(root, 1) == []
+
+
+def test_changed_venv_is_stale(root):
+    scan(root)
+    touch(root / "two" / "pyvenv.cfg")
+    assert get_data.stale_catalog_paths(root, 1) == [str(root / "two")]
+
+
+def test_comment_change_is_stale(root):
+    scan(root)
+    (root / "one" / "venvipy.cfg").write_text("new comment", encoding="utf-8")
+    assert get_data.stale_catalog_paths(root, 1) == [str(root / "one")]
+
+
+def test_changed_dir_is_stale(root):
+    scan(root)
+    make_venv(root / "three")
+    touch(root)
+    assert get_data.stale_catalog_paths(root, 1) == [str(root)]
+
+
+def test_too_many_dirs_need_a_full_scan(root, monkeypatch):
+    monkeypatch.setattr(get_data, "CATALOG_MAX_DIRS", 0)
+    scan(root)
+    assert get_data.get_cached_venvs(root) is not None
+    assert get_data.stale_catalog_paths(root, 1) is None
+
+
+def test_unchanged_records_are_kept(root):
+    scan(root)
+    listing = get_data.load_venv_catalog()["listings"][
+        get_data._catalog_key(root, 1)
+    ]
+    record = listing["venvs"]["one"]
+    scan(root)
+    listing = get_data.load_venv_catalog()["listings"][
+        get_data._catalog_key(root, 1)
+    ]
+    assert listing["venvs"]["one"] is record
+
+
+def test_save_forgets_sizes_of_unlisted_venvs(root, catalog_file, monkeypatch):
+    scan(root)
+    sizes = get_data.load_venv_catalog()["sizes"]
+    sizes[str(root / "one")] = [[0], 1]
+    sizes[str(root / "gone")] = [[0], 1]
+    reload_catalog(monkeypatch)
+
+    assert list(get_data.load_venv_catalog()["sizes"]) == [str(root / "one")]
+
+
+@pytest.mark.parametrize("content", [
+    "{not json",
+    json.dumps({"version": -1, "listings": {}}),
+    json.dumps([]),
+])
+def test_unreadable_catalog_starts_fresh(catalog_file, content):
+    catalog_file.write_text(content, encoding="utf-8")
+    catalog = get_data.load_venv_catalog()
+    assert catalog["version"] == get_data.CATALOG_VERSION
+    assert catalog["listings"] == {}
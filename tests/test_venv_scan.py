@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the venv discovery in `get_data.iter_venvs()`.
+"""
+import os
+
+import pytest
+
+import get_data
+
+
+PYVENV_CFG = "home = /usr/bin\nversion = 3.11.7\n"
+
+
+def make_venv(path):
+    path.mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text(PYVENV_CFG, encoding="utf-8")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    make_venv(tmp_path / "top")
+    make_venv(tmp_path / "top" / "nested")
+    make_venv(tmp_path / "sub" / "mid")
+    make_venv(tmp_path / "sub" / "deeper" / "low")
+    make_venv(tmp_path / "node_modules" / "skipped")
+    make_venv(tmp_path / "sub" / ".git" / "skipped")
+    (tmp_path / "plain").mkdir()
+    return tmp_path
+
+
+def names(path, **kwargs):
+    return {
+        venv_info.venv_name.replace(os.sep, "/")
+        for venv_info in get_data.iter_venvs(path, **kwargs)
+    }
+
+
+def test_depth_one_lists_direct_children_only(tree):
+    assert names(tree, depth=1) == {"top"}
+
+
+def test_depth_limits_the_descent(tree):
+    assert names(tree, depth=2) == {"top", "sub/mid"}
+    assert names(tree, depth=3) == {"top", "sub/mid", "sub/deeper/low"}
+
+
+def test_venvs_and_skipped_dirs_are_not_searched(tree):
+    found = names(tree, depth=8)
+    assert "top/nested" not in found
+    assert not any("skipped" in name for name in found)
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_symlinked_dirs_are_not_searched(tree, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("outside")
+    make_venv(outside / "linked" / "venv")
+    try:
+        os.symlink(outside / "linked", tree / "link")
+    except OSError:
+        pytest.skip("can't create symlinks")
+    assert "link/venv" not in names(tree, depth=3)
+
+
+def test_dir_stamps_record_the_listed_dirs(tree):
+    dir_stamps = {}
+    names(tree, depth=2, dir_stamps=dir_stamps)
+    assert str(tree) in dir_stamps
+    assert str(tree / "sub") in dir_stamps
+    assert str(tree / "top") not in dir_stamps
+
+
+def test_missing_dir_yields_nothing(tmp_path):
+    assert names(tmp_path / "missing") == set()
+
+
+def test_venv_info_fields(tree):
+    venv_info, = get_data.iter_venvs(tree, depth=1)
+    assert venv_info.venv_name == "top"
+    assert venv_info.venv_version == "Python 3.11.7"
+    assert venv_info.site_packages == "N/A"
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the shared wheelhouse: which installs are prefetched with
+`pip wheel`, the size limit and pruning the least recently used wheels.
+"""
+import os
+import hashlib
+import logging
+
+import pytest
+
+import get_data
+import wheelhouse
+
+
+@pytest.fixture(autouse=True)
+def wheel_dir(tmp_path, monkeypatch):
+    wheel_dir = tmp_path / "wheelhouse"
+    monkeypatch.setattr(get_data, "WHEELHOUSE_DIR", wheel_dir)
+    monkeypatch.setattr(
+        get_data, "WHEELHOUSE_INDEX", tmp_path / "wheelhouse.json"
+    )
+    monkeypatch.setattr(wheelhouse, "WHEELHOUSE_ENABLED", True)
+    return wheel_dir
+
+
+def wheel(wheel_dir, *args):
+    return ["wheel", "--wheel-dir", str(wheel_dir),
+            "--find-links", str(wheel_dir), *args]
+
+
+def requirements_file(tmp_path, content):
+    path = tmp_path / "requirements.txt"
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("requests", True),
+    ("requests[socks, security] >= 2.0, < 3", True),
+    ("Django==4.2.*", True),
+    ("./local/project", False),
+    ("https://example.com/pkg.whl", False),
+    ("git+https://example.com/repo.git", False),
+    ("pkg @ https://example.com/pkg.whl", False),
+    ("pkg; python_version < '3.8'", False),
+])
+def test_is_plain_requirement(spec, expected):
+    assert wheelhouse.is_plain_requirement(spec) is expected
+
+
+def test_is_plain_requirements_file(tmp_path):
+    path = requirements_file(
+        tmp_path, "# pinned\nrequests==2.31.0  # http\n\n"
+    )
+    assert wheelhouse.is_plain_requirements_file(path)
+    path = requirements_file(tmp_path, "requests\n-e ./project\n")
+    assert not wheelhouse.is_plain_requirements_file(path)
+    assert not wheelhouse.is_plain_requirements_file(tmp_path / "missing")
+
+
+def test_prefetch_args(wheel_dir):
+    assert wheelhouse.prefetch_args(
+        ["install", "--upgrade", "--pre", "--upgrade-strategy", "eager",
+         "-c", "constraints.txt", "requests>=2"]
+    ) == wheel(wheel_dir, "--pre", "-c", "constraints.txt", "requests>=2")
+    assert wheel_dir.is_dir()
+
+
+def test_prefetch_args_with_requirements_file(tmp_path, wheel_dir):
+    path = requirements_file(tmp_path, "requests\nidna\n")
+    assert wheelhouse.prefetch_args(
+        ["install", f"--requirement={path}"]
+    ) == wheel(wheel_dir, "--requirement", path)
+
+
+@pytest.mark.parametrize("install_args", [
+    ["uninstall", "requests"],
+    ["install"],
+    ["install", "--pre"],
+    ["install", "./project"],
+    ["install", "-e", "./project"],
+    ["install", "--index-url", "https://example.com", "requests"],
+    ["install", "requests", "-c"],
+])
+def test_installs_not_served_from_the_wheelhouse(install_args):
+    assert wheelhouse.prefetch_args(install_args) is None
+
+
+def test_disabled_wheelhouse(monkeypatch):
+    monkeypatch.setattr(wheelhouse, "WHEELHOUSE_ENABLED", False)
+    assert wheelhouse.prefetch_args(["install", "requests"]) is None
+    assert wheelhouse.find_links_options() == []
+
+
+def test_satisfied_requirements_are_not_fetched(wheel_dir):
+    installed = {"requests": "2.31.0", "idna": "3.6"}
+    assert wheelhouse.prefetch_args(
+        ["install", "requests>=2", "idna"], installed
+    ) is None
+    assert wheelhouse.prefetch_args(
+        ["install", "requests>=2", "idna>=4", "rich"], installed
+    ) == wheel(wheel_dir, "idna>=4", "rich")
+
+
+def test_extras_are_always_fetched(wheel_dir):
+    assert wheelhouse.prefetch_args(
+        ["install", "requests[socks]"], {"requests": "2.31.0"}
+    ) == wheel(wheel_dir, "requests[socks]")
+
+
+def test_upgrade_fetches_satisfied_requirements(wheel_dir):
+    assert wheelhouse.prefetch_args(
+        ["install", "-U", "requests", "rich"], {"requests": "2.31.0"}
+    ) == wheel(wheel_dir, "requests", "rich")
+
+
+def test_pip_upgrade_of_a_new_venv_is_fetched(wheel_dir):
+    # what `CreationWorker` runs in every new venv
+    installed = {"pip": "24.0", "setuptools": "65.5.0"}
+    assert wheelhouse.prefetch_args(
+        ["install", "--upgrade", "pip"], installed
+    ) == wheel(wheel_dir, "pip")
+    assert wheelhouse.prefetch_args(
+        ["install", "--upgrade", "pip", "wheel"], installed
+    ) == wheel(wheel_dir, "pip", "wheel")
+
+
+def test_reinstall_fetches_a_satisfied_requirements_file(tmp_path, wheel_dir):
+    path = requirements_file(tmp_path, "requests>=2\n")
+    assert wheelhouse.prefetch_args(
+        ["install", "--force-reinstall", "-r", path], {"requests": "2.31.0"}
+    ) == wheel(wheel_dir, "-r", path)
+
+
+def test_satisfied_requirements_file_is_not_fetched(tmp_path, wheel_dir):
+    path = requirements_file(tmp_path, "requests>=2\n")
+    installed = {"requests": "2.31.0"}
+    assert wheelhouse.prefetch_args(["install", "-r", path], installed) is None
+    assert wheelhouse.prefetch_args(
+        ["install", "-r", path, "rich"], installed
+    ) == wheel(wheel_dir, "rich")
+
+
+@pytest.mark.parametrize("requirement, expected", [
+    ("requests", True),
+    ("Requests_Toolbelt>=1.0", True),
+    ("requests>=3", False),
+    ("requests[socks]", False),
+    ("requests; python_version > '3'", False),
+    ("requests @ https://example.com/requests.whl", False),
+    ("rich", False),
+])
+def test_requirement_satisfied(requirement, expected):
+    installed = {"requests": "2.31.0", "requests-toolbelt": "1.0.0"}
+    assert get_data.requirement_satisfied(requirement, installed) is expected
+
+
+def test_installed_versions(tmp_path):
+    venv = tmp_path / "venv"
+    venv.mkdir()
+    (venv / "pyvenv.cfg").write_text(
+        "home = /usr/bin\nversion = 3.11.7\n", encoding="utf-8"
+    )
+    site_packages = get_data._site_packages_path(venv)
+    site_packages.mkdir(parents=True)
+    for name in (
+            "requests-2.31.0.dist-info",
+            "Requests_Toolbelt-1.0.0.dist-info",
+            "legacy-0.1-py3.11.egg-info",
+            "README.txt"
+    ):
+        (site_packages / name).mkdir()
+    assert get_data.installed_versions(venv, probe=False) == {
+        "requests": "2.31.0",
+        "requests-toolbelt": "1.0.0",
+        "legacy": "0.1",
+    }
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("", wheelhouse.DEFAULT_LIMIT * 1024 ** 2),
+    ("512", 512 * 1024 ** 2),
+    ("-1", 0),
+    ("lots", wheelhouse.DEFAULT_LIMIT * 1024 ** 2),
+])
+def test_limit_from_env(monkeypatch, value, expected):
+    monkeypatch.setenv("VENVIPY_WHEELHOUSE_LIMIT", value)
+    assert wheelhouse._limit_from_env() == expected
+
+
+def test_invalid_limit_is_logged(monkeypatch, caplog):
+    monkeypatch.setenv("VENVIPY_WHEELHOUSE_LIMIT", "2G")
+    with caplog.at_level(logging.WARNING, logger="wheelhouse"):
+        wheelhouse._limit_from_env()
+    assert "VENVIPY_WHEELHOUSE_LIMIT" in caplog.text
+
+
+def test_install_args(wheel_dir):
+    find_links = ["--find-links", str(wheel_dir)]
+    assert wheelhouse.offline_install_args(["install", "requests"]) == [
+        "install", "--no-index", *find_links, "requests"
+    ]
+    assert wheelhouse.online_install_args(["install", "requests"]) == [
+        "install", *find_links, "requests"
+    ]
+
+
+def test_wheel_names():
+    assert wheelhouse.wheel_names(
+        "Saved /tmp/wheels/idna-3.6-py3-none-any.whl\n"
+        "File was already downloaded 'requests-2.31.0-py3-none-any.whl'\n"
+    ) == {"idna-3.6-py3-none-any.whl", "requests-2.31.0-py3-none-any.whl"}
+
+
+def test_update_prunes_least_recently_used(wheel_dir):
+    wheelhouse.ensure_wheelhouse()
+    for name in ("old.whl", "used.whl", "new.whl"):
+        (wheel_dir / name).write_bytes(b"x" * 100)
+    wheelhouse.update_wheelhouse()
+
+    index = wheelhouse._load_index()
+    assert set(index) == {"old.whl", "used.whl", "new.whl"}
+    record = index["old.whl"]
+    assert record["sha256"] == hashlib.sha256(b"x" * 100).hexdigest()
+    assert record["size"] == 100
+
+    # age the wheels past the grace period, then use `used.whl` again
+    for name, age in (("old.whl", 3), ("used.whl", 2), ("new.whl", 1)):
+        index[name]["last_used"] -= wheelhouse.PRUNE_GRACE * age
+    wheelhouse._save_index(index)
+    wheelhouse.update_wheelhouse(used={"used.whl"}, limit=200)
+
+    assert sorted(os.listdir(wheel_dir)) == ["new.whl", "used.whl"]
+    assert set(wheelhouse._load_index()) == {"new.whl", "used.whl"}
@@ -21,24 +21,37 @@ This module creates all the stuff requested.
 """
 import logging
 import shlex
+import time
 import os
+import queue
+import codecs
+import threading
+from dataclasses import replace
 from pathlib import Path
 from subprocess import Popen, PIPE, STDOUT, run
 from random import randint
 
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 
-from manage_pip import PipManager
+import get_data
+from manage_pip import (
+    PipManager,
+    PipProgressParser,
+    BACKEND_PIP,
+    BACKEND_UV,
+    find_uv,
+    select_backend
+)
+from jobs import Job, JOB_FAILED, job_manager, yield_to_interactive
 
 
 logger = logging.getLogger(__name__)
 
 # commands / options
 cmds = [
-    "install --no-cache-dir",  # 0
+    "install",  # 0
     "list",  # 1
     "freeze",  # 2
-    "pipdeptree",  # 3
 ]
 opts = [
     "--upgrade",  # 0
@@ -54,59 +67,168 @@ opts = [
 
 class InstallWorker(QObject):
     """
-    This worker performs package installs.
+    This worker performs package installs. The output is read by a
+    separate thread, decoded incrementally and sent as batches of lines,
+    at most every `BATCH_INTERVAL` seconds, together with the progress
+    parsed from it. Errors and warnings of a failed run are repeated
+    at the end.
     """
     started = pyqtSignal()
     finished = pyqtSignal()
     text_changed = pyqtSignal(str)
+    progress_changed = pyqtSignal(object)
+
+    BATCH_INTERVAL = 0.05  # seconds
+    CHUNK_SIZE = 65536
 
     @pyqtSlot(str)
-    def run_process(self, command):
-        """Run the process.
+    def run_process(self, command, fallback=None):
+        """
+        Run the process. If it fails and a `fallback` command is given
+        (pip for a uv command), that one is run instead.
         """
         self.started.emit()
-        self.install_process(command)
+        exit_code = self.install_process(command, final=fallback is None)
+        if fallback is not None:
+            if exit_code is None or exit_code > 0:
+                logger.warning("uv failed, running pip instead")
+                self.text_changed.emit("uv failed, running pip instead...\n")
+                self.install_process(fallback)
+            else:
+                self.text_changed.emit("\n\nPress [ESC] to continue...\n")
         self.finished.emit()
 
 
-    def install_process(self, command):
-        """Install a package via subprocess.
+    @staticmethod
+    def _read_output(fd, chunks):
+        """Put the bytes read from `fd` into `chunks` until EOF.
+        """
+        try:
+            while True:
+                chunk = os.read(fd, InstallWorker.CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.put(chunk)
+        except OSError:
+            pass
+        finally:
+            chunks.put(None)
+
+
+    def install_process(self, command, final=True):
+        """
+        Install a package via subprocess (`python -m pip install ...`
+        or `uv pip install --python <python> ...`) and return the exit
+        code, `None` if it couldn't be started.
         """
         os.environ["PYTHONUNBUFFERED"] = "1"
         errors = []
+        batch = []
+        progress = PipProgressParser()
 
         args = shlex.split(command) if isinstance(command, str) else command
-
-        with Popen(
-            args,
-            stdout=PIPE,
-            stderr=STDOUT,
-            encoding="utf-8",
-            errors="replace",
-        ) as process:
-            while process.poll() is None:
-                output = process.stdout.readline()
-
-                if output != "":
-                    logger.debug(output.strip())
-                    if output.lstrip().startswith((
-                        "ERROR",
-                        "WARNING",
-                        "fatal",
-                        "remote"
-                    )):
-                        errors.append(output.strip())
+        if args[1:2] == ["pip"]:
+            backend = BACKEND_UV
+            venv_python = args[args.index("--python") + 1]
+        else:
+            backend = BACKEND_PIP
+            venv_python = args[0]
+
+        try:
+            process = Popen(args, stdout=PIPE, stderr=STDOUT, bufsize=0)
+        except OSError as e:
+            logger.error(f"Could not start {args[0]}: {e}")
+            self.text_changed.emit(f"Could not start {args[0]}: {e}")
+            return None
+
+        with process:
+            job = job_manager().track(Job(
+                title=f"{backend} install",
+                venv=str(Path(venv_python).parent.parent),
+                program=args[0],
+                args=args[1:],
+                cancel_callback=process.terminate,
+                kill_callback=process.kill
+            ))
+            exit_code = None
+            try:
+                chunks = queue.SimpleQueue()
+                reader = threading.Thread(
+                    target=self._read_output,
+                    args=(process.stdout.fileno(), chunks),
+                    daemon=True
+                )
+                reader.start()
+
+                decoder = codecs.getincrementaldecoder("utf-8")("replace")
+                pending = ""
+                last_emit = time.monotonic()
+                eof = False
+                while not eof:
+                    elapsed = time.monotonic() - last_emit
+                    timeout = self.BATCH_INTERVAL - elapsed
+                    try:
+                        chunk = chunks.get(timeout=max(timeout, 0))
+                    except queue.Empty:
+                        chunk = b""
+
+                    if chunk is None:
+                        eof = True
+                        text = pending + decoder.decode(b"", True)
+                        lines = [text] if text else []
+                        pending = ""
+                    elif chunk:
+                        text = pending + decoder.decode(chunk)
+                        text = text.replace("\r\n", "\n")
+                        *lines, pending = text.split("\n")
                     else:
-                        self.text_changed.emit(output.strip())
-
-            if errors:
-                errors.insert(0, " ")
-                for line in errors:
-                    self.text_changed.emit(line)
-
-            self.text_changed.emit("\n\nPress [ESC] to continue...\n")
-            logger.debug(f"Exit code: {process.returncode}")
-            return process.returncode
+                        lines = []
+
+                    for line in lines:
+                        if progress.feed_line(line):
+                            continue
+                        logger.debug(line.strip())
+                        if line.lstrip().startswith((
+                            "ERROR",
+                            "WARNING",
+                            "fatal",
+                            "remote"
+                        )):
+                            errors.append(line.strip())
+                        batch.append(line.strip())
+
+                    now = time.monotonic()
+                    if eof or now - last_emit >= self.BATCH_INTERVAL:
+                        if progress.changed:
+                            self.progress_changed.emit(progress.snapshot())
+                        if batch:
+                            job.output.append("\n".join(batch) + "\n")
+                            self.text_changed.emit("\n".join(batch))
+                            batch = []
+                    if now - last_emit >= self.BATCH_INTERVAL:
+                        last_emit = now
+
+                reader.join()
+                process.wait()
+                exit_code = process.returncode
+            finally:
+                # complete the job even if reading the output failed
+                if exit_code is None:
+                    process.kill()
+                    job_manager().complete(job, None, JOB_FAILED)
+                else:
+                    job_manager().complete(job, exit_code)
+
+            # repeat the errors and warnings of a failed run at the end
+            if errors and exit_code != 0:
+                self.text_changed.emit(
+                    "\n".join([" ", "Errors and warnings:", *errors])
+                )
+
+            if final:
+                self.text_changed.emit("\n\nPress [ESC] to continue...\n")
+            logger.debug(f"Exit code: {exit_code}")
+            return exit_code
 
 
 
@@ -133,12 +255,50 @@ class CreationWorker(QObject):
         py_vers, name, location, with_pip, with_wheel, site_packages = args
         env_dir = Path(location) / name
 
-        create_venv(
+        command = venv_commands(
             py_vers,
             env_dir,
             with_pip=with_pip,
             system_site_packages=site_packages
-        )
+        )[0]
+        job = job_manager().track(Job(
+            title="Create venv",
+            venv=str(env_dir),
+            program=command[0],
+            args=command[1:]
+        ))
+        res = None
+        try:
+            res = create_venv(
+                py_vers,
+                env_dir,
+                with_pip=with_pip,
+                system_site_packages=site_packages
+            )
+        except OSError as e:
+            logger.error(f"Failed to create '{env_dir}': {e}")
+            job.output.append(f"{e}\n")
+        finally:
+            if res is None:
+                job_manager().complete(job, None, JOB_FAILED)
+            else:
+                # record what actually ran (venv if uv failed)
+                job.program, job.args = res.args[0], list(res.args[1:])
+                if res.stdout:
+                    job.output.append(res.stdout)
+                job_manager().complete(job, res.returncode)
+
+        if res is None:
+            self.finished.emit()
+            return
+
+        if res.returncode != 0:
+            logger.error(
+                f"Failed to create '{env_dir}' "
+                f"(exit code {res.returncode}): {(res.stdout or '').strip()}"
+            )
+            self.finished.emit()
+            return
 
         if with_pip and not with_wheel:
             self.manager = PipManager(location, name)
@@ -154,28 +314,432 @@ class CreationWorker(QObject):
             self.finished.emit()
 
 
+#]===========================================================================[#
+#] WORKER (SCAN VENV DIRECTORY) [#==========================================[#
+#]===========================================================================[#
+
+class VenvScanWorker(QObject):
+    """
+    Worker that scans a directory for virtual environments and streams
+    the results in batches, so the venv table can fill while scanning.
+    Every scan is identified by a token chosen by the caller.
+    """
+    found = pyqtSignal(int, list)
+    finished = pyqtSignal(int)
+    refreshed = pyqtSignal(int, list, list, dict)
+
+    BATCH_SIZE = 200
+    BATCH_INTERVAL = 0.05  # seconds
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cancelled = set()
+
+
+    def cancel(self, token):
+        """Stop the scan with `token` (can be called from any thread).
+        """
+        self._cancelled.add(token)
+
+
+    @pyqtSlot(int, str, int)
+    def scan(self, token, path, depth):
+        """
+        Scan `path` up to `depth` levels deep and emit the found venvs
+        in batches. The result of a complete scan is cached.
+        """
+        if token in self._cancelled:
+            self._cancelled.discard(token)
+            return
+
+        found = []
+        batch = []
+        dir_stamps = {}
+        last_emit = time.monotonic()
+        venvs = get_data.iter_venvs(path, depth=depth, dir_stamps=dir_stamps)
+        try:
+            for venv_info in venvs:
+                yield_to_interactive(lambda: token in self._cancelled)
+                if token in self._cancelled:
+                    logger.debug(f"Cancelled scanning '{path}'")
+                    break
+
+                found.append(venv_info)
+                batch.append(venv_info)
+                now = time.monotonic()
+                if (
+                    len(batch) >= self.BATCH_SIZE
+                    or now - last_emit >= self.BATCH_INTERVAL
+                ):
+                    self.found.emit(token, batch)
+                    batch = []
+                    last_emit = now
+        finally:
+            venvs.close()
+
+        if token in self._cancelled:
+            self._cancelled.discard(token)
+            return
+
+        get_data.cache_venvs(path, depth, found, dir_stamps, full_scan=True)
+        if batch:
+            self.found.emit(token, batch)
+        self.finished.emit(token)
+
+        self._probe_venvs(
+            token, [os.path.join(path, info.venv_name) for info in found]
+        )
+        get_data.save_venv_catalog()
+
+
+    @pyqtSlot(int, str, list, int)
+    def refresh(self, token, root, paths, depth):
+        """
+        Rescan only the given `paths` below `root` and emit one
+        `(scope, exact, venv_infos)` tuple per path. `scope` is the path
+        relative to `root` ("" for the root itself), `exact` is `True`
+        if the path is a venv itself and `venv_infos` replaces everything
+        the venv table currently holds within that scope. Subfolders of
+        the paths that may still become venvs and the modification times
+        of the directories listed are emitted as well.
+        """
+        result = self._rescan(root, paths, depth)
+        self.refreshed.emit(token, *result)
+        self._probe_rescanned(token, root, result[0])
+
+
+    @pyqtSlot(int, str, int)
+    def revalidate(self, token, root, depth):
+        """
+        Check the catalog snapshot of `root` against the disk and rescan
+        what changed (everything, if the catalog can't tell). The result
+        is emitted like `refresh()` does.
+        """
+        paths = get_data.stale_catalog_paths(root, depth)
+        if paths is None:
+            paths = [root]
+        logger.debug(f"Revalidating '{root}': {len(paths)} changed path(s)")
+        result = self._rescan(root, paths, depth)
+        self.refreshed.emit(token, *result)
+        self._probe_rescanned(token, root, result[0])
+
+
+    def _probe_venvs(self, token, venv_paths):
+        """
+        Warm the cached install locations and pip versions of venvs, so
+        the GUI thread finds them without running the interpreters.
+        """
+        results = get_data.iter_probe_venvs(venv_paths)
+        try:
+            for _ in results:
+                yield_to_interactive(lambda: token in self._cancelled)
+                if token in self._cancelled:
+                    break
+        finally:
+            results.close()
+
+
+    def _probe_rescanned(self, token, root, scopes):
+        self._probe_venvs(token, [
+            os.path.join(root, info.venv_name)
+            for _, _, venv_infos in scopes
+            for info in venv_infos
+        ])
+
+
+    def _rescan(self, root, paths, depth):
+        scopes = []
+        watch_dirs = []
+        dir_stamps = {}
+        for path in paths:
+            rel_path = os.path.relpath(path, root)
+            if rel_path == os.curdir:
+                rel_path = ""
+            elif rel_path.split(os.sep, 1)[0] == os.pardir:
+                continue
+
+            venv_info = get_data.read_venv_info(path, root)
+            if venv_info is not None:
+                scopes.append((rel_path, True, [venv_info]))
+                continue
+
+            venv_infos = []
+            level = len(Path(rel_path).parts) if rel_path else 0
+            if level < depth and os.path.isdir(path):
+                for venv_info in get_data.iter_venvs(
+                        path,
+                        depth=depth - level,
+                        dir_stamps=dir_stamps
+                    ):
+                    venv_infos.append(replace(
+                        venv_info,
+                        venv_name=os.path.join(rel_path, venv_info.venv_name)
+                    ))
+                try:
+                    with os.scandir(path) as entries:
+                        watch_dirs.extend(
+                            entry.path for entry in entries
+                            if entry.name not in get_data.SCAN_SKIP_DIRS
+                            and entry.is_dir(follow_symlinks=False)
+                        )
+                except OSError:
+                    pass
+            elif not os.path.isdir(path):
+                dir_stamps[os.path.abspath(path)] = None
+            scopes.append((rel_path, False, venv_infos))
+
+        return scopes, watch_dirs, dir_stamps
+
+
+
+#]===========================================================================[#
+#] WORKER (DISK USAGE) [#====================================================[#
+#]===========================================================================[#
+
+class DiskUsageWorker(QObject):
+    """
+    Worker that measures the disk usage of venvs one after another and
+    emits each size as soon as it's known. Requests are identified by a
+    token chosen by the caller and can be cancelled while running.
+    """
+    measured = pyqtSignal(int, str, object)
+    finished = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cancelled = set()
+
+
+    def cancel(self, token):
+        """Stop the request with `token` (can be called from any thread).
+        """
+        self._cancelled.add(token)
+
+
+    @pyqtSlot(int, str, list)
+    def measure(self, token, root, venv_names):
+        """
+        Emit `(token, venv_name, size)` for each of `venv_names` in `root`.
+        The size is `None` if the venv is gone.
+        """
+        def cancelled():
+            return token in self._cancelled
+
+        for venv_name in venv_names:
+            yield_to_interactive(cancelled)
+            if cancelled():
+                break
+            size = get_data.get_venv_size(
+                os.path.join(root, venv_name), cancelled
+            )
+            if not cancelled():
+                self.measured.emit(token, venv_name, size)
+
+        if cancelled():
+            self._cancelled.discard(token)
+            return
+
+        self.finished.emit(token)
+
+
+
+#]===========================================================================[#
+#] WORKER (HEALTH CHECK) [#==================================================[#
+#]===========================================================================[#
+
+class HealthCheckWorker(QObject):
+    """
+    Worker that checks the health of venvs in parallel and emits
+    the results in batches. Requests are identified by a token
+    chosen by the caller and can be cancelled while running.
+    """
+    checked = pyqtSignal(int, list)
+    finished = pyqtSignal(int)
+
+    BATCH_INTERVAL = 0.1  # seconds
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cancelled = set()
+
+
+    def cancel(self, token):
+        """Stop the request with `token` (can be called from any thread).
+        """
+        self._cancelled.add(token)
+
+
+    @pyqtSlot(int, str, list)
+    def check(self, token, root, venv_names):
+        """
+        Emit `(venv_name, VenvHealth)` tuples for `venv_names` in `root`.
+        """
+        names = {os.path.join(root, name): name for name in venv_names}
+        batch = []
+        last_emit = time.monotonic()
+        results = get_data.iter_venvs_health(list(names))
+        try:
+            for venv_path, venv_health in results:
+                yield_to_interactive(lambda: token in self._cancelled)
+                if token in self._cancelled:
+                    break
+
+                batch.append((names[venv_path], venv_health))
+                now = time.monotonic()
+                if now - last_emit >= self.BATCH_INTERVAL:
+                    self.checked.emit(token, batch)
+                    batch = []
+                    last_emit = now
+        finally:
+            results.close()
+
+        if token in self._cancelled:
+            self._cancelled.discard(token)
+            return
+
+        if batch:
+            self.checked.emit(token, batch)
+        self.finished.emit(token)
+
+
+
+class PackageScanWorker(QObject):
+    """
+    Worker that reads the installed packages of a venv in parallel
+    and emits them in batches as they arrive. Requests are identified
+    by a token chosen by the caller and can be cancelled while running.
+    """
+    found = pyqtSignal(int, list)
+    finished = pyqtSignal(int)
+
+    BATCH_INTERVAL = 0.05  # seconds
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cancelled = set()
+
+
+    def cancel(self, token):
+        """Stop the request with `token` (can be called from any thread).
+        """
+        self._cancelled.add(token)
+
+
+    @pyqtSlot(int, str, str)
+    def scan(self, token, venv_location, venv_name):
+        """
+        Emit `PackageInfo` objects of the packages installed in the
+        venv `venv_name` in `venv_location`.
+        """
+        batch = []
+        last_emit = time.monotonic()
+        results = get_data.iter_installed_packages(venv_location, venv_name)
+        try:
+            for pkg_info in results:
+                if token in self._cancelled:
+                    break
+
+                batch.append(pkg_info)
+                now = time.monotonic()
+                if now - last_emit >= self.BATCH_INTERVAL:
+                    self.found.emit(token, batch)
+                    batch = []
+                    last_emit = now
+        finally:
+            results.close()
+
+        if token in self._cancelled:
+            self._cancelled.discard(token)
+            return
+
+        if batch:
+            self.found.emit(token, batch)
+        self.finished.emit(token)
+
+
+
 #]===========================================================================[#
 #] CREATE A VIRTUAL ENVIRONMENT [#===========================================[#
 #]===========================================================================[#
 
-def create_venv(
+def venv_commands(
         py_vers,
         env_dir,
         with_pip=False,
-        system_site_packages=False
+        system_site_packages=False,
+        backend=None
     ):
-    """Create a virtual environment in a directory.
     """
-    env_path = Path(env_dir)
-    env_path.parent.mkdir(parents=True, exist_ok=True)
-
-    args = [py_vers, "-m", "venv", str(env_path)]
+    Return the commands that can create the virtual environment, in the
+    order to try them: `uv venv` if uv is the `backend` (the default if
+    it's selected for "venv"), then `python -m venv`.
+    """
+    commands = []
+    if backend is None:
+        backend = select_backend("venv")
+
+    if backend == BACKEND_UV and find_uv() is not None:
+        args = [find_uv(), "venv", "--python", py_vers, str(env_dir)]
+        if with_pip:
+            args.append("--seed")
+        if system_site_packages:
+            args.append("--system-site-packages")
+        commands.append(args)
+
+    args = [py_vers, "-m", "venv", str(env_dir)]
     if not with_pip:
         args.append("--without-pip")
     if system_site_packages:
         args.append("--system-site-packages")
+    commands.append(args)
+    return commands
 
-    res = run(
+
+def create_venv(
+        py_vers,
+        env_dir,
+        with_pip=False,
+        system_site_packages=False,
+        backend=None
+    ):
+    """
+    Create a virtual environment in a directory with the first of the
+    `venv_commands()` that succeeds. Return the `CompletedProcess` of
+    the command that ran last, its `args`, `returncode` and `stdout`
+    tell what was done. Raise `OSError` if Python can't be started.
+    """
+    env_path = Path(env_dir)
+    env_path.parent.mkdir(parents=True, exist_ok=True)
+
+    *attempts, args = venv_commands(
+        py_vers,
+        env_path,
+        with_pip=with_pip,
+        system_site_packages=system_site_packages,
+        backend=backend
+    )
+    for uv_args in attempts:
+        try:
+            res = run(
+                uv_args,
+                stdout=PIPE,
+                stderr=STDOUT,
+                encoding="utf-8",
+                errors="replace",
+                text=True,
+                check=False,
+            )
+        except OSError as e:
+            logger.warning(f"Could not start uv, using venv instead: {e}")
+            continue
+        if res.returncode == 0:
+            return res
+        logger.warning(
+            f"uv failed to create '{env_path}', using venv instead: "
+            f"{(res.stdout or '').strip()}"
+        )
+
+    return run(
         args,
         stdout=PIPE,
         stderr=STDOUT,
@@ -185,8 +749,6 @@ def create_venv(
         check=False,
     )
 
-    return (res.stdout or "").strip()
-
 
 #]===========================================================================[#
 #] REQUIREMENTS [#===========================================================[#
@@ -21,16 +21,32 @@ This module contains some dialogs.
 """
 import sys
 import logging
-from datetime import date
+from array import array
+from datetime import date, datetime
 from typing import Any, Dict
 
-from PyQt6.QtGui import QFont, QIcon, QPixmap
-from PyQt6.QtCore import Qt, pyqtSlot, pyqtSignal
+from PyQt6.QtGui import (
+    QFont,
+    QIcon,
+    QPixmap,
+    QStandardItem,
+    QStandardItemModel,
+    QTextCursor
+)
+from PyQt6.QtCore import (
+    Qt,
+    pyqtSlot,
+    pyqtSignal,
+    QAbstractListModel,
+    QModelIndex,
+    QTimer
+)
 from PyQt6.QtWidgets import (
     QDialog,
     QHBoxLayout,
     QVBoxLayout,
     QLabel,
+    QListView,
     QPlainTextEdit,
     QProgressBar,
     QPushButton,
@@ -38,11 +54,18 @@ from PyQt6.QtWidgets import (
     QGridLayout,
     QGroupBox,
     QCheckBox,
-    QMessageBox
+    QMessageBox,
+    QWidget,
+    QSpinBox,
+    QTableView,
+    QAbstractItemView
 )
 
 import venvipy_rc  # pylint: disable=unused-import
+import get_data
 from get_data import __version__
+from manage_pip import PHASE_DONE, PHASE_FAILED
+from jobs import JOB_FAILED, PRIORITY_LABELS, job_manager
 from styles.theme import DIALOG_QSS
 
 
@@ -52,6 +75,17 @@ WINDOW_ICON_PATH = ":/img/profile.png"
 ABOUT_LOGO_PATH = ":/img/default.png"
 CONSOLE_DIALOG_WIDTH = 1375
 CONSOLE_DIALOG_HEIGHT = 775
+CONSOLE_MAX_BLOCKS = 5000
+CONSOLE_FRAME_INTERVAL = 16  # ms
+CONSOLE_QSS = """
+    QPlainTextEdit, QListView {
+        background-color: black;
+        color: lightgrey;
+        selection-background-color: rgb(50, 50, 60);
+        selection-color: rgb(0, 255, 0)
+    }
+"""
+PROGRESS_STEPS = 1000
 LAUNCHER_LABELS = {
     "desktop_venvipy": "Desktop / VenviPy",
     "desktop_wizard": "Desktop / Wizard only",
@@ -158,6 +192,28 @@ def disable_window_buttons(dialog, *, close=True, minimize=True):
     dialog.setWindowFlags(flags)
 
 
+def _format_bytes(size):
+    """Return a size in bytes like pip prints it.
+    """
+    for unit in ("B", "kB", "MB", "GB"):
+        if size < 1000:
+            break
+        size /= 1000
+    else:
+        unit = "TB"
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+
+def _format_eta(seconds):
+    """Return `seconds` as `m:ss` or `h:mm:ss`.
+    """
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
 class BaseDialog(QDialog):
     """Base dialog with shared helpers.
     """
@@ -216,14 +272,41 @@ class ProgBarDialog(BaseDialog):
 #] CONSOLE DIALOG [#=========================================================[#
 #]===========================================================================[#
 
+class ConsoleWindow(QPlainTextEdit):
+    """
+    Console-like text widget that tells when it was cleared.
+    """
+    cleared = pyqtSignal()
+
+    def clear(self):
+        super().clear()
+        self.cleared.emit()
+
+
 class ConsoleDialog(BaseDialog):
     """
     Dialog box printing the output to a console-like 
     widget when running commands.
+
+    Incoming text is collected and appended once per frame. The widget
+    keeps the last `CONSOLE_MAX_BLOCKS` lines, the full transcript is
+    written to a log file in `get_data.CONSOLE_LOG_DIR` and can be
+    opened from the dialog once lines were dropped. The log file is
+    closed when the dialog closes (and continued if it's shown again),
+    clearing `console_window` starts a new transcript.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
 
+        self._pending = []
+        self._log_file = None
+        self.log_path = None
+
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(CONSOLE_FRAME_INTERVAL)
+        self._frame_timer.timeout.connect(self.flush_pending)
+
         self.initUI()
 
 
@@ -232,27 +315,48 @@ class ConsoleDialog(BaseDialog):
         self.setWindowIcon(QIcon(WINDOW_ICON_PATH))
         self.disable_window_buttons(close=True, minimize=True)
 
-        self.setStyleSheet(
-            DIALOG_QSS + """
-            QPlainTextEdit {
-                background-color: black;
-                color: lightgrey;
-                selection-background-color: rgb(50, 50, 60);
-                selection-color: rgb(0, 255, 0)
-            }
-            """
-        )
+        self.setStyleSheet(DIALOG_QSS + CONSOLE_QSS)
 
-        self.console_window = QPlainTextEdit()
+        self.console_window = ConsoleWindow()
         self.console_window.setReadOnly(True)
         self.console_window.setFont(QFont("Monospace", 11))
         self.console_window.setLineWrapMode(
             QPlainTextEdit.LineWrapMode.WidgetWidth
         )
-        self.console_window.setMaximumBlockCount(5000)
+        self.console_window.setMaximumBlockCount(CONSOLE_MAX_BLOCKS)
+        self.console_window.cleared.connect(self.on_cleared)
+
+        # progress of pip installs, shown when there is some
+        self.progress_label = QLabel(self)
+        self.package_bar = QProgressBar(self)
+        self.package_bar.setTextVisible(False)
+        self.overall_bar = QProgressBar(self)
+        self.overall_bar.setTextVisible(False)
+        self.stats_label = QLabel(self)
+
+        self.progress_panel = QWidget(self)
+        grid_layout = QGridLayout(self.progress_panel)
+        grid_layout.setContentsMargins(0, 0, 0, 0)
+        grid_layout.addWidget(self.progress_label, 0, 0)
+        grid_layout.addWidget(self.package_bar, 0, 1)
+        grid_layout.addWidget(self.stats_label, 1, 0)
+        grid_layout.addWidget(self.overall_bar, 1, 1)
+        grid_layout.setColumnStretch(1, 1)
+        self.progress_panel.hide()
+
+        self.log_button = QPushButton("Show &full log", self)
+        self.log_button.setAutoDefault(False)
+        self.log_button.clicked.connect(self.show_full_log)
+        self.log_button.hide()
+
+        h_layout = QHBoxLayout()
+        h_layout.addStretch(1)
+        h_layout.addWidget(self.log_button)
 
         v_layout = QVBoxLayout(self)
         v_layout.addWidget(self.console_window)
+        v_layout.addWidget(self.progress_panel)
+        v_layout.addLayout(h_layout)
         self.center_console()
 
     def showEvent(self, event):
@@ -272,7 +376,669 @@ class ConsoleDialog(BaseDialog):
         """
         if message.endswith("\n"):
             message = message[:-1]
-        self.console_window.appendPlainText(message)
+        self._pending.append(message)
+        self.write_log(message)
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+
+    def write_log(self, message):
+        """Append `message` to the transcript.
+        """
+        if self._log_file is None:
+            try:
+                if self.log_path is None:
+                    self.log_path = get_data.new_console_log()
+                self._log_file = open(self.log_path, "a", encoding="utf-8")
+            except OSError as e:
+                logger.debug(f"Could not write console log: {e}")
+                self.log_path = None
+                return
+        try:
+            self._log_file.write(f"{message}\n")
+        except OSError as e:
+            logger.debug(f"Could not write console log: {e}")
+
+
+    @pyqtSlot()
+    def flush_pending(self):
+        """Append the collected text to `console_window`.
+        """
+        self._frame_timer.stop()
+        if not self._pending:
+            return
+
+        text = "\n".join(self._pending)
+        self._pending = []
+        line_count = text.count("\n") + 1
+        if line_count > CONSOLE_MAX_BLOCKS:
+            text = "\n".join(text.split("\n")[-CONSOLE_MAX_BLOCKS:])
+
+        block_count = self.console_window.blockCount()
+        if self.console_window.document().isEmpty():
+            block_count = 0
+        self.console_window.appendPlainText(text)
+
+        if self._log_file is not None:
+            self._log_file.flush()
+            if block_count + line_count > CONSOLE_MAX_BLOCKS:
+                self.log_button.show()
+
+
+    @pyqtSlot(object)
+    def update_progress(self, progress):
+        """
+        Show a `PipProgress`: the current package, the overall progress,
+        the download throughput and the estimated time left.
+        """
+        self.progress_panel.show()
+
+        label = progress.phase
+        if progress.package:
+            label = f"{label} {progress.package}"
+        self.progress_label.setText(label)
+
+        if progress.package_total:
+            self.package_bar.setRange(0, PROGRESS_STEPS)
+            self.package_bar.setValue(int(
+                PROGRESS_STEPS * progress.package_done / progress.package_total
+            ))
+        elif progress.phase in (PHASE_DONE, PHASE_FAILED):
+            self.package_bar.setRange(0, PROGRESS_STEPS)
+            self.package_bar.setValue(PROGRESS_STEPS)
+        else:
+            self.package_bar.setRange(0, 0)
+
+        if progress.fraction is None:
+            self.overall_bar.setRange(0, 0)
+        else:
+            self.overall_bar.setRange(0, PROGRESS_STEPS)
+            self.overall_bar.setValue(int(PROGRESS_STEPS * progress.fraction))
+
+        stats = [f"{progress.collected} collected"]
+        if progress.to_install:
+            stats.append(f"{progress.installed}/{progress.to_install} installed")
+        if progress.total_bytes:
+            stats.append(
+                f"{_format_bytes(progress.done_bytes)} of "
+                f"{_format_bytes(progress.total_bytes)}"
+            )
+        if progress.throughput:
+            stats.append(f"{_format_bytes(progress.throughput)}/s")
+        if progress.eta is not None:
+            stats.append(f"ETA {_format_eta(progress.eta)}")
+        self.stats_label.setText(" \u00b7 ".join(stats))
+
+
+    def close_log(self):
+        """Close the transcript file, `write_log()` reopens it.
+        """
+        if self._log_file is not None:
+            try:
+                self._log_file.close()
+            except OSError as e:
+                logger.debug(f"Could not write console log: {e}")
+            self._log_file = None
+
+
+    def done(self, result):
+        self.flush_pending()
+        self.close_log()
+        super().done(result)
+
+
+    def closeEvent(self, event):
+        self.flush_pending()
+        self.close_log()
+        super().closeEvent(event)
+
+
+    @pyqtSlot()
+    def on_cleared(self):
+        """Drop pending text, progress and start a new transcript.
+        """
+        self._frame_timer.stop()
+        self._pending = []
+        self.progress_panel.hide()
+        self.log_button.hide()
+        self.close_log()
+        self.log_path = None
+
+
+    @pyqtSlot()
+    def show_full_log(self):
+        """Open the transcript in a `ConsoleLogViewer`.
+        """
+        self.flush_pending()
+        if self.log_path is None:
+            return
+        viewer = ConsoleLogViewer(self.log_path, self)
+        viewer.setWindowTitle(f"{self.windowTitle()} - full log")
+        viewer.exec()
+
+
+
+class ConsoleLogModel(QAbstractListModel):
+    """
+    List model showing the lines of a log file. Only the offsets of the
+    lines are kept in memory, a line is read when it gets displayed.
+    """
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, log_path, parent=None):
+        super().__init__(parent)
+
+        self._file = open(log_path, "rb")
+        self._offsets = array("q", [0])
+        self._index_lines()
+
+
+    def _index_lines(self):
+        """Collect the offset of every line start.
+        """
+        position = 0
+        while True:
+            chunk = self._file.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            start = chunk.find(b"\n")
+            while start != -1:
+                self._offsets.append(position + start + 1)
+                start = chunk.find(b"\n", start + 1)
+            position += len(chunk)
+
+        # text after the last line break
+        if position > self._offsets[-1]:
+            self._offsets.append(position)
+
+
+    def close(self):
+        """Close the log file.
+        """
+        self._file.close()
+
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._offsets) - 1
+
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+
+        start = self._offsets[index.row()]
+        self._file.seek(start)
+        line = self._file.read(self._offsets[index.row() + 1] - start)
+        return line.decode("utf-8", "replace").rstrip("\r\n")
+
+
+
+class ConsoleLogViewer(BaseDialog):
+    """
+    Dialog showing a complete console transcript.
+    """
+    def __init__(self, log_path, parent=None):
+        super().__init__(parent)
+
+        self.model = ConsoleLogModel(log_path, self)
+
+        self.resize(CONSOLE_DIALOG_WIDTH, CONSOLE_DIALOG_HEIGHT)
+        self.setWindowIcon(QIcon(WINDOW_ICON_PATH))
+        self.setStyleSheet(DIALOG_QSS + CONSOLE_QSS)
+
+        self.log_view = QListView(self)
+        self.log_view.setFont(QFont("Monospace", 11))
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setSelectionMode(
+            QListView.SelectionMode.ExtendedSelection
+        )
+        self.log_view.setModel(self.model)
+        self.log_view.scrollToBottom()
+
+        path_label = QLabel(
+            f"{self.model.rowCount()} lines in {log_path}", self
+        )
+        path_label.setTextInteractionFlags(
+            Qt.TextInteractionFlag.TextSelectableByMouse
+        )
+
+        v_layout = QVBoxLayout(self)
+        v_layout.addWidget(self.log_view)
+        v_layout.addWidget(path_label)
+        self.center()
+
+
+    def done(self, result):
+        self.model.close()
+        super().done(result)
+
+
+
+#]===========================================================================[#
+#] BATCH DIALOG [#===========================================================[#
+#]===========================================================================[#
+
+class BatchDialog(BaseDialog):
+    """
+    Run the same operation as jobs for several venvs and show the
+    results: state, exit code and duration of every job, the output of
+    the selected job, and a summary. The rows are named by `labels`
+    (one per job), or by the venv (or title) of the job.
+    """
+    COLUMNS = ["Environment", "Status", "Exit code", "Time"]
+
+    def __init__(self, title, jobs, parent=None, labels=None):
+        super().__init__(parent)
+
+        self.jobs = list(jobs)
+        self._rows = {}
+        self.manager = job_manager()
+        self.manager.job_started.connect(self.update_job)
+        self.manager.job_finished.connect(self.update_job)
+        self.manager.job_output.connect(self.on_job_output)
+
+        self.setWindowTitle(title)
+        self.initUI()
+
+        if labels is None:
+            labels = [job.venv or job.title for job in self.jobs]
+        for job, label in zip(self.jobs, labels):
+            self._rows[job.id] = self.model.rowCount()
+            self.model.appendRow([
+                QStandardItem(label),
+                QStandardItem(job.state),
+                QStandardItem(""),
+                QStandardItem("")
+            ])
+
+
+    def initUI(self):
+        self.resize(CONSOLE_DIALOG_WIDTH, CONSOLE_DIALOG_HEIGHT)
+        self.setWindowIcon(QIcon(WINDOW_ICON_PATH))
+        self.setStyleSheet(DIALOG_QSS + CONSOLE_QSS)
+
+        self.summary_label = QLabel(self)
+
+        self.max_jobs_box = QSpinBox(self)
+        self.max_jobs_box.setRange(1, 64)
+        self.max_jobs_box.setValue(self.manager.max_jobs)
+        self.max_jobs_box.setPrefix("Parallel jobs: ")
+        self.max_jobs_box.valueChanged.connect(self.manager.set_max_jobs)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, max(len(self.jobs), 1))
+        self.progress_bar.setValue(0)
+
+        self.model = QStandardItemModel(0, len(self.COLUMNS), self)
+        self.model.setHorizontalHeaderLabels(self.COLUMNS)
+
+        self.job_table = QTableView(self)
+        self.job_table.setModel(self.model)
+        self.job_table.setSelectionBehavior(
+            QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        self.job_table.setSelectionMode(
+            QAbstractItemView.SelectionMode.SingleSelection
+        )
+        self.job_table.setEditTriggers(
+            QAbstractItemView.EditTrigger.NoEditTriggers
+        )
+        self.job_table.verticalHeader().hide()
+        self.job_table.horizontalHeader().setStretchLastSection(True)
+        self.job_table.setColumnWidth(0, 400)
+        self.job_table.selectionModel().currentRowChanged.connect(
+            self.show_job_output
+        )
+
+        self.output_window = QPlainTextEdit(self)
+        self.output_window.setReadOnly(True)
+        self.output_window.setFont(QFont("Monospace", 10))
+
+        self.cancel_button = QPushButton("&Cancel", self)
+        self.cancel_button.setAutoDefault(False)
+        self.cancel_button.clicked.connect(self.cancel_jobs)
+
+        self.close_button = QPushButton("C&lose", self)
+        self.close_button.setAutoDefault(False)
+        self.close_button.clicked.connect(self.close)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(self.summary_label, 1)
+        top_layout.addWidget(self.max_jobs_box)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.progress_bar, 1)
+        button_layout.addWidget(self.cancel_button)
+        button_layout.addWidget(self.close_button)
+
+        v_layout = QVBoxLayout(self)
+        v_layout.addLayout(top_layout)
+        v_layout.addWidget(self.job_table, 3)
+        v_layout.addWidget(self.output_window, 2)
+        v_layout.addLayout(button_layout)
+        self.center()
+
+
+    def exec(self):
+        """Submit the jobs and show the dialog.
+        """
+        for job in self.jobs:
+            if job.active:
+                self.manager.submit(job)
+            else:
+                # finished before it was run
+                self.update_job(job)
+        self.update_summary()
+        return super().exec()
+
+
+    def done(self, result):
+        self.cancel_jobs()
+        self.manager.job_started.disconnect(self.update_job)
+        self.manager.job_finished.disconnect(self.update_job)
+        self.manager.job_output.disconnect(self.on_job_output)
+        super().done(result)
+
+
+    @pyqtSlot()
+    def cancel_jobs(self):
+        """Cancel the jobs of this dialog that haven't finished.
+        """
+        self.manager.cancel_all(self.jobs)
+
+
+    @pyqtSlot(object)
+    def update_job(self, job):
+        """Show the state of a job.
+        """
+        row = self._rows.get(job.id)
+        if row is None:
+            return
+        self.model.item(row, 1).setText(job.state)
+        if job.exit_code is not None:
+            self.model.item(row, 2).setText(str(job.exit_code))
+        if job.duration is not None and not job.active:
+            self.model.item(row, 3).setText(f"{job.duration:.1f} s")
+        self.update_summary()
+        if not any(job.active for job in self.jobs):
+            self.on_all_finished()
+
+
+    def update_summary(self):
+        """Show how many jobs are in which state.
+        """
+        counts = {}
+        for job in self.jobs:
+            counts[job.state] = counts.get(job.state, 0) + 1
+        finished = sum(1 for job in self.jobs if not job.active)
+        self.progress_bar.setValue(finished)
+        self.summary_label.setText(" \u00b7 ".join(
+            f"{count} {state.lower()}" for state, count in counts.items()
+        ))
+
+
+    @pyqtSlot(object, str)
+    def on_job_output(self, job, text):
+        """Append output of the selected job.
+        """
+        if self._selected_job() is job:
+            self.output_window.moveCursor(QTextCursor.MoveOperation.End)
+            self.output_window.insertPlainText(text)
+
+
+    def _selected_job(self):
+        row = self.job_table.currentIndex().row()
+        if row < 0:
+            return None
+        return self.jobs[row]
+
+
+    @pyqtSlot()
+    def show_job_output(self):
+        """Show the output collected for the selected job.
+        """
+        job = self._selected_job()
+        self.output_window.setPlainText("".join(job.output) if job else "")
+
+
+    @pyqtSlot()
+    def on_all_finished(self):
+        """Show the summary and select the first failed job.
+        """
+        self.cancel_button.setEnabled(False)
+        failed = [
+            row for row, job in enumerate(self.jobs)
+            if job.state == JOB_FAILED
+        ]
+        if failed:
+            self.job_table.selectRow(failed[0])
+        self.update_summary()
+
+
+
+#]===========================================================================[#
+#] JOBS DIALOG [#============================================================[#
+#]===========================================================================[#
+
+class JobsDialog(BaseDialog):
+    """
+    Panel showing the jobs of the `JobManager`: queued and running jobs
+    and the history of finished ones. Jobs can be cancelled or killed,
+    the output of the selected job is shown below the table.
+    """
+    COLUMNS = [
+        "Job", "Environment", "Priority", "Status",
+        "Exit code", "Started", "Duration"
+    ]
+    REFRESH_INTERVAL = 1000  # ms
+
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+
+        self.manager = manager
+        self._jobs = []
+        self._rows = {}
+
+        self.setWindowTitle("Jobs")
+        self.initUI()
+        self.reload()
+
+        self.manager.job_added.connect(self.add_job)
+        self.manager.job_started.connect(self.update_job)
+        self.manager.job_finished.connect(self.update_job)
+        self.manager.job_output.connect(self.on_job_output)
+        self.manager.history_changed.connect(self.reload)
+
+        # keep the duration of running jobs current
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.update_running_jobs)
+
+
+    def initUI(self):
+        self.resize(CONSOLE_DIALOG_WIDTH, CONSOLE_DIALOG_HEIGHT)
+        self.setWindowIcon(QIcon(WINDOW_ICON_PATH))
+        self.setStyleSheet(DIALOG_QSS + CONSOLE_QSS)
+
+        self.model = QStandardItemModel(0, len(self.COLUMNS), self)
+        self.model.setHorizontalHeaderLabels(self.COLUMNS)
+
+        self.job_table = QTableView(self)
+        self.job_table.setModel(self.model)
+        self.job_table.setSelectionBehavior(
+            QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        self.job_table.setSelectionMode(
+            QAbstractItemView.SelectionMode.SingleSelection
+        )
+        self.job_table.setEditTriggers(
+            QAbstractItemView.EditTrigger.NoEditTriggers
+        )
+        self.job_table.verticalHeader().hide()
+        self.job_table.horizontalHeader().setStretchLastSection(True)
+        self.job_table.setColumnWidth(0, 160)
+        self.job_table.setColumnWidth(1, 300)
+        self.job_table.selectionModel().currentRowChanged.connect(
+            self.show_job_output
+        )
+
+        self.output_window = QPlainTextEdit(self)
+        self.output_window.setReadOnly(True)
+        self.output_window.setFont(QFont("Monospace", 10))
+
+        self.cancel_button = QPushButton("&Cancel", self)
+        self.cancel_button.setAutoDefault(False)
+        self.cancel_button.setToolTip("Ask the selected job to stop")
+        self.cancel_button.clicked.connect(self.cancel_job)
+
+        self.kill_button = QPushButton("&Kill", self)
+        self.kill_button.setAutoDefault(False)
+        self.kill_button.setToolTip("Stop the selected job immediately")
+        self.kill_button.clicked.connect(self.kill_job)
+
+        self.clear_button = QPushButton("Clear &history", self)
+        self.clear_button.setAutoDefault(False)
+        self.clear_button.clicked.connect(self.manager.clear_history)
+
+        self.close_button = QPushButton("C&lose", self)
+        self.close_button.setAutoDefault(False)
+        self.close_button.clicked.connect(self.close)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.cancel_button)
+        button_layout.addWidget(self.kill_button)
+        button_layout.addStretch(1)
+        button_layout.addWidget(self.clear_button)
+        button_layout.addWidget(self.close_button)
+
+        v_layout = QVBoxLayout(self)
+        v_layout.addWidget(self.job_table, 3)
+        v_layout.addWidget(self.output_window, 2)
+        v_layout.addLayout(button_layout)
+        self.center()
+
+
+    def showEvent(self, event):
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+
+    @pyqtSlot()
+    def reload(self):
+        """Show all jobs of the manager again.
+        """
+        self._jobs = []
+        self._rows = {}
+        self.model.removeRows(0, self.model.rowCount())
+        for job in self.manager.all_jobs():
+            self.add_job(job)
+        self.show_job_output()
+
+
+    @pyqtSlot(object)
+    def add_job(self, job):
+        """Append a row for a job.
+        """
+        if job.id in self._rows:
+            return
+        self._rows[job.id] = len(self._jobs)
+        self._jobs.append(job)
+        items = [QStandardItem() for _ in self.COLUMNS]
+        items[0].setText(job.title)
+        items[0].setToolTip(job.command)
+        items[1].setText(job.venv)
+        items[1].setToolTip(job.venv)
+        items[2].setText(PRIORITY_LABELS.get(job.priority, str(job.priority)))
+        self.model.appendRow(items)
+        self.update_job(job)
+
+
+    @pyqtSlot(object)
+    def update_job(self, job):
+        """Show the state of a job.
+        """
+        row = self._rows.get(job.id)
+        if row is None:
+            return
+        self.model.item(row, 3).setText(job.state)
+        self.model.item(row, 4).setText(
+            "" if job.exit_code is None else str(job.exit_code)
+        )
+        if job.started_at is not None:
+            self.model.item(row, 5).setText(
+                datetime.fromtimestamp(job.started_at).strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                )
+            )
+        if job.duration is not None:
+            self.model.item(row, 6).setText(f"{job.duration:.1f} s")
+        if job is self._selected_job():
+            self.update_buttons()
+
+
+    @pyqtSlot()
+    def update_running_jobs(self):
+        """Update the duration of running jobs.
+        """
+        for job in self.manager.jobs:
+            self.update_job(job)
+
+
+    def _selected_job(self):
+        row = self.job_table.currentIndex().row()
+        if row < 0 or row >= len(self._jobs):
+            return None
+        return self._jobs[row]
+
+
+    def update_buttons(self):
+        job = self._selected_job()
+        can_cancel = job is not None and job.can_cancel
+        self.cancel_button.setEnabled(can_cancel)
+        self.kill_button.setEnabled(can_cancel)
+
+
+    @pyqtSlot()
+    def show_job_output(self):
+        """Show the command and the output of the selected job.
+        """
+        job = self._selected_job()
+        self.update_buttons()
+        if job is None:
+            self.output_window.clear()
+            return
+        header = f"$ {job.command}\n" if job.command else ""
+        self.output_window.setPlainText(header + "".join(job.output))
+
+
+    @pyqtSlot(object, str)
+    def on_job_output(self, job, text):
+        """Append output of the selected job.
+        """
+        if self._selected_job() is job:
+            self.output_window.moveCursor(QTextCursor.MoveOperation.End)
+            self.output_window.insertPlainText(text)
+
+
+    @pyqtSlot()
+    def cancel_job(self):
+        job = self._selected_job()
+        if job is not None:
+            self.manager.cancel(job)
+
+
+    @pyqtSlot()
+    def kill_job(self):
+        job = self._selected_job()
+        if job is not None:
+            self.manager.kill(job)
 
 
 
@@ -25,13 +25,19 @@ import sys
 import csv
 import time
 import json
+import stat
+import marshal
+import queue
+import hashlib
 import shutil
 import sqlite3
 import logging
+import threading
 from pathlib import Path
 from typing import List, Optional, Dict, Any
-from subprocess import PIPE, STDOUT, run
-from dataclasses import dataclass
+from subprocess import PIPE, STDOUT, SubprocessError, run
+from dataclasses import dataclass, asdict, astuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from bs4 import BeautifulSoup
 import requests
@@ -46,11 +52,45 @@ ACTIVE_DIR = Path.home() / ".venvipy" / "selected-dir"
 ACTIVE_VENV = Path.home() / ".venvipy" / "active-venv"
 TABS_STATE = Path.home() / ".venvipy" / "tabs-state.json"
 LAUNCHER_STATE = Path.home() / ".venvipy" / "launcher-state.json"
+VENV_CATALOG = Path.home() / ".venvipy" / "venv-catalog.json"
+PACKAGE_CACHE_DIR = Path.home() / ".venvipy" / "package-cache"
+CONSOLE_LOG_DIR = Path.home() / ".venvipy" / "console-logs"
+JOB_HISTORY = Path.home() / ".venvipy" / "job-history.json"
+WHEELHOUSE_DIR = Path.home() / ".venvipy" / "wheelhouse"
+WHEELHOUSE_INDEX = Path.home() / ".venvipy" / "wheelhouse.json"
 PYPI_SIMPLE_URL = "https://pypi.org/simple/"
 PYPI_JSON_URL = "https://pypi.org/pypi/{name}/json"
 PACKAGE_DB_PATH = Path.home() / ".venvipy" / "pypi_index.sqlite3"
 DB_TABLE = "projects"
 DB_COL = "name"
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+SCAN_MAX_DEPTH = 8
+SCAN_CHUNK_SIZE = 64
+CATALOG_VERSION = 1
+CATALOG_MAX_DIRS = 4096
+METADATA_CHUNK_SIZE = 8192
+METADATA_MAX_HEADER = 1024 * 1024
+SNAPSHOT_VERSION = 4
+PROBE_TIMEOUT = 15  # seconds
+CONSOLE_LOG_LIMIT = 20
+SCAN_SKIP_DIRS = frozenset({
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".nox",
+    ".cache",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".npm",
+    ".cargo",
+    ".rustup",
+    "__pycache__",
+    "node_modules",
+    "site-packages",
+    "dist-packages",
+})
 
 logger = logging.getLogger(__name__)
 
@@ -462,56 +502,246 @@ class VenvInfo:
     venv_comment: str
 
 
-def get_venvs(path):
+def get_venvs(path, depth=1):
     """
     Get the available virtual environments
     from the specified folder.
     """
-    # return an emtpty list if directory doesn't exist
-    if not os.path.isdir(path):
+    return list(iter_venvs(path, depth=depth))
+
+
+def read_venv_info(venv_path, root) -> Optional[VenvInfo]:
+    """
+    Build a `VenvInfo` for the directory `venv_path`, named by its path
+    relative to `root`. Return `None` if it's not a virtual environment.
+    """
+    # build path to pyvenv.cfg file
+    cfg_file = os.path.join(venv_path, "pyvenv.cfg")
+    try:
+        cfg_stat = os.stat(cfg_file)
+        if not stat.S_ISREG(cfg_stat.st_mode):
+            return None
+        venv_config = read_venv_config(cfg_file, cfg_stat)
+    except OSError:
+        return None
+
+    # build path to venvipy.cfg file
+    venvipy_cfg_file = os.path.join(venv_path, "venvipy.cfg")
+
+    # nested venvs are named by their path relative to the root
+    venv_name = os.path.relpath(venv_path, root)
+
+    return VenvInfo(
+        venv_name,
+        venv_config.version,
+        venv_config.site_packages,
+        is_python_installed(venv_config.py_path),
+        get_comment(venvipy_cfg_file)
+    )
+
+
+def _should_descend(entry, root_dev) -> bool:
+    """
+    Return `True` if a scan may descend into `entry`,
+    i.e. it is no symlink and on the root's filesystem.
+    """
+    try:
+        if entry.is_symlink():
+            return False
+        entry_dev = entry.stat(follow_symlinks=False).st_dev
+    except OSError:
+        return False
+
+    return not (root_dev and entry_dev and entry_dev != root_dev)
+
+
+def _list_dirs(path):
+    """
+    Return the `os.DirEntry` objects of the subdirectories
+    of `path` that may contain virtual environments.
+    """
+    try:
+        with os.scandir(path) as it:
+            return [
+                entry for entry in it
+                if entry.name not in SCAN_SKIP_DIRS and _is_dir_entry(entry)
+            ]
+    except OSError:
         return []
 
-    venv_info_list = []
 
-    for i, venv in enumerate(os.listdir(path)):
-        # build path to venv directory
-        valid_venv = os.path.join(path, venv)
+def _dir_mtime(path) -> Optional[int]:
+    """Return the modification time of a directory (or file) in ns, or `None`.
+    """
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
-        # only look for dirs
-        if not os.path.isdir(valid_venv):
-            continue
 
-        # build path to pyvenv.cfg file
-        cfg_file = os.path.join(valid_venv, "pyvenv.cfg")
-        if not os.path.isfile(cfg_file):
-            continue
+def _probe_entries(entries, level, root, descend, root_dev, stamp_dirs):
+    """
+    Probe a chunk of directory entries at `level`. Return the venvs found,
+    the subdirectories of the other entries if `descend` is set, the
+    modification times of the listed directories if `stamp_dirs` is set
+    and `level`.
+    """
+    venv_infos = []
+    subdirs = []
+    dir_stamps = {}
+    for entry in entries:
+        venv_info = read_venv_info(entry.path, root)
+        if venv_info is not None:
+            venv_infos.append(venv_info)
+        elif descend and _should_descend(entry, root_dev):
+            if stamp_dirs:
+                # taken before listing, so later changes are noticed
+                dir_stamps[entry.path] = _dir_mtime(entry.path)
+            subdirs.extend(_list_dirs(entry.path))
+    return venv_infos, subdirs, dir_stamps, level
+
+
+def iter_venvs(path, depth=1, max_workers=SCAN_WORKERS, dir_stamps=None):
+    """
+    Yield a `VenvInfo` for every virtual environment in `path` as soon as
+    it has been read. With `depth > 1` subdirectories are searched as
+    well, up to `depth` levels below `path`. The search doesn't descend
+    into venvs, symlinks, other filesystems or `SCAN_SKIP_DIRS`.
+
+    Directories are listed with `os.scandir()` and the work is fanned out
+    to a thread pool in chunks, so the order of the results is not defined.
+    If a dict is passed as `dir_stamps`, it receives the modification
+    time of every directory that has been listed.
+    """
+    # yield nothing if directory doesn't exist
+    try:
+        root = os.path.abspath(path)
+        root_stat = os.stat(root)
+        root_dev = root_stat.st_dev
+    except (OSError, TypeError, ValueError):
+        return
 
-        # build path to venvipy.cfg file
-        venvipy_cfg_file = os.path.join(valid_venv, "venvipy.cfg")
+    stamp_dirs = dir_stamps is not None
+    if stamp_dirs:
+        dir_stamps[root] = root_stat.st_mtime_ns
 
-        venv_name = os.path.basename(valid_venv)
-        venv_version = get_config(cfg_file, "version")
-        site_packages = get_config(cfg_file, "site_packages")
-        is_installed = get_config(cfg_file, "installed")
-        venv_comment = get_comment(venvipy_cfg_file)
+    entries = _list_dirs(root)
+    if not entries:
+        return
 
-        venv_info = VenvInfo(
-            venv_name,
-            venv_version,
-            site_packages,
-            is_installed,
-            venv_comment
-        )
-        venv_info_list.append(venv_info)
+    # warm the 'installed' cache once instead of racing in the workers
+    ensure_dbfile()
 
-    return venv_info_list[::-1]
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, max_workers),
+        thread_name_prefix="venvipy-scan"
+    )
+    done = queue.SimpleQueue()
+    pending = 0
+
+    def submit(dir_entries, level):
+        nonlocal pending
+        descend = level < depth
+        # small chunks keep all workers busy on short listings
+        size = max(1, min(SCAN_CHUNK_SIZE, len(dir_entries) // max_workers))
+        for i in range(0, len(dir_entries), size):
+            future = pool.submit(
+                _probe_entries,
+                dir_entries[i:i + size],
+                level,
+                root,
+                descend,
+                root_dev,
+                stamp_dirs
+            )
+            future.add_done_callback(done.put)
+            pending += 1
 
+    try:
+        submit(entries, 1)
+        while pending:
+            future = done.get()
+            pending -= 1
+            venv_infos, subdirs, listed, level = future.result()
+            if stamp_dirs:
+                dir_stamps.update(listed)
+            yield from venv_infos
+            if subdirs:
+                submit(subdirs, level + 1)
+    finally:
+        # drop pending work if the consumer stopped early
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _is_dir_entry(entry) -> bool:
+    """Return `True` if `entry` is a directory (following symlinks).
+    """
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
 
-def get_config(cfg_file, cfg):
+
+@dataclass(frozen=True)
+class VenvConfig:
     """
-    Return the values as string from a `pyvenv.cfg` file.
-    Values for `cfg` can be: `version`, `py_path`,
-    `site_packages`, `installed`, `comment`.
+    Parsed content of a `pyvenv.cfg` file.
+    """
+    version: str
+    version_number: str
+    base_executable: str
+    home: str
+    site_packages: str
+    py_path: str
+
+
+# cfg file path -> ((mtime_ns, size), VenvConfig)
+_venv_config_cache: Dict[str, tuple] = {}
+
+# (mtime_ns, size) of `py-installs` and the interpreter paths it contains
+_installed_pythons_cache: Dict[str, Any] = {"key": None, "paths": frozenset()}
+
+
+def _normalized_version(value):
+    numbers = re.findall(r"\d+", value)
+
+    if len(numbers) >= 3:
+        return ".".join(numbers[:3])
+
+    if len(numbers) >= 2:
+        return ".".join(numbers[:2])
+
+    return value.strip()
+
+
+def _major_minor(value):
+    numbers = re.findall(r"\d+", value)
+    if len(numbers) >= 2:
+        return f"{numbers[0]}.{numbers[1]}"
+    return value.strip()
+
+
+def _site_packages_path(venv_path, venv_config=None) -> Path:
+    """
+    Return the platform default site-packages of a venv, preferring the
+    one of the version in its `pyvenv.cfg`.
+    """
+    if venv_config is None:
+        try:
+            venv_config = read_venv_config(
+                os.path.join(venv_path, "pyvenv.cfg")
+            )
+        except OSError:
+            venv_config = None
+
+    version = ""
+    if venv_config is not None and venv_config.version_number != "N/A":
+        version = _major_minor(venv_config.version_number)
+    return get_platform().site_packages_path(Path(venv_path), version)
+
+
+def _parse_venv_config(cfg_file) -> VenvConfig:
+    """Parse a `pyvenv.cfg` file into a `VenvConfig` record.
     """
     with open(cfg_file, "r", encoding="utf-8") as f:
         lines = f.readlines()
@@ -525,58 +755,102 @@ def get_config(cfg_file, cfg):
         key, value = line.split("=", 1)
         config[key.strip().lower()] = value.strip()
 
+    raw_version = config.get("version") or config.get("version_info", "")
+    version_value = _normalized_version(raw_version) if raw_version else "N/A"
+    version_str = to_version(version_value) if raw_version else "N/A"
 
-    def normalized_version(value):
-        numbers = re.findall(r"\d+", value)
+    home = config.get("home", "")
+    base_executable = config.get("base-executable", "")
+    version_suffix = _major_minor(version_value) if raw_version else ""
+    binary_path = base_executable or to_path(home, version_suffix)
 
-        if len(numbers) >= 3:
-            return ".".join(numbers[:3])
+    site_packages = config.get("include-system-site-packages", "N/A")
+    if site_packages == "true":
+        site_packages = "global"
+    elif site_packages == "false":
+        site_packages = "isolated"
+    else:
+        site_packages = "N/A"
+
+    return VenvConfig(
+        version=version_str,
+        version_number=version_value,
+        base_executable=base_executable,
+        home=home,
+        site_packages=site_packages,
+        py_path=binary_path
+    )
 
-        if len(numbers) >= 2:
-            return ".".join(numbers[:2])
 
-        return value.strip()
+def read_venv_config(cfg_file, stat_result=None) -> VenvConfig:
+    """
+    Return the `VenvConfig` of a `pyvenv.cfg` file. The file is parsed
+    once and cached by `(path, mtime_ns, size)`. Pass `stat_result` if
+    the caller already has one (e.g. from `os.scandir()`).
+    Raises `OSError` if the file can't be read.
+    """
+    cfg_file = os.fspath(cfg_file)
+    if stat_result is None:
+        stat_result = os.stat(cfg_file)
 
+    key = (stat_result.st_mtime_ns, stat_result.st_size)
+    cached = _venv_config_cache.get(cfg_file)
+    if cached is not None and cached[0] == key:
+        return cached[1]
 
-    def major_minor(value):
-        numbers = re.findall(r"\d+", value)
-        if len(numbers) >= 2:
-            return f"{numbers[0]}.{numbers[1]}"
-        return value.strip()
+    venv_config = _parse_venv_config(cfg_file)
+    _venv_config_cache[cfg_file] = (key, venv_config)
+    return venv_config
 
 
-    raw_version = config.get("version") or config.get("version_info", "")
-    version_value = normalized_version(raw_version) if raw_version else "N/A"
-    version_str = to_version(version_value) if raw_version else "N/A"
+def is_python_installed(py_path) -> str:
+    """
+    Return `"yes"` if `py_path` is listed in `py-installs`, else `"no"`.
+    """
+    ensure_dbfile()
+    try:
+        stat_result = os.stat(DB_FILE)
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+    except OSError:
+        key = None
 
-    home = config.get("home", "")
-    base_executable = config.get("base-executable", "")
-    version_suffix = major_minor(version_value) if raw_version else ""
-    binary_path = base_executable or to_path(home, version_suffix)
+    if key is None or _installed_pythons_cache["key"] != key:
+        try:
+            with open(DB_FILE, newline="", encoding="utf-8") as cf:
+                reader = csv.DictReader(cf, delimiter=",")
+                paths = frozenset(
+                    info["PYTHON_PATH"] for info in reader
+                    if info.get("PYTHON_PATH")
+                )
+        except OSError:
+            paths = frozenset()
+        _installed_pythons_cache["key"] = key
+        _installed_pythons_cache["paths"] = paths
 
-    site_packages = config.get("include-system-site-packages", "N/A")
+    if py_path in _installed_pythons_cache["paths"]:
+        return "yes"
+    return "no"
+
+
+def get_config(cfg_file, cfg):
+    """
+    Return the values as string from a `pyvenv.cfg` file.
+    Values for `cfg` can be: `version`, `py_path`,
+    `site_packages`, `installed`, `comment`.
+    """
+    venv_config = read_venv_config(cfg_file)
 
     if cfg == "version":
-        return version_str
+        return venv_config.version
 
     if cfg == "py_path":
-        return binary_path
+        return venv_config.py_path
 
     if cfg == "site_packages":
-        if site_packages == "true":
-            return "global"
-        if site_packages == "false":
-            return "isolated"
-        return "N/A"
+        return venv_config.site_packages
 
     if cfg == "installed":
-        ensure_dbfile()
-        with open(DB_FILE, newline="", encoding="utf-8") as cf:
-            reader = csv.DictReader(cf, delimiter=",")
-            for info in reader:
-                if binary_path == info["PYTHON_PATH"]:
-                    return "yes"
-            return "no"
+        return is_python_installed(venv_config.py_path)
 
     return "N/A"
 
@@ -603,143 +877,988 @@ def get_selected_dir():
 def get_comment(cfg_file):
     """Get the comment string from `venvipy_cfg` file.
     """
-    if os.path.exists(cfg_file):
+    try:
         with open(cfg_file, "r", encoding="utf-8") as f:
-            venv_comment = f.read()
-
-        return venv_comment
-    return ""
+            return f.read()
+    except (FileNotFoundError, NotADirectoryError):
+        return ""
 
 
 
 #]===========================================================================[#
-#] GET INFOS FROM PYTHON PACKAGE INDEX [#====================================[#
+#] VENV CATALOG [#===========================================================[#
 #]===========================================================================[#
 
-@dataclass
-class PackageInfo:
+# The catalog holds one listing per scanned (directory, depth). A listing
+# keeps a record of every venv found (path, cfg record, comment, interpreter
+# state, last seen) and the modification times of the directories that
+# have been listed (`None` if there were more than `CATALOG_MAX_DIRS`).
+# Tables are shown from it instantly, then `stale_catalog_paths()` tells
+# which directories and venvs have to be read again. The disk usage of
+# the venvs is kept by path in `sizes` (see `get_venv_size()`).
+
+_venv_catalog: Optional[Dict[str, Any]] = None
+_venv_catalog_lock = threading.RLock()
+
+
+def _catalog_key(path, depth) -> str:
+    return f"{depth}:{os.path.abspath(path)}"
+
+
+def _venv_stamp(venv_path) -> Optional[list]:
     """
-    Info about a PyPI package.
+    Return the modification times of `pyvenv.cfg` and `venvipy.cfg`
+    of a venv, or `None` if it has no `pyvenv.cfg`.
     """
-    pkg_name: str
-    pkg_version: str
-    pkg_info_2: str
-    pkg_summary: str
+    try:
+        cfg_mtime = os.stat(os.path.join(venv_path, "pyvenv.cfg")).st_mtime_ns
+    except OSError:
+        return None
 
+    try:
+        comment_mtime = os.stat(
+            os.path.join(venv_path, "venvipy.cfg")
+        ).st_mtime_ns
+    except OSError:
+        comment_mtime = 0
 
+    return [cfg_mtime, comment_mtime]
 
-def ensure_pypi_db() -> None:
-    CFG_DIR.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(PACKAGE_DB_PATH) as con:
-        con.execute("PRAGMA journal_mode=WAL;")
-        con.execute("CREATE TABLE IF NOT EXISTS projects (name TEXT PRIMARY KEY)")
-        con.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
-        con.execute("CREATE INDEX IF NOT EXISTS idx_projects_name_nocase ON projects(name COLLATE NOCASE)")
 
-        # cache table: version/author/summary + timestamp
-        # if older schema exists -> drop & recreate once (simple, no ALTER-mess)
-        cols = {r[1] for r in con.execute("PRAGMA table_info(pkg_meta)").fetchall()}
-        if cols and not {"name", "version", "info_2", "summary", "fetched_at"}.issubset(cols):
-            con.execute("DROP TABLE IF EXISTS pkg_meta")
+def _venv_record(root, venv_info) -> Dict[str, Any]:
+    """Build the catalog record of a venv.
+    """
+    venv_path = os.path.join(root, venv_info.venv_name)
+    stamp = _venv_stamp(venv_path)
+    try:
+        config = asdict(
+            read_venv_config(os.path.join(venv_path, "pyvenv.cfg"))
+        )
+    except OSError:
+        stamp = None
+        config = {}
 
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS pkg_meta (
-                name TEXT PRIMARY KEY,
-                version TEXT NOT NULL DEFAULT '',
-                info_2  TEXT NOT NULL DEFAULT '',
-                summary TEXT NOT NULL DEFAULT '',
-                fetched_at INTEGER NOT NULL DEFAULT 0
-            )
-        """)
+    config["version"] = venv_info.venv_version
+    config["site_packages"] = venv_info.site_packages
 
-def update_pypi_index(force: bool = False, timeout: int = 60) -> bool:
+    return {
+        "path": venv_path,
+        "config": config,
+        "installed": venv_info.is_installed,
+        "comment": venv_info.venv_comment,
+        "last_seen": time.time(),
+        "stamp": stamp
+    }
+
+
+def _record_matches(record, venv_info) -> bool:
+    return (
+        record["config"]["version"] == venv_info.venv_version
+        and record["config"]["site_packages"] == venv_info.site_packages
+        and record["installed"] == venv_info.is_installed
+        and record["comment"] == venv_info.venv_comment
+    )
+
+
+def load_venv_catalog() -> Dict[str, Any]:
+    """Return the venv catalog, read from disk on first use.
     """
-    Returns True if DB was updated, False if unchanged.
+    global _venv_catalog
+
+    with _venv_catalog_lock:
+        if _venv_catalog is not None:
+            return _venv_catalog
+
+        catalog = None
+        try:
+            with open(VENV_CATALOG, "r", encoding="utf-8") as f:
+                catalog = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            logger.warning("Could not read venv catalog; starting fresh")
+
+        if (
+            not isinstance(catalog, dict)
+            or catalog.get("version") != CATALOG_VERSION
+            or not isinstance(catalog.get("listings"), dict)
+        ):
+            catalog = {"version": CATALOG_VERSION, "listings": {}}
+        if not isinstance(catalog.get("sizes"), dict):
+            catalog["sizes"] = {}
+        if not isinstance(catalog.get("paths"), dict):
+            catalog["paths"] = {}
+
+        _venv_catalog = catalog
+        return _venv_catalog
+
+
+def save_venv_catalog() -> None:
+    """Persist the venv catalog to disk.
     """
-    ensure_pypi_db()
+    ensure_confdir()
 
-    with sqlite3.connect(PACKAGE_DB_PATH) as con:
-        cur = con.cursor()
-        cur.execute("SELECT value FROM meta WHERE key='last_serial'")
-        row = cur.fetchone()
-        stored_serial = row[0] if row else None
+    with _venv_catalog_lock:
+        if _venv_catalog is None:
+            return
 
-    with requests.Session() as s:
-        r = s.get(
-            PYPI_SIMPLE_URL,
-            headers={
-                "Accept": "application/vnd.pypi.simple.v1+json, application/json;q=0.9, text/html;q=0.1",
-                "User-Agent": "venvipy",
-            },
-            timeout=timeout,
-        )
-        r.raise_for_status()
+        # forget sizes and paths of venvs that are not listed anymore
+        venv_paths = {
+            record["path"]
+            for listing in _venv_catalog["listings"].values()
+            for record in listing["venvs"].values()
+        }
+        for section in ("sizes", "paths"):
+            cached = _venv_catalog[section]
+            for venv_path in cached.keys() - venv_paths:
+                del cached[venv_path]
 
-        last_serial = r.headers.get("X-PyPI-Last-Serial")
+        content = json.dumps(_venv_catalog, separators=(",", ":"))
 
-        if (not force) and last_serial and stored_serial == last_serial:
-            return False
+    tmp_file = f"{VENV_CATALOG}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_file, VENV_CATALOG)
+    except OSError as e:
+        logger.warning(f"Failed to save venv catalog: {e}")
 
-        ctype = (r.headers.get("content-type") or "").lower()
-        if "json" in ctype:
-            data = r.json()
-            projects = [p["name"] for p in data.get("projects", []) if isinstance(p, dict) and p.get("name")]
+
+def get_cached_venvs(path, depth=1) -> Optional[List[VenvInfo]]:
+    """
+    Return the venvs of `path` with `depth` known from the
+    catalog, or `None` if the directory has not been scanned yet.
+    """
+    with _venv_catalog_lock:
+        listing = load_venv_catalog()["listings"].get(_catalog_key(path, depth))
+        if listing is None:
+            return None
+
+        try:
+            return [
+                VenvInfo(
+                    name,
+                    record["config"]["version"],
+                    record["config"]["site_packages"],
+                    record["installed"],
+                    record["comment"]
+                )
+                for name, record in listing["venvs"].items()
+            ]
+        except (KeyError, TypeError, AttributeError):
+            logger.warning(f"Dropping broken catalog entry of '{path}'")
+            del load_venv_catalog()["listings"][_catalog_key(path, depth)]
+            return None
+
+
+def cache_venvs(
+        path,
+        depth,
+        venv_infos,
+        dir_stamps=None,
+        full_scan=False,
+        reread=()
+    ) -> None:
+    """
+    Store the venvs of `path` with `depth` in the catalog. After a
+    `full_scan` the listed directories are replaced by `dir_stamps`,
+    otherwise `dir_stamps` (`None` values for removed directories)
+    are merged into them. Records of unchanged venvs are kept unless
+    their names are in `reread`.
+    """
+    root = os.path.abspath(path)
+    now = time.time()
+
+    with _venv_catalog_lock:
+        listings = load_venv_catalog()["listings"]
+        old = listings.get(_catalog_key(path, depth)) or {}
+        old_venvs = old.get("venvs") or {}
+
+        venvs = {}
+        for info in venv_infos:
+            record = old_venvs.get(info.venv_name)
+            if (
+                record is not None
+                and info.venv_name not in reread
+                and _record_matches(record, info)
+            ):
+                record["last_seen"] = now
+            else:
+                record = _venv_record(root, info)
+            venvs[info.venv_name] = record
+
+        if full_scan:
+            dirs = dict(dir_stamps or {})
         else:
-            soup = BeautifulSoup(r.text, "html.parser")
-            projects = [a.get_text(strip=True) for a in soup.select("a") if a.get_text(strip=True)]
+            dirs = old.get("dirs")
+            if dirs is not None and dir_stamps:
+                dirs.update(dir_stamps)
+                dirs = {d: m for d, m in dirs.items() if m is not None}
+        if dirs is not None and len(dirs) > CATALOG_MAX_DIRS:
+            dirs = None
+
+        listings[_catalog_key(path, depth)] = {
+            "path": root,
+            "depth": depth,
+            "dirs": dirs,
+            "venvs": venvs
+        }
+
+
+def stale_catalog_paths(path, depth) -> Optional[List[str]]:
+    """
+    Return the directories and venvs of `path` with `depth` that
+    changed since they were stored in the catalog, or `None` if
+    the catalog can't tell (a full scan is needed).
+    """
+    with _venv_catalog_lock:
+        listing = load_venv_catalog()["listings"].get(_catalog_key(path, depth))
+        if listing is None or listing.get("dirs") is None:
+            return None
+        dirs = dict(listing["dirs"])
+        records = [
+            (
+                record["path"],
+                record["stamp"],
+                record["config"].get("py_path", ""),
+                record["installed"]
+            )
+            for record in listing["venvs"].values()
+        ]
+
+    stale = [d for d, mtime in dirs.items() if _dir_mtime(d) != mtime]
+    for venv_path, stamp, py_path, installed in records:
+        if (
+            stamp is None
+            or _venv_stamp(venv_path) != stamp
+            or is_python_installed(py_path) != installed
+        ):
+            stale.append(venv_path)
 
-    with sqlite3.connect(PACKAGE_DB_PATH) as con:
-        con.execute("BEGIN")
-        con.execute("DELETE FROM projects")
-        con.executemany("INSERT INTO projects(name) VALUES (?)", [(n,) for n in projects])
-        con.execute(
-            """
-            INSERT INTO meta(key, value) VALUES ('last_serial', ?)
-            ON CONFLICT(key) DO UPDATE SET value=excluded.value
-            """,
-            (last_serial or "",),
-        )
-        con.commit()
+    return stale
 
-    return True
 
 
-def _get_db_names(name: str, following: int) -> List[str]:
+#]===========================================================================[#
+#] DISK USAGE [#=============================================================[#
+#]===========================================================================[#
+
+# levels of directories below a venv whose mtimes make up its size key
+SIZE_KEY_DEPTH = 3
+
+
+def _allocated_bytes(stat_result) -> int:
+    """Return the space allocated for a file (its size on Windows).
     """
-    Returns anchor match + `following` subsequent package names (alphabetical).
-    If nothing found, returns [].
+    blocks = getattr(stat_result, "st_blocks", None)
+    if blocks is None:
+        return stat_result.st_size
+    return blocks * 512
+
+
+def venv_size_key(venv_path) -> Optional[str]:
     """
-    if not name or following < 0:
-        return []
+    Return a digest of the modification times of the directories up to
+    `SIZE_KEY_DEPTH` levels below `venv_path` (which includes `bin/` and
+    `site-packages/`), or `None` if `venv_path` is missing. Installing or
+    removing anything changes the key.
+    """
+    try:
+        root_mtime = os.stat(venv_path).st_mtime_ns
+    except OSError:
+        return None
+
+    stamps = [("", root_mtime)]
+    stack = [(venv_path, 0)]
+    while stack:
+        path, level = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                        mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+                    except OSError:
+                        continue
+                    stamps.append(
+                        (os.path.relpath(entry.path, venv_path), mtime)
+                    )
+                    if level + 1 < SIZE_KEY_DEPTH:
+                        stack.append((entry.path, level + 1))
+        except OSError:
+            continue
 
-    def q1(cur, sql, params) -> Optional[str]:
-        cur.execute(sql, params)
-        row = cur.fetchone()
-        return row[0] if row else None
+    stamps.sort()
+    return hashlib.blake2b(repr(stamps).encode(), digest_size=16).hexdigest()
 
-    with sqlite3.connect(PACKAGE_DB_PATH) as con:
-        cur = con.cursor()
 
-        # 1) exact (case-insensitive)
-        anchor = q1(
-            cur,
-            f"SELECT {DB_COL} FROM {DB_TABLE} WHERE lower({DB_COL}) = lower(?) LIMIT 1",
-            (name,),
-        )
+def venv_disk_usage(venv_path, cancelled=None) -> Optional[int]:
+    """
+    Return the disk space used by `venv_path` in bytes. Symlinks are not
+    followed and every inode is counted once, so hardlinked files don't
+    add up. Return `None` as soon as the callable `cancelled` returns
+    `True`. Safe to run in several threads at once.
+    """
+    try:
+        total = _allocated_bytes(os.stat(venv_path))
+    except OSError:
+        return 0
 
-        # 2) prefix (case-insensitive)
-        if anchor is None:
-            anchor = q1(
-                cur,
-                f"""
-                SELECT {DB_COL}
-                FROM {DB_TABLE}
-                WHERE {DB_COL} LIKE ? ESCAPE '\\' COLLATE NOCASE
-                ORDER BY {DB_COL} COLLATE NOCASE
-                LIMIT 1
-                """,
-                (f"{name}%",),
-            )
+    seen = set()
+    stack = [venv_path]
+    while stack:
+        if cancelled is not None and cancelled():
+            return None
+
+        path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+
+        with it:
+            for entry in it:
+                try:
+                    stat_result = entry.stat(follow_symlinks=False)
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                except OSError:
+                    continue
+
+                if stat_result.st_nlink > 1:
+                    inode = (stat_result.st_dev, stat_result.st_ino)
+                    if inode in seen:
+                        continue
+                    seen.add(inode)
+                total += _allocated_bytes(stat_result)
+
+    return total
+
+
+def get_venv_size(venv_path, cancelled=None) -> Optional[int]:
+    """
+    Return the disk usage of a venv. The result is cached in the
+    catalog and only recalculated if `venv_size_key()` changed.
+    Return `None` if the venv is missing or the walk was cancelled.
+    """
+    venv_path = os.path.abspath(venv_path)
+    key = venv_size_key(venv_path)
+    if key is None:
+        return None
+
+    with _venv_catalog_lock:
+        cached = load_venv_catalog()["sizes"].get(venv_path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    size = venv_disk_usage(venv_path, cancelled)
+    if size is not None:
+        with _venv_catalog_lock:
+            load_venv_catalog()["sizes"][venv_path] = [key, size]
+    return size
+
+
+
+#]===========================================================================[#
+#] HEALTH CHECK [#===========================================================[#
+#]===========================================================================[#
+
+HEALTH_OK = "OK"
+HEALTH_WARNING = "Warning"
+HEALTH_BROKEN = "Broken"
+
+
+@dataclass(frozen=True)
+class VenvHealth:
+    """
+    Result of a venv health check.
+    """
+    status: str
+    problems: tuple
+
+
+# venv path -> (key, VenvHealth)
+_venv_health_cache: Dict[str, tuple] = {}
+
+
+def _python_version_from_path(py_path) -> Optional[str]:
+    """
+    Return the `X.Y` version from the name an interpreter
+    resolves to (e.g. `/usr/bin/python3.11`), or `None`.
+    """
+    name = os.path.basename(os.path.realpath(py_path))
+    match = re.match(r"python(\d+\.\d+)", name)
+    return match.group(1) if match else None
+
+
+def _health_key(venv_path, venv_config, venv_python, site_packages):
+    return tuple(
+        _dir_mtime(path) for path in (
+            os.path.join(venv_path, "pyvenv.cfg"),
+            os.path.dirname(venv_python),
+            os.path.join(venv_path, "lib"),
+            site_packages,
+            venv_config.home,
+            venv_config.py_path
+        )
+    ) + (os.path.lexists(venv_python), os.path.exists(venv_python))
+
+
+def check_venv_health(venv_path) -> VenvHealth:
+    """
+    Check a venv without running its interpreter: missing base
+    interpreter, stale `home =`, missing or dangling `bin/python`,
+    version mismatch between `pyvenv.cfg` and the interpreter and
+    missing pip. The result is cached until one of the files or
+    directories involved changes.
+    """
+    venv_path = os.path.abspath(venv_path)
+    try:
+        venv_config = read_venv_config(os.path.join(venv_path, "pyvenv.cfg"))
+    except OSError:
+        return VenvHealth(HEALTH_BROKEN, ("pyvenv.cfg can't be read",))
+
+    platform = get_platform()
+    venv_python = str(platform.venv_python_path(Path(venv_path)))
+    site_packages = str(_site_packages_path(venv_path, venv_config))
+
+    key = _health_key(venv_path, venv_config, venv_python, site_packages)
+    cached = _venv_health_cache.get(venv_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    problems = []
+    warnings = []
+
+    if venv_config.home and not os.path.isdir(venv_config.home):
+        problems.append(f"home '{venv_config.home}' doesn't exist")
+    if not os.path.isfile(venv_config.py_path):
+        problems.append(
+            f"base interpreter '{venv_config.py_path}' is missing"
+        )
+
+    if os.path.islink(venv_python) and not os.path.exists(venv_python):
+        problems.append(
+            f"'{os.path.relpath(venv_python, venv_path)}' is a dangling symlink"
+        )
+    elif not os.path.exists(venv_python):
+        problems.append(
+            f"'{os.path.relpath(venv_python, venv_path)}' is missing"
+        )
+
+    cfg_version = _major_minor(venv_config.version_number)
+    versions = set()
+    if os.path.exists(venv_python):
+        versions.add(_python_version_from_path(venv_python))
+    try:
+        lib_versions = {
+            name[len("python"):] for name in os.listdir(
+                os.path.join(venv_path, "lib")
+            )
+            if re.fullmatch(r"python\d+\.\d+", name)
+        }
+        if cfg_version not in lib_versions:
+            versions.update(lib_versions)
+    except OSError:
+        pass
+    versions.discard(None)
+    versions.discard(cfg_version)
+    if versions and venv_config.version_number != "N/A":
+        problems.append(
+            f"pyvenv.cfg says {cfg_version}, but found "
+            f"{', '.join(sorted(versions))}"
+        )
+
+    try:
+        has_pip = any(
+            name.startswith("pip-") and name.endswith(".dist-info")
+            for name in os.listdir(site_packages)
+        )
+    except OSError:
+        has_pip = False
+    if not has_pip:
+        warnings.append("pip is not installed")
+
+    if problems:
+        status = HEALTH_BROKEN
+    elif warnings:
+        status = HEALTH_WARNING
+    else:
+        status = HEALTH_OK
+
+    venv_health = VenvHealth(status, tuple(problems + warnings))
+    _venv_health_cache[venv_path] = (key, venv_health)
+    return venv_health
+
+
+def iter_venvs_health(venv_paths, max_workers=SCAN_WORKERS):
+    """
+    Check `venv_paths` in parallel and yield `(venv_path, VenvHealth)`
+    tuples in the order they complete.
+    """
+    if not venv_paths:
+        return
+
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(venv_paths))),
+        thread_name_prefix="venvipy-health"
+    )
+    try:
+        futures = {
+            pool.submit(check_venv_health, venv_path): venv_path
+            for venv_path in venv_paths
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # drop pending work if the consumer stopped early
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+
+#]===========================================================================[#
+#] VENV PATHS [#=============================================================[#
+#]===========================================================================[#
+
+# runs in the venv interpreter with `-I` (no user site, no env vars),
+# so `sys.path` contains what `site` and the `.pth` files added; the
+# marker environment is the one of PEP 508
+_SYSCONFIG_PROBE = """
+import json, os, platform, site, sys, sysconfig
+def fmt(info):
+    version = "%d.%d.%d" % tuple(info[:3])
+    if info[3] != "final":
+        version += info[3][0] + str(info[4])
+    return version
+paths = sysconfig.get_paths()
+base_sites = set(site.getsitepackages([sys.base_prefix, sys.base_exec_prefix]))
+print(json.dumps({
+    "version": ".".join(str(n) for n in sys.version_info[:3]),
+    "purelib": paths["purelib"],
+    "platlib": paths["platlib"],
+    "stdlib": paths["stdlib"],
+    "sys_path": [p for p in sys.path if p and p not in base_sites],
+    "markers": {
+        "implementation_name": sys.implementation.name,
+        "implementation_version": fmt(sys.implementation.version),
+        "os_name": os.name,
+        "platform_machine": platform.machine(),
+        "platform_python_implementation": platform.python_implementation(),
+        "platform_release": platform.release(),
+        "platform_system": platform.system(),
+        "platform_version": platform.version(),
+        "python_full_version": platform.python_version(),
+        "python_version": ".".join(platform.python_version_tuple()[:2]),
+        "sys_platform": sys.platform,
+    },
+}))
+"""
+
+
+@dataclass(frozen=True)
+class VenvPaths:
+    """
+    Install locations of a venv as reported by its interpreter.
+    """
+    version: str
+    purelib: str
+    platlib: str
+    extra_paths: tuple
+    markers: dict
+
+
+def _probe_venv_paths(venv_path) -> Optional[VenvPaths]:
+    """
+    Ask the venv interpreter for its `sysconfig` paths and for the
+    paths added to `sys.path` by `.pth` files (e.g. editable installs).
+    """
+    platform = get_platform()
+    venv_python = platform.venv_python_path(Path(venv_path))
+    try:
+        res = run(
+            [str(venv_python), "-I", "-c", _SYSCONFIG_PROBE],
+            stdout=PIPE,
+            stderr=PIPE,
+            text=True,
+            timeout=PROBE_TIMEOUT,
+            cwd=venv_path
+        )
+        probe = json.loads(res.stdout)
+    except (OSError, ValueError, SubprocessError) as e:
+        logger.debug(f"Could not probe '{venv_python}': {e}")
+        return None
+
+    purelib = os.path.normpath(probe["purelib"])
+    platlib = os.path.normpath(probe["platlib"])
+    stdlib = os.path.normpath(probe["stdlib"])
+
+    # keep what `site` added, not the stdlib, zip files or base paths
+    extra_paths = []
+    for path in probe["sys_path"]:
+        path = os.path.normpath(path)
+        if (
+            path in (purelib, platlib)
+            or path in extra_paths
+            or path == stdlib
+            or path.startswith(stdlib + os.sep)
+            or not os.path.isdir(path)
+        ):
+            continue
+        extra_paths.append(path)
+
+    return VenvPaths(
+        version=probe["version"],
+        purelib=purelib,
+        platlib=platlib,
+        extra_paths=tuple(extra_paths),
+        markers=probe["markers"]
+    )
+
+
+def get_venv_paths(venv_path, probe=True) -> Optional[VenvPaths]:
+    """
+    Return the `VenvPaths` of a venv. The interpreter is only probed
+    once and the result is kept in the catalog until `pyvenv.cfg`
+    changes. Return `None` if the interpreter can't be run, or if it
+    isn't cached and `probe` is `False`.
+    """
+    venv_path = os.path.abspath(venv_path)
+    try:
+        cfg_stat = os.stat(os.path.join(venv_path, "pyvenv.cfg"))
+    except OSError:
+        return None
+    stamp = [cfg_stat.st_mtime_ns, cfg_stat.st_size]
+
+    with _venv_catalog_lock:
+        cached = load_venv_catalog()["paths"].get(venv_path)
+    if cached and cached[0] == stamp:
+        try:
+            fields = dict(cached[1])
+            fields["extra_paths"] = tuple(fields["extra_paths"])
+            return VenvPaths(**fields)
+        except (TypeError, KeyError, ValueError):
+            pass
+
+    if not probe:
+        return None
+    venv_paths = _probe_venv_paths(venv_path)
+    if venv_paths is not None:
+        with _venv_catalog_lock:
+            load_venv_catalog()["paths"][venv_path] = [
+                stamp, asdict(venv_paths)
+            ]
+    return venv_paths
+
+
+# venv path -> (VenvPaths, package locations)
+_package_locations: Dict[str, tuple] = {}
+
+
+def package_locations(venv_path, probe=True) -> List[Path]:
+    """
+    Return the directories to look for installed distributions in,
+    in `sys.path` order: purelib, platlib and the paths added by `.pth`
+    files. Falls back to the platform default if the interpreter can't
+    be probed (or isn't probed, see `get_venv_paths()`).
+    """
+    venv_paths = get_venv_paths(venv_path, probe=probe)
+    if venv_paths is None:
+        return [_site_packages_path(venv_path)]
+
+    key = os.path.abspath(venv_path)
+    cached = _package_locations.get(key)
+    if cached is not None and cached[0] == venv_paths:
+        return list(cached[1])
+
+    locations = []
+    seen = set()
+    for path in (
+        venv_paths.purelib,
+        venv_paths.platlib,
+        *venv_paths.extra_paths
+    ):
+        try:
+            real_path = os.path.realpath(path)
+        except OSError:
+            continue
+        # `lib64` is usually a symlink to `lib`
+        if real_path not in seen:
+            seen.add(real_path)
+            locations.append(Path(path))
+
+    _package_locations[key] = (venv_paths, tuple(locations))
+    return locations
+
+
+# venv path -> (mtimes of the package locations, pip version or None)
+_pip_versions: Dict[str, tuple] = {}
+
+
+def _find_pip_version(locations) -> Optional[str]:
+    """
+    Return the version of the first `pip-*.dist-info` (or `.egg-info`)
+    found in `locations`.
+    """
+    for location in locations:
+        try:
+            names = os.listdir(location)
+        except OSError:
+            continue
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext not in (".dist-info", ".egg-info"):
+                continue
+            dist_name, _, version = stem.partition("-")
+            if _canonical_name(dist_name) == "pip":
+                return version.partition("-")[0] or "N/A"
+    return None
+
+
+def installed_versions(venv_path, probe=True) -> Dict[str, str]:
+    """
+    Return the versions of the distributions installed in a venv by
+    their canonical names, read from the names of the `*.dist-info`
+    (or `.egg-info`) directories in the package locations. See
+    `get_pip_version()` for `probe`.
+    """
+    versions = {}
+    for location in package_locations(venv_path, probe=probe):
+        try:
+            names = os.listdir(location)
+        except OSError:
+            continue
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext not in (".dist-info", ".egg-info"):
+                continue
+            dist_name, _, version = stem.partition("-")
+            version = version.partition("-")[0]
+            if version:
+                versions.setdefault(_canonical_name(dist_name), version)
+    return versions
+
+
+def _run_pip_version(venv_path) -> Optional[str]:
+    """Return the version printed by `python -m pip --version`.
+    """
+    platform = get_platform()
+    venv_python = platform.venv_python_path(Path(venv_path))
+    try:
+        result = run(
+            [str(venv_python), "-m", "pip", "--version"],
+            stdout=PIPE,
+            stderr=STDOUT,
+            timeout=PROBE_TIMEOUT,
+            check=False
+        )
+    except (OSError, SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    output = result.stdout.decode("utf-8", "replace").split()
+    return output[1] if len(output) > 1 else "N/A"
+
+
+def get_pip_version(venv_path, probe=True) -> Optional[str]:
+    """
+    Return the version of pip installed in a venv, or `None` if it has
+    no pip. Read from the `pip-*.dist-info` directory in the package
+    locations and memoized until one of these directories changes.
+    Only venvs that include the global site-packages and have no pip of
+    their own ask the interpreter.
+
+    With `probe=False` no subprocess is run, which is what the GUI
+    thread does (the scan workers warm the caches with
+    `iter_probe_venvs()`). On a cache miss the platform default
+    site-packages is searched then, and a venv including the global
+    site-packages without a pip of its own is assumed to use the one of
+    its base interpreter ("N/A", not cached).
+    """
+    venv_path = os.path.abspath(venv_path)
+    locations = package_locations(venv_path, probe=probe)
+    stamp = []
+    for location in locations:
+        try:
+            stamp.append(os.stat(location).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+
+    cached = _pip_versions.get(venv_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    version = _find_pip_version(locations)
+    if version is None:
+        try:
+            venv_config = read_venv_config(
+                os.path.join(venv_path, "pyvenv.cfg")
+            )
+        except OSError:
+            venv_config = None
+        if venv_config is not None and venv_config.site_packages == "global":
+            if not probe:
+                return "N/A"
+            version = _run_pip_version(venv_path)
+
+    _pip_versions[venv_path] = (stamp, version)
+    return version
+
+
+def iter_probe_venvs(venv_paths, max_workers=SCAN_WORKERS):
+    """
+    Probe the `VenvPaths` and the pip version of `venv_paths` in
+    parallel, so later lookups from the GUI thread find them cached.
+    Yield `(venv_path, pip_version)` tuples in the order they complete.
+    """
+    if not venv_paths:
+        return
+
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(venv_paths))),
+        thread_name_prefix="venvipy-probe"
+    )
+    try:
+        futures = {
+            pool.submit(get_pip_version, venv_path): venv_path
+            for venv_path in venv_paths
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # drop pending work if the consumer stopped early
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+
+#]===========================================================================[#
+#] GET INFOS FROM PYTHON PACKAGE INDEX [#====================================[#
+#]===========================================================================[#
+
+@dataclass
+class PackageInfo:
+    """
+    Info about a PyPI package.
+    """
+    pkg_name: str
+    pkg_version: str
+    pkg_info_2: str
+    pkg_summary: str
+
+
+
+def ensure_pypi_db() -> None:
+    CFG_DIR.mkdir(parents=True, exist_ok=True)
+    with sqlite3.connect(PACKAGE_DB_PATH) as con:
+        con.execute("PRAGMA journal_mode=WAL;")
+        con.execute("CREATE TABLE IF NOT EXISTS projects (name TEXT PRIMARY KEY)")
+        con.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_projects_name_nocase ON projects(name COLLATE NOCASE)")
+
+        # cache table: version/author/summary + timestamp
+        # if older schema exists -> drop & recreate once (simple, no ALTER-mess)
+        cols = {r[1] for r in con.execute("PRAGMA table_info(pkg_meta)").fetchall()}
+        if cols and not {"name", "version", "info_2", "summary", "fetched_at"}.issubset(cols):
+            con.execute("DROP TABLE IF EXISTS pkg_meta")
+
+        con.execute("""
+            CREATE TABLE IF NOT EXISTS pkg_meta (
+                name TEXT PRIMARY KEY,
+                version TEXT NOT NULL DEFAULT '',
+                info_2  TEXT NOT NULL DEFAULT '',
+                summary TEXT NOT NULL DEFAULT '',
+                fetched_at INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+def update_pypi_index(force: bool = False, timeout: int = 60) -> bool:
+    """
+    Returns True if DB was updated, False if unchanged.
+    """
+    ensure_pypi_db()
+
+    with sqlite3.connect(PACKAGE_DB_PATH) as con:
+        cur = con.cursor()
+        cur.execute("SELECT value FROM meta WHERE key='last_serial'")
+        row = cur.fetchone()
+        stored_serial = row[0] if row else None
+
+    with requests.Session() as s:
+        r = s.get(
+            PYPI_SIMPLE_URL,
+            headers={
+                "Accept": "application/vnd.pypi.simple.v1+json, application/json;q=0.9, text/html;q=0.1",
+                "User-Agent": "venvipy",
+            },
+            timeout=timeout,
+        )
+        r.raise_for_status()
+
+        last_serial = r.headers.get("X-PyPI-Last-Serial")
+
+        if (not force) and last_serial and stored_serial == last_serial:
+            return False
+
+        ctype = (r.headers.get("content-type") or "").lower()
+        if "json" in ctype:
+            data = r.json()
+            projects = [p["name"] for p in data.get("projects", []) if isinstance(p, dict) and p.get("name")]
+        else:
+            soup = BeautifulSoup(r.text, "html.parser")
+            projects = [a.get_text(strip=True) for a in soup.select("a") if a.get_text(strip=True)]
+
+    with sqlite3.connect(PACKAGE_DB_PATH) as con:
+        con.execute("BEGIN")
+        con.execute("DELETE FROM projects")
+        con.executemany("INSERT INTO projects(name) VALUES (?)", [(n,) for n in projects])
+        con.execute(
+            """
+            INSERT INTO meta(key, value) VALUES ('last_serial', ?)
+            ON CONFLICT(key) DO UPDATE SET value=excluded.value
+            """,
+            (last_serial or "",),
+        )
+        con.commit()
+
+    return True
+
+
+def _get_db_names(name: str, following: int) -> List[str]:
+    """
+    Returns anchor match + `following` subsequent package names (alphabetical).
+    If nothing found, returns [].
+    """
+    if not name or following < 0:
+        return []
+
+    def q1(cur, sql, params) -> Optional[str]:
+        cur.execute(sql, params)
+        row = cur.fetchone()
+        return row[0] if row else None
+
+    with sqlite3.connect(PACKAGE_DB_PATH) as con:
+        cur = con.cursor()
+
+        # 1) exact (case-insensitive)
+        anchor = q1(
+            cur,
+            f"SELECT {DB_COL} FROM {DB_TABLE} WHERE lower({DB_COL}) = lower(?) LIMIT 1",
+            (name,),
+        )
+
+        # 2) prefix (case-insensitive)
+        if anchor is None:
+            anchor = q1(
+                cur,
+                f"""
+                SELECT {DB_COL}
+                FROM {DB_TABLE}
+                WHERE {DB_COL} LIKE ? ESCAPE '\\' COLLATE NOCASE
+                ORDER BY {DB_COL} COLLATE NOCASE
+                LIMIT 1
+                """,
+                (f"{name}%",),
+            )
 
         # 3) contains (case-insensitive), prefer earlier occurrence + shorter names
         if anchor is None:
@@ -755,300 +1874,1540 @@ def _get_db_names(name: str, following: int) -> List[str]:
                 (f"%{name}%", name),
             )
 
-        # 4) fallback: next alphabetical position
-        if anchor is None:
-            anchor = q1(
-                cur,
-                f"""
-                SELECT {DB_COL}
-                FROM {DB_TABLE}
-                WHERE {DB_COL} >= ? COLLATE NOCASE
-                ORDER BY {DB_COL} COLLATE NOCASE
-                LIMIT 1
-                """,
-                (name,),
+        # 4) fallback: next alphabetical position
+        if anchor is None:
+            anchor = q1(
+                cur,
+                f"""
+                SELECT {DB_COL}
+                FROM {DB_TABLE}
+                WHERE {DB_COL} >= ? COLLATE NOCASE
+                ORDER BY {DB_COL} COLLATE NOCASE
+                LIMIT 1
+                """,
+                (name,),
+            )
+
+        if anchor is None:
+            return []
+
+        # anchor + following subsequent
+        limit = following + 1
+        cur.execute(
+            f"""
+            SELECT {DB_COL}
+            FROM {DB_TABLE}
+            WHERE {DB_COL} >= ? COLLATE NOCASE
+            ORDER BY {DB_COL} COLLATE NOCASE
+            LIMIT ?
+            """,
+            (anchor, limit),
+        )
+        return [r[0] for r in cur.fetchall()]
+
+
+def get_db_name(name: str, following: int) -> str:
+    """
+    Returns a newline-separated string of suggested package names.
+    If nothing found, returns "".
+    """
+    names = _get_db_names(name, following)
+    return "\n".join(names) if names else ""
+
+
+def get_pkg_info_2(name: str, ttl_sec: int = 24 * 3600) -> str:
+    """
+    Return author (pkg_info_2) for `name`,
+    cached in ~/.venvipy/pypi_index.sqlite3.
+    """
+    if not name:
+        return ""
+
+    now = int(time.time())
+
+    with sqlite3.connect(PACKAGE_DB_PATH) as con:
+        con.execute("""
+            CREATE TABLE IF NOT EXISTS pkg_meta (
+                name TEXT PRIMARY KEY,
+                version TEXT NOT NULL DEFAULT '',
+                info_2  TEXT NOT NULL DEFAULT '',
+                summary TEXT NOT NULL DEFAULT '',
+                fetched_at INTEGER NOT NULL
+            )
+        """)
+
+        row = con.execute(
+            "SELECT info_2, fetched_at FROM pkg_meta WHERE name = ?",
+            (name,),
+        ).fetchone()
+
+        if row:
+            cached_info_2, fetched_at = row
+            if cached_info_2 and (now - int(fetched_at) < ttl_sec):
+                return cached_info_2
+
+    # fetch fresh
+    try:
+        r = requests.get(PYPI_JSON_URL.format(name=name), timeout=10)
+        if r.status_code == 404:
+            return ""
+        r.raise_for_status()
+        info = r.json().get("info", {}) or {}
+        author = (info.get("author") or "").strip()
+        author_email = (info.get("author_email") or "").strip()
+
+        # keep it short but useful
+        info_2 = author
+        if author_email and author_email not in info_2:
+            info_2 = f"{author} <{author_email}>".strip() if author else author_email
+    except Exception:
+        if row:
+            return row[0] or ""
+        return ""
+
+    with sqlite3.connect(PACKAGE_DB_PATH) as con:
+        con.execute(
+            """
+            INSERT INTO pkg_meta(name, info_2, fetched_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                info_2 = excluded.info_2,
+                fetched_at = excluded.fetched_at
+            """,
+            (name, info_2, now),
+        )
+
+    return info_2
+
+
+def get_pkg_summary(name: str, ttl_sec: int = 24 * 3600) -> str:
+    """
+    Return short description (PyPI 'summary')
+    for `name`, cached in pkg_meta.summary.
+    """
+    if not name:
+        return ""
+
+    now = int(time.time())
+
+    with sqlite3.connect(PACKAGE_DB_PATH) as con:
+        row = con.execute(
+            "SELECT summary, fetched_at FROM pkg_meta WHERE name = ?",
+            (name,),
+        ).fetchone()
+
+    if row:
+        cached_summary, fetched_at = row
+        if cached_summary and (now - int(fetched_at) < ttl_sec):
+            return cached_summary
+    else:
+        cached_summary = ""
+
+    try:
+        r = requests.get(PYPI_JSON_URL.format(name=name), timeout=10)
+        if r.status_code == 404:
+            return ""
+        r.raise_for_status()
+        info = r.json().get("info", {}) or {}
+
+        summary = (info.get("summary") or "").strip()
+        if not summary:
+            # fallback: derive a short line from long description
+            desc = (info.get("description") or "").strip()
+            summary = re.sub(r"\s+", " ", desc).strip()[:160] if desc else ""
+    except Exception:
+        return cached_summary or ""
+
+    with sqlite3.connect(PACKAGE_DB_PATH) as con:
+        con.execute(
+            """
+            INSERT INTO pkg_meta(name, summary, fetched_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                summary = excluded.summary,
+                fetched_at = excluded.fetched_at
+            """,
+            (name, summary, now),
+        )
+
+    return summary
+
+
+def get_pkg_version(name: str, ttl_sec: int = 24 * 3600) -> str:
+    """
+    Return latest version for `name`, cached
+    in ~/.venvipy/pypi_index.sqlite3.
+    """
+    if not name:
+        return ""
+
+    now = int(time.time())
+
+    with sqlite3.connect(PACKAGE_DB_PATH) as con:
+        con.execute("""
+            CREATE TABLE IF NOT EXISTS pkg_meta (
+                name TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                fetched_at INTEGER NOT NULL
             )
+        """)
 
-        if anchor is None:
-            return []
+        row = con.execute(
+            "SELECT version, fetched_at FROM pkg_meta WHERE name = ?",
+            (name,),
+        ).fetchone()
 
-        # anchor + following subsequent
-        limit = following + 1
-        cur.execute(
-            f"""
-            SELECT {DB_COL}
-            FROM {DB_TABLE}
-            WHERE {DB_COL} >= ? COLLATE NOCASE
-            ORDER BY {DB_COL} COLLATE NOCASE
-            LIMIT ?
+        if row:
+            cached_version, fetched_at = row
+            if cached_version and (now - int(fetched_at) < ttl_sec):
+                return cached_version
+
+    # fetch fresh
+    try:
+        r = requests.get(PYPI_JSON_URL.format(name=name), timeout=10)
+        if r.status_code == 404:
+            return ""
+        r.raise_for_status()
+        version = (r.json().get("info", {}) or {}).get("version", "") or ""
+    except Exception:
+        # fallback to cached if available
+        if row:
+            return row[0] or ""
+        return ""
+
+    with sqlite3.connect(PACKAGE_DB_PATH) as con:
+        con.execute(
+            """
+            INSERT INTO pkg_meta(name, version, fetched_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                version = excluded.version,
+                fetched_at = excluded.fetched_at
             """,
-            (anchor, limit),
+            (name, version, now),
+        )
+
+    return version
+
+
+def get_package_infos(pkg: str) -> list[PackageInfo]:
+    """Get package infos from PyPI (pkg_name from DB for now).
+    """
+    package_info_list: list[PackageInfo] = []
+
+    # e.g. show 15 suggestions; adjust as needed
+    for pkg_name in _get_db_names(pkg, following=15):
+        pkg_version = get_pkg_version(pkg_name)
+        pkg_info_2 = get_pkg_info_2(pkg_name)
+        pkg_summary = get_pkg_summary(pkg_name)
+
+        pkg_info = PackageInfo(
+            pkg_name,
+            pkg_version,
+            pkg_info_2,
+            pkg_summary
+        )
+        package_info_list.append(pkg_info)
+
+    return package_info_list[::-1]
+
+
+def parse_metadata_headers(text) -> Dict[str, List[str]]:
+    """
+    Parse the header block of a core metadata (RFC 822 style) text.
+    Field names are lower-cased, every value is kept (fields like
+    `Requires-Dist` repeat) and continuation lines are unfolded.
+    Parsing stops at the first blank line, where the body starts.
+    """
+    headers: Dict[str, List[str]] = {}
+    values = None
+    for line in text.splitlines():
+        if not line.strip():
+            break
+
+        if line[0] in " \t":
+            # continuation of the previous field
+            if values:
+                values[-1] = f"{values[-1]} {line.strip()}"
+            continue
+
+        name, sep, value = line.partition(":")
+        if not sep:
+            values = None
+            continue
+        values = headers.setdefault(name.strip().lower(), [])
+        values.append(value.strip())
+
+    return headers
+
+
+def read_metadata_headers(meta_file) -> Dict[str, List[str]]:
+    """
+    Read only the header block of a `METADATA` (or `PKG-INFO`) file.
+    The file is read in chunks of `METADATA_CHUNK_SIZE` bytes until the
+    first blank line (or `METADATA_MAX_HEADER` bytes), so the long
+    description in the body is never loaded. Raises `OSError`.
+    """
+    data = b""
+    with open(meta_file, "rb") as f:
+        while len(data) < METADATA_MAX_HEADER:
+            chunk = f.read(METADATA_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            # look for the blank line from the end of the previous chunk
+            start = max(0, len(data) - 2)
+            data += chunk
+            ends = [
+                end for end in (
+                    data.find(b"\n\n", start),
+                    data.find(b"\n\r\n", start)
+                )
+                if end != -1
+            ]
+            if ends:
+                data = data[:min(ends) + 1]
+                break
+
+    return parse_metadata_headers(data.decode("utf-8", errors="replace"))
+
+
+def _read_dist_headers(dist_info) -> Optional[Dict[str, List[str]]]:
+    """
+    Return the metadata headers of a `.dist-info` (`METADATA`) or an
+    `.egg-info` (`PKG-INFO`) directory, or `None` if they can't be read.
+    """
+    if str(dist_info).endswith(".egg-info"):
+        meta_file = Path(dist_info) / "PKG-INFO"
+    else:
+        meta_file = Path(dist_info) / "METADATA"
+    try:
+        return read_metadata_headers(meta_file)
+    except FileNotFoundError:
+        logger.debug(f"File '{meta_file}' not found.")
+    except OSError as e:
+        logger.debug(f"Could not read '{meta_file}': {e}")
+    return None
+
+
+def _package_info(headers) -> Optional[PackageInfo]:
+    """Return a `PackageInfo` from metadata headers.
+    """
+    pkg_name = headers.get("name", [""])[0]
+    if not pkg_name:
+        return None
+
+    return PackageInfo(
+        pkg_name,
+        headers.get("version", [""])[0],
+        headers.get("author", [""])[0],
+        headers.get("summary", [""])[0]
+    )
+
+
+def read_package_info(dist_info) -> Optional[PackageInfo]:
+    """
+    Return a `PackageInfo` from the `METADATA` of a `.dist-info` (or
+    the `PKG-INFO` of an `.egg-info`) directory, or `None` if it can't
+    be read or has no name.
+    """
+    headers = _read_dist_headers(dist_info)
+    if headers is None:
+        return None
+    return _package_info(headers)
+
+
+def _read_egg_requires(egg_info) -> List[str]:
+    """
+    Convert the `requires.txt` of an `.egg-info` into `Requires-Dist`
+    strings (sections `[extra:marker]` become markers).
+    """
+    try:
+        with open(Path(egg_info) / "requires.txt", "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    requires = []
+    marker = ""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        if line.startswith("[") and line.endswith("]"):
+            extra, _, section_marker = line[1:-1].partition(":")
+            markers = []
+            if extra.strip():
+                markers.append(f'extra == "{extra.strip()}"')
+            if section_marker.strip():
+                markers.append(f"({section_marker.strip()})")
+            marker = " and ".join(markers)
+            continue
+
+        requires.append(f"{line}; {marker}" if marker else line)
+    return requires
+
+
+def _read_distribution(dist_info) -> tuple:
+    """
+    Return `(fields, requires, direct_url)` of a dist-info: the
+    `PackageInfo` fields as a tuple (or `None`), the tuple of its
+    `Requires-Dist` values and the content of `direct_url.json` (or
+    `None`).
+    """
+    headers = _read_dist_headers(dist_info)
+    pkg_info = _package_info(headers) if headers is not None else None
+    if pkg_info is None:
+        return None, (), None
+
+    requires = headers.get("requires-dist", [])
+    if not requires and str(dist_info).endswith(".egg-info"):
+        requires = _read_egg_requires(dist_info)
+
+    direct_url = None
+    try:
+        with open(
+            Path(dist_info) / "direct_url.json", "r", encoding="utf-8"
+        ) as f:
+            direct_url = f.read()
+    except FileNotFoundError:
+        pass
+    except (OSError, UnicodeDecodeError) as e:
+        logger.debug(f"Could not read 'direct_url.json' of '{dist_info}': {e}")
+    return astuple(pkg_info), tuple(requires), direct_url
+
+
+def _snapshot_file(site_packages_dir) -> Path:
+    """Return the snapshot file of a site-packages directory.
+    """
+    digest = hashlib.blake2b(
+        os.fsencode(os.path.abspath(site_packages_dir)),
+        digest_size=16
+    ).hexdigest()
+    return PACKAGE_CACHE_DIR / f"{digest}.bin"
+
+
+def load_package_snapshot(site_packages_dir) -> Optional[tuple]:
+    """
+    Return the cached `(mtime_ns, entries)` snapshot of the packages
+    in `site_packages_dir`, or `None` if there is no (valid) snapshot.
+    `entries` maps each dist-info name to `(stamp, fields, requires,
+    direct_url)` where `stamp` is `(inode, mtime_ns)`, followed by the
+    result of `_read_distribution()`.
+    """
+    try:
+        with open(_snapshot_file(site_packages_dir), "rb") as f:
+            version, path, mtime_ns, entries = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if version != SNAPSHOT_VERSION or path != str(site_packages_dir):
+        return None
+    return mtime_ns, entries
+
+
+def save_package_snapshot(site_packages_dir, mtime_ns, entries) -> None:
+    """Persist the packages snapshot of `site_packages_dir`.
+    """
+    snapshot_file = _snapshot_file(site_packages_dir)
+    tmp_file = f"{snapshot_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        PACKAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, "wb") as f:
+            marshal.dump(
+                (SNAPSHOT_VERSION, str(site_packages_dir), mtime_ns, entries),
+                f
+            )
+        os.replace(tmp_file, snapshot_file)
+    except OSError as e:
+        logger.warning(f"Failed to save packages snapshot: {e}")
+
+
+def get_installed_packages(venv_location, venv_name) -> list:
+    """Get infos about installed packages.
+    """
+    return list(iter_installed_packages(venv_location, venv_name))
+
+
+def _canonical_name(name) -> str:
+    """Normalize a distribution name (PEP 503).
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def iter_installed_packages(
+        venv_location,
+        venv_name,
+        max_workers=SCAN_WORKERS
+    ):
+    """
+    Yield `PackageInfo` objects of the packages installed in any of the
+    `package_locations()` of a venv. If a distribution is found in more
+    than one location, the first one (in `sys.path` order) wins.
+    """
+    for pkg_info, _requires, _direct_url in _iter_distributions(
+            Path(venv_location) / venv_name,
+            max_workers
+        ):
+        yield pkg_info
+
+
+def _iter_distributions(venv_path, max_workers=SCAN_WORKERS, probe=True):
+    """
+    Yield `(PackageInfo, requires, direct_url)` tuples of the
+    distributions in the `package_locations()` of a venv, each
+    distribution only once. See `get_venv_paths()` for `probe`.
+    """
+    seen = set()
+    for location in package_locations(venv_path, probe=probe):
+        for distribution in _iter_location_packages(location, max_workers):
+            key = _canonical_name(distribution[0].pkg_name)
+            if key not in seen:
+                seen.add(key)
+                yield distribution
+
+
+def _iter_location_packages(site_packages_dir, max_workers=SCAN_WORKERS):
+    """
+    Yield `(PackageInfo, requires, direct_url)` tuples of the
+    distributions in one directory.
+    Unchanged ones come from the snapshot cache of the directory, new
+    ones are read in parallel and yielded in the order they complete.
+
+    If the directory wasn't modified since the snapshot was taken,
+    nothing but the cache is read. Otherwise one `scandir()` tells
+    which dist-infos were added or removed (a reinstalled one gets a
+    new inode or mtime) and only the added ones are parsed.
+    """
+    try:
+        mtime_ns = os.stat(site_packages_dir).st_mtime_ns
+    except OSError:
+        return
+
+    snapshot = load_package_snapshot(site_packages_dir)
+    if snapshot is not None and snapshot[0] == mtime_ns:
+        for _stamp, fields, requires, direct_url in snapshot[1].values():
+            if fields is not None:
+                yield PackageInfo(*fields), requires, direct_url
+        return
+
+    cached = snapshot[1] if snapshot is not None else {}
+    entries = {}
+    missing = []
+    try:
+        with os.scandir(site_packages_dir) as it:
+            for entry in it:
+                if not entry.name.endswith((".dist-info", ".egg-info")):
+                    continue
+
+                try:
+                    # an `.egg-info` can be a plain file (distutils)
+                    if not entry.is_dir():
+                        continue
+                    stamp = (
+                        entry.inode(),
+                        entry.stat(follow_symlinks=False).st_mtime_ns
+                    )
+                except OSError:
+                    continue
+
+                known = cached.get(entry.name)
+                if known is not None and tuple(known[0]) == stamp:
+                    entries[entry.name] = known
+                else:
+                    missing.append((entry.name, stamp, entry.path))
+    except OSError:
+        return
+
+    for _stamp, fields, requires, direct_url in entries.values():
+        if fields is not None:
+            yield PackageInfo(*fields), requires, direct_url
+
+    if missing:
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(missing))),
+            thread_name_prefix="venvipy-packages"
+        )
+        try:
+            futures = {
+                pool.submit(_read_distribution, path): (name, stamp)
+                for name, stamp, path in missing
+            }
+            for future in as_completed(futures):
+                name, stamp = futures[future]
+                fields, requires, direct_url = future.result()
+                entries[name] = (stamp, fields, requires, direct_url)
+                if fields is not None:
+                    yield PackageInfo(*fields), requires, direct_url
+        finally:
+            # drop pending work if the consumer stopped early
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    save_package_snapshot(site_packages_dir, mtime_ns, entries)
+
+
+
+
+
+
+#]===========================================================================[#
+#] DEPENDENCY GRAPH [#=======================================================[#
+#]===========================================================================[#
+
+_REQUIREMENT_RE = re.compile(
+    r"^\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)"  # name
+    r"\s*(?:\[([^\]]*)\])?"  # extras
+    r"\s*(.*)$"  # specifier or url
+)
+
+_MARKER_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<str>'[^']*'|"[^"]*")
+      | (?P<op>===|==|!=|<=|>=|~=|<|>|\(|\))
+      | (?P<word>[A-Za-z_][A-Za-z0-9_.]*)
+    )""",
+    re.VERBOSE
+)
+
+_VERSION_RE = re.compile(r"^\s*v?(\d+(?:\.\d+)*)(\.\*)?")
+
+# venv path -> (key, DependencyGraph)
+_dependency_graphs: Dict[str, tuple] = {}
+
+
+@dataclass
+class DependencyGraph:
+    """
+    Dependencies between the distributions installed in a venv. Keys
+    are canonical names. `requires` maps a distribution to a list of
+    `(key, name, specifier)` tuples, `required_by` maps it to a list of
+    `(key, specifier)` tuples of the distributions requiring it.
+    """
+    packages: Dict[str, PackageInfo]
+    requires: Dict[str, List[tuple]]
+    required_by: Dict[str, List[tuple]]
+
+
+def parse_requirement(requirement) -> Optional[tuple]:
+    """
+    Split a PEP 508 requirement string into `(name, extras, specifier,
+    marker)`. Return `None` if it can't be parsed.
+    """
+    req, _, marker = requirement.partition(";")
+    match = _REQUIREMENT_RE.match(req)
+    if not match:
+        return None
+
+    name, extras, specifier = match.groups()
+    extras = tuple(
+        extra.strip() for extra in (extras or "").split(",") if extra.strip()
+    )
+    specifier = specifier.strip()
+    if specifier.startswith("(") and specifier.endswith(")"):
+        specifier = specifier[1:-1].strip()
+    if not specifier.startswith("@"):
+        specifier = "".join(specifier.split())
+    return name, extras, specifier, marker.strip()
+
+
+def _version_tuple(value) -> Optional[tuple]:
+    """Return the release segment of a version as a tuple of ints.
+    """
+    match = _VERSION_RE.match(value)
+    if not match:
+        return None
+    return tuple(int(n) for n in match.group(1).split("."))
+
+
+def _compare_versions(lhs, op, rhs) -> Optional[bool]:
+    """
+    Compare two PEP 440 versions (see `_version_key()`), `None` if one
+    of them isn't a version. Supports `==`/`!=` wildcards (`3.*`), `~=`
+    and the exclusive `<`/`>` rules for pre- and post-releases.
+    """
+    if op == "===":
+        return lhs.strip() == rhs.strip()
+
+    left = _version_key(lhs)
+    if left is None:
+        return None
+
+    if op in ("==", "!=") and rhs.strip().endswith(".*"):
+        right = _version_tuple(rhs)
+        if right is None:
+            return None
+        release = left[1] + (0,) * max(0, len(right) - len(left[1]))
+        result = left[0] == 0 and release[:len(right)] == right
+        return result if op == "==" else not result
+
+    right = _version_key(rhs)
+    if right is None:
+        return None
+
+    # `==1.0` matches `1.0+local`
+    if op in ("==", "!=") and not right[5]:
+        left = left[:5] + ((),)
+
+    if op == "~=":
+        release = _version_tuple(rhs)
+        prefix = release[:max(1, len(release) - 1)]
+        padded = left[1] + (0,) * max(0, len(prefix) - len(left[1]))
+        return left >= right and padded[:len(prefix)] == prefix
+
+    same_release = left[:2] == right[:2]
+    if op == "<":
+        # `<1.0` excludes pre-releases of 1.0, unless it's one itself
+        if same_release and left[2][0] < 2 and right[2][0] == 2:
+            return False
+        return left < right
+    if op == ">":
+        # `>1.0` excludes post-releases (and local versions) of 1.0
+        if same_release and right[3] == (0,) and left[2:4] != right[2:4]:
+            return left[2] > right[2]
+        if same_release and left[2:5] == right[2:5]:
+            return False  # differs by the local version only
+        return left > right
+
+    return {
+        "==": left == right,
+        "!=": left != right,
+        "<=": left <= right,
+        ">=": left >= right,
+    }.get(op)
+
+
+def specifier_matches(version, specifier) -> Optional[bool]:
+    """
+    Return whether `version` matches a version specifier like
+    `>=1.0,<2` (empty matches any), `None` if that can't be told.
+    """
+    for clause in specifier.split(","):
+        clause = clause.strip()
+        if not clause:
+            continue
+        match = re.fullmatch(r"(===|==|!=|~=|<=|>=|<|>)\s*(\S+)", clause)
+        if not match:
+            return None
+        result = _compare_versions(version, match.group(1), match.group(2))
+        if not result:
+            return result
+    return True
+
+
+def requirement_satisfied(requirement, installed) -> bool:
+    """
+    Return `True` if a plain requirement (no extras, markers or URL) is
+    satisfied by `installed`, a dict of versions by canonical name like
+    `installed_versions()` returns.
+    """
+    parsed = parse_requirement(requirement)
+    if parsed is None:
+        return False
+    name, extras, specifier, marker = parsed
+    if extras or marker or specifier.startswith("@"):
+        return False
+    version = installed.get(_canonical_name(name))
+    if version is None:
+        return False
+    return specifier_matches(version, specifier) is True
+
+
+def _tokenize_marker(marker) -> List[tuple]:
+    """Split a marker expression into `(kind, value)` tokens.
+    """
+    tokens = []
+    pos = 0
+    marker = marker.rstrip()
+    while pos < len(marker):
+        match = _MARKER_TOKEN_RE.match(marker, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Invalid marker: {marker!r}")
+
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "str":
+            value = value[1:-1]
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+def evaluate_marker(marker, environment) -> bool:
+    """
+    Evaluate a PEP 508 environment marker against `environment` (a dict
+    of marker variables). Raises `ValueError` if it can't be parsed.
+    """
+    tokens = _tokenize_marker(marker)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else (None, None)
+
+    def take(kind=None, value=None):
+        nonlocal pos
+        token = peek()
+        if token[0] is None or (kind and token[0] != kind) or (
+            value and token[1] != value
+        ):
+            raise ValueError(f"Invalid marker: {marker!r}")
+        pos += 1
+        return token
+
+    def operand():
+        kind, value = take()
+        if kind == "str":
+            return value, False
+        if kind == "word":
+            return str(environment.get(value, "")), value == "extra"
+        raise ValueError(f"Invalid marker: {marker!r}")
+
+    def comparison():
+        if peek() == ("op", "("):
+            take()
+            result = or_expr()
+            take("op", ")")
+            return result
+
+        lhs, lhs_extra = operand()
+        kind, op = take()
+        if kind == "word" and op == "not":
+            take("word", "in")
+            op = "not in"
+        elif kind == "word" and op != "in":
+            raise ValueError(f"Invalid marker: {marker!r}")
+        rhs, rhs_extra = operand()
+
+        if lhs_extra or rhs_extra:
+            lhs = _canonical_name(lhs)
+            rhs = _canonical_name(rhs)
+        if op == "in":
+            return lhs in rhs
+        if op == "not in":
+            return lhs not in rhs
+
+        result = None
+        if not (lhs_extra or rhs_extra):
+            result = _compare_versions(lhs, op, rhs)
+        if result is None:
+            if op in ("==", "==="):
+                return lhs == rhs
+            if op == "!=":
+                return lhs != rhs
+            return False
+        return result
+
+    def and_expr():
+        result = comparison()
+        while peek() == ("word", "and"):
+            take()
+            rhs = comparison()
+            result = result and rhs
+        return result
+
+    def or_expr():
+        result = and_expr()
+        while peek() == ("word", "or"):
+            take()
+            rhs = and_expr()
+            result = result or rhs
+        return result
+
+    result = or_expr()
+    if pos != len(tokens):
+        raise ValueError(f"Invalid marker: {marker!r}")
+    return result
+
+
+def _marker_matches(marker, environment, extras) -> bool:
+    """
+    Return whether a requirement with `marker` applies to a distribution
+    installed with `extras`. Markers that can't be parsed count as true.
+    """
+    try:
+        return any(
+            evaluate_marker(marker, {**environment, "extra": extra})
+            for extra in ("", *sorted(extras))
         )
-        return [r[0] for r in cur.fetchall()]
+    except ValueError as e:
+        logger.debug(e)
+        return True
 
 
-def get_db_name(name: str, following: int) -> str:
+def marker_environment(venv_path, probe=True) -> Dict[str, str]:
     """
-    Returns a newline-separated string of suggested package names.
-    If nothing found, returns "".
+    Return the marker environment of a venv from its `VenvPaths`. If
+    the interpreter can't be probed (or isn't, see `get_venv_paths()`),
+    the values of this process are used with the version from
+    `pyvenv.cfg`.
     """
-    names = _get_db_names(name, following)
-    return "\n".join(names) if names else ""
+    venv_paths = get_venv_paths(venv_path, probe=probe)
+    if venv_paths is not None:
+        return dict(venv_paths.markers)
+
+    import platform as host
+    environment = {
+        "implementation_name": sys.implementation.name,
+        "implementation_version": host.python_version(),
+        "os_name": os.name,
+        "platform_machine": host.machine(),
+        "platform_python_implementation": host.python_implementation(),
+        "platform_release": host.release(),
+        "platform_system": host.system(),
+        "platform_version": host.version(),
+        "python_full_version": host.python_version(),
+        "python_version": ".".join(host.python_version_tuple()[:2]),
+        "sys_platform": sys.platform,
+    }
+    cfg_file = os.path.join(venv_path, "pyvenv.cfg")
+    if os.path.isfile(cfg_file):
+        version = read_venv_config(cfg_file).version_number
+        if _version_tuple(version):
+            environment["python_full_version"] = version
+            environment["python_version"] = _major_minor(version)
+    return environment
 
 
-def get_pkg_info_2(name: str, ttl_sec: int = 24 * 3600) -> str:
+def build_dependency_graph(distributions, environment) -> DependencyGraph:
     """
-    Return author (pkg_info_2) for `name`,
-    cached in ~/.venvipy/pypi_index.sqlite3.
+    Build a `DependencyGraph` from `(PackageInfo, requires, direct_url)`
+    tuples.
+    Requirements whose marker doesn't match `environment` are skipped;
+    extras requested by other distributions enable their requirements.
     """
-    if not name:
-        return ""
+    packages = {}
+    parsed = {}
+    for pkg_info, requires, _direct_url in distributions:
+        key = _canonical_name(pkg_info.pkg_name)
+        packages[key] = pkg_info
+        parsed[key] = [
+            req for req in map(parse_requirement, requires) if req
+        ]
+
+    extras = {key: set() for key in packages}
+    requires = {}
+    pending = list(packages)
+    while pending:
+        key = pending.pop()
+        edges = {}
+        for name, req_extras, specifier, marker in parsed[key]:
+            if marker and not _marker_matches(marker, environment, extras[key]):
+                continue
 
-    now = int(time.time())
+            dep_key = _canonical_name(name)
+            if dep_key == key:
+                continue  # self-reference via extras
+            if dep_key in edges:
+                specs = [edges[dep_key][2], specifier]
+                edges[dep_key] = (
+                    dep_key, name, ",".join(spec for spec in specs if spec)
+                )
+            else:
+                edges[dep_key] = (dep_key, name, specifier)
 
-    with sqlite3.connect(PACKAGE_DB_PATH) as con:
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS pkg_meta (
-                name TEXT PRIMARY KEY,
-                version TEXT NOT NULL DEFAULT '',
-                info_2  TEXT NOT NULL DEFAULT '',
-                summary TEXT NOT NULL DEFAULT '',
-                fetched_at INTEGER NOT NULL
-            )
-        """)
+            # `name[extra]` enables requirements of the extra
+            new_extras = {_canonical_name(e) for e in req_extras}
+            if dep_key in packages and not new_extras <= extras[dep_key]:
+                extras[dep_key] |= new_extras
+                pending.append(dep_key)
+        requires[key] = list(edges.values())
 
-        row = con.execute(
-            "SELECT info_2, fetched_at FROM pkg_meta WHERE name = ?",
-            (name,),
-        ).fetchone()
+    required_by = {key: [] for key in packages}
+    for key, edges in requires.items():
+        for dep_key, _name, specifier in edges:
+            if dep_key in required_by:
+                required_by[dep_key].append((key, specifier))
 
-        if row:
-            cached_info_2, fetched_at = row
-            if cached_info_2 and (now - int(fetched_at) < ttl_sec):
-                return cached_info_2
+    return DependencyGraph(packages, requires, required_by)
 
-    # fetch fresh
-    try:
-        r = requests.get(PYPI_JSON_URL.format(name=name), timeout=10)
-        if r.status_code == 404:
-            return ""
-        r.raise_for_status()
-        info = r.json().get("info", {}) or {}
-        author = (info.get("author") or "").strip()
-        author_email = (info.get("author_email") or "").strip()
 
-        # keep it short but useful
-        info_2 = author
-        if author_email and author_email not in info_2:
-            info_2 = f"{author} <{author_email}>".strip() if author else author_email
-    except Exception:
-        if row:
-            return row[0] or ""
-        return ""
+def _dependency_graph_key(venv_path, locations, environment) -> tuple:
+    """Key of a dependency graph: the state of the package locations.
+    """
+    stamps = []
+    for location in locations:
+        try:
+            stamps.append((str(location), os.stat(location).st_mtime_ns))
+        except OSError:
+            stamps.append((str(location), None))
+    return tuple(stamps), tuple(sorted(environment.items()))
 
-    with sqlite3.connect(PACKAGE_DB_PATH) as con:
-        con.execute(
-            """
-            INSERT INTO pkg_meta(name, info_2, fetched_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(name) DO UPDATE SET
-                info_2 = excluded.info_2,
-                fetched_at = excluded.fetched_at
-            """,
-            (name, info_2, now),
-        )
 
-    return info_2
+def get_dependency_graph(
+        venv_location,
+        venv_name,
+        probe=True
+    ) -> DependencyGraph:
+    """
+    Return the `DependencyGraph` of a venv. It's cached until one of
+    the package locations changes (see `iter_installed_packages()`).
+    With `probe=False` the interpreter isn't run (see
+    `get_venv_paths()`).
+    """
+    venv_path = os.path.abspath(os.path.join(venv_location, venv_name))
+    environment = marker_environment(venv_path, probe=probe)
+    locations = package_locations(venv_path, probe=probe)
+    key = _dependency_graph_key(venv_path, locations, environment)
 
+    cached = _dependency_graphs.get(venv_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
 
-def get_pkg_summary(name: str, ttl_sec: int = 24 * 3600) -> str:
+    graph = build_dependency_graph(
+        _iter_distributions(venv_path, probe=probe), environment
+    )
+    _dependency_graphs[venv_path] = (key, graph)
+    return graph
+
+
+def format_dependency_tree(graph, reverse=False) -> str:
     """
-    Return short description (PyPI 'summary')
-    for `name`, cached in pkg_meta.summary.
+    Render a `DependencyGraph` as text tree like `pipdeptree` does. With
+    `reverse=True` the tree starts at the distributions without
+    dependencies and lists what requires them.
     """
-    if not name:
-        return ""
+    packages = graph.packages
+
+    def label(key):
+        pkg_info = packages[key]
+        return f"{pkg_info.pkg_name}=={pkg_info.pkg_version}"
+
+    def children(key):
+        """Return sorted `(child key, text)` tuples of a node.
+        """
+        items = []
+        if reverse:
+            pkg_name = packages[key].pkg_name
+            for parent, specifier in graph.required_by.get(key, []):
+                items.append((
+                    parent,
+                    f"{label(parent)} [requires: {pkg_name}{specifier}]"
+                ))
+        else:
+            for dep_key, name, specifier in graph.requires.get(key, []):
+                dep_info = packages.get(dep_key)
+                if dep_info is None:
+                    installed = "?"
+                else:
+                    name, installed = dep_info.pkg_name, dep_info.pkg_version
+                items.append((
+                    dep_key,
+                    f"{name} [required: {specifier or 'Any'}, "
+                    f"installed: {installed}]"
+                ))
+        return sorted(items)
+
+    lines = []
+
+    def walk(key, prefix, path):
+        items = children(key)
+        for i, (child, text) in enumerate(items):
+            last = i == len(items) - 1
+            branch = "└── " if last else "├── "
+            if child in path:
+                lines.append(f"{prefix}{branch}{text} (cycle)")
+                continue
 
-    now = int(time.time())
+            lines.append(f"{prefix}{branch}{text}")
+            if child in packages:
+                indent = "    " if last else "│   "
+                walk(child, prefix + indent, path | {child})
+
+    parents = graph.requires if reverse else graph.required_by
+    roots = [key for key in sorted(packages) if not parents.get(key)]
+
+    # distributions that are only part of a cycle have no root, start
+    # at the first one of each cycle that wasn't reached yet
+    reached = set()
+    stack = list(roots)
+    for key in sorted(packages):
+        if not stack and key not in reached:
+            roots.append(key)
+            stack.append(key)
+        while stack:
+            node = stack.pop()
+            if node not in reached:
+                reached.add(node)
+                stack.extend(
+                    child for child, _text in children(node)
+                    if child in packages
+                )
 
-    with sqlite3.connect(PACKAGE_DB_PATH) as con:
-        row = con.execute(
-            "SELECT summary, fetched_at FROM pkg_meta WHERE name = ?",
-            (name,),
-        ).fetchone()
+    for key in roots:
+        lines.append(label(key))
+        walk(key, "", frozenset({key}))
 
-    if row:
-        cached_summary, fetched_at = row
-        if cached_summary and (now - int(fetched_at) < ttl_sec):
-            return cached_summary
+    return "\n".join(lines)
+
+
+
+
+
+
+#]===========================================================================[#
+#] FREEZE REQUIREMENTS [#====================================================[#
+#]===========================================================================[#
+
+# same as `pip freeze`: build backends are left out below Python 3.12
+FREEZE_SKIP = frozenset({"pip"})
+FREEZE_SKIP_BEFORE_312 = frozenset({"setuptools", "distribute", "wheel"})
+
+# PEP 440 (taken from `packaging.version.VERSION_PATTERN`)
+_PEP440_RE = re.compile(
+    r"""^\s*v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>[-_\.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_\.]?(?P<pre_n>[0-9]+)?)?
+    (?P<post>(?:-(?P<post_n1>[0-9]+))|(?:[-_\.]?(?P<post_l>post|rev|r)[-_\.]?(?P<post_n2>[0-9]+)?))?
+    (?P<dev>[-_\.]?(?P<dev_l>dev)[-_\.]?(?P<dev_n>[0-9]+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_\.][a-z0-9]+)*))?
+    \s*$""",
+    re.VERBOSE | re.IGNORECASE
+)
+
+_PRE_RELEASE_LETTERS = {
+    "alpha": "a",
+    "beta": "b",
+    "c": "rc",
+    "pre": "rc",
+    "preview": "rc",
+}
+
+# `user@host:path` remotes of git
+_SCP_REMOTE_RE = re.compile(r"^(\w+@)?([^/:]+):(\w[^:]*)$")
+
+
+def normalize_version(version) -> Optional[str]:
+    """
+    Return the normalized form of a PEP 440 version (e.g. `1.0-beta1`
+    becomes `1.0b1`), or `None` if it isn't a valid one.
+    """
+    match = _PEP440_RE.match(version)
+    if not match:
+        return None
+
+    parts = []
+    if match.group("epoch") and int(match.group("epoch")):
+        parts.append(f"{int(match.group('epoch'))}!")
+    parts.append(
+        ".".join(str(int(n)) for n in match.group("release").split("."))
+    )
+    if match.group("pre"):
+        letter = match.group("pre_l").lower()
+        letter = _PRE_RELEASE_LETTERS.get(letter, letter)
+        parts.append(f"{letter}{int(match.group('pre_n') or 0)}")
+    if match.group("post"):
+        number = match.group("post_n1") or match.group("post_n2") or 0
+        parts.append(f".post{int(number)}")
+    if match.group("dev"):
+        parts.append(f".dev{int(match.group('dev_n') or 0)}")
+    if match.group("local"):
+        local = re.split(r"[-_\.]", match.group("local").lower())
+        parts.append("+" + ".".join(
+            str(int(part)) if part.isdigit() else part for part in local
+        ))
+    return "".join(parts)
+
+
+def _version_key(version) -> Optional[tuple]:
+    """
+    Return a key ordering PEP 440 versions like pip does, `None` if
+    `version` isn't a valid one: `1.0.dev0 < 1.0a1 < 1.0rc1 < 1.0 <
+    1.0+local < 1.0.post1`. The key is `(epoch, release, pre, post, dev,
+    local)`, trailing zeros of the release are dropped.
+    """
+    match = _PEP440_RE.match(version)
+    if not match:
+        return None
+
+    release = [int(n) for n in match.group("release").split(".")]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+
+    if match.group("pre"):
+        letter = match.group("pre_l").lower()
+        letter = _PRE_RELEASE_LETTERS.get(letter, letter)
+        pre = (
+            1, ("a", "b", "rc").index(letter), int(match.group("pre_n") or 0)
+        )
+    elif match.group("dev") and not match.group("post"):
+        pre = (0,)  # `1.0.dev0` is before `1.0a0`
     else:
-        cached_summary = ""
+        pre = (2,)
 
-    try:
-        r = requests.get(PYPI_JSON_URL.format(name=name), timeout=10)
-        if r.status_code == 404:
-            return ""
-        r.raise_for_status()
-        info = r.json().get("info", {}) or {}
+    if match.group("post"):
+        number = match.group("post_n1") or match.group("post_n2") or 0
+        post = (1, int(number))
+    else:
+        post = (0,)
 
-        summary = (info.get("summary") or "").strip()
-        if not summary:
-            # fallback: derive a short line from long description
-            desc = (info.get("description") or "").strip()
-            summary = re.sub(r"\s+", " ", desc).strip()[:160] if desc else ""
-    except Exception:
-        return cached_summary or ""
+    dev = (0, int(match.group("dev_n") or 0)) if match.group("dev") else (1,)
 
-    with sqlite3.connect(PACKAGE_DB_PATH) as con:
-        con.execute(
-            """
-            INSERT INTO pkg_meta(name, summary, fetched_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(name) DO UPDATE SET
-                summary = excluded.summary,
-                fetched_at = excluded.fetched_at
-            """,
-            (name, summary, now),
+    local = ()
+    if match.group("local"):
+        # numeric parts sort after alphanumeric ones
+        local = tuple(
+            (1, int(part), "") if part.isdigit() else (0, 0, part)
+            for part in re.split(r"[-_\.]", match.group("local").lower())
         )
 
-    return summary
+    return (
+        int(match.group("epoch") or 0),
+        tuple(release),
+        pre,
+        post,
+        dev,
+        local
+    )
 
 
-def get_pkg_version(name: str, ttl_sec: int = 24 * 3600) -> str:
+def _name_version(pkg_info) -> str:
+    """Return `name==version` (`===` if it's no PEP 440 version).
     """
-    Return latest version for `name`, cached
-    in ~/.venvipy/pypi_index.sqlite3.
+    version = normalize_version(pkg_info.pkg_version)
+    if version is None:
+        return f"{pkg_info.pkg_name}==={pkg_info.pkg_version}"
+    return f"{pkg_info.pkg_name}=={version}"
+
+
+def _url_to_path(url) -> str:
+    """Convert a `file:` URL into a local path.
     """
-    if not name:
-        return ""
+    from urllib.parse import unquote, urlsplit
+    from urllib.request import url2pathname
 
-    now = int(time.time())
+    parts = urlsplit(url)
+    netloc = parts.netloc if parts.netloc not in ("", "localhost") else ""
+    if netloc:
+        return url2pathname(f"//{netloc}{unquote(parts.path)}")
+    return url2pathname(unquote(parts.path))
 
-    with sqlite3.connect(PACKAGE_DB_PATH) as con:
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS pkg_meta (
-                name TEXT PRIMARY KEY,
-                version TEXT NOT NULL,
-                fetched_at INTEGER NOT NULL
-            )
-        """)
 
-        row = con.execute(
-            "SELECT version, fetched_at FROM pkg_meta WHERE name = ?",
-            (name,),
-        ).fetchone()
+def _git_dir(repo_root) -> Optional[Path]:
+    """
+    Return the git dir of a work tree (`.git` or where a `.git` file of
+    a worktree/submodule points to).
+    """
+    dot_git = Path(repo_root) / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        content = dot_git.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    git_dir = Path(content[len("gitdir:"):].strip())
+    if not git_dir.is_absolute():
+        git_dir = Path(repo_root) / git_dir
+    return git_dir
+
+
+def _git_repo_root(location) -> Optional[Path]:
+    """Return the root of the git work tree containing `location`.
+    """
+    path = Path(location)
+    for candidate in (path, *path.parents):
+        if (candidate / ".git").exists():
+            return candidate
+    return None
 
-        if row:
-            cached_version, fetched_at = row
-            if cached_version and (now - int(fetched_at) < ttl_sec):
-                return cached_version
 
-    # fetch fresh
+def _git_remote_url(git_dir) -> Optional[str]:
+    """
+    Return the url of the `origin` remote (or of the first remote) from
+    the git config, or `None` if there is none.
+    """
+    common_dir = git_dir
     try:
-        r = requests.get(PYPI_JSON_URL.format(name=name), timeout=10)
-        if r.status_code == 404:
-            return ""
-        r.raise_for_status()
-        version = (r.json().get("info", {}) or {}).get("version", "") or ""
-    except Exception:
-        # fallback to cached if available
-        if row:
-            return row[0] or ""
-        return ""
+        common_dir = git_dir / (git_dir / "commondir").read_text(
+            encoding="utf-8"
+        ).strip()
+    except (OSError, UnicodeDecodeError):
+        pass
 
-    with sqlite3.connect(PACKAGE_DB_PATH) as con:
-        con.execute(
-            """
-            INSERT INTO pkg_meta(name, version, fetched_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(name) DO UPDATE SET
-                version = excluded.version,
-                fetched_at = excluded.fetched_at
-            """,
-            (name, version, now),
-        )
+    try:
+        with open(common_dir / "config", "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
 
-    return version
+    remotes = {}
+    remote = None
+    for line in lines:
+        line = line.strip()
+        section = re.match(r'^\[\s*remote\s+"([^"]*)"\s*\]', line)
+        if section:
+            remote = section.group(1)
+            continue
+        if line.startswith("["):
+            remote = None
+            continue
 
+        key, sep, value = line.partition("=")
+        if remote is not None and sep and key.strip().lower() == "url":
+            remotes.setdefault(remote, value.strip())
 
-def get_package_infos(pkg: str) -> list[PackageInfo]:
-    """Get package infos from PyPI (pkg_name from DB for now).
+    if "origin" in remotes:
+        return remotes["origin"]
+    return next(iter(remotes.values()), None)
+
+
+def _git_head_commit(git_dir) -> Optional[str]:
+    """Return the commit id of `HEAD` from the git dir.
     """
-    package_info_list: list[PackageInfo] = []
+    common_dir = git_dir
+    try:
+        common_dir = git_dir / (git_dir / "commondir").read_text(
+            encoding="utf-8"
+        ).strip()
+    except (OSError, UnicodeDecodeError):
+        pass
 
-    # e.g. show 15 suggestions; adjust as needed
-    for pkg_name in _get_db_names(pkg, following=15):
-        pkg_version = get_pkg_version(pkg_name)
-        pkg_info_2 = get_pkg_info_2(pkg_name)
-        pkg_summary = get_pkg_summary(pkg_name)
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not head.startswith("ref:"):
+        return head or None
+
+    ref = head[len("ref:"):].strip()
+    for base in (git_dir, common_dir):
+        try:
+            return (base / ref).read_text(encoding="utf-8").strip()
+        except (OSError, UnicodeDecodeError):
+            pass
 
-        pkg_info = PackageInfo(
-            pkg_name,
-            pkg_version,
-            pkg_info_2,
-            pkg_summary
-        )
-        package_info_list.append(pkg_info)
+    try:
+        with open(common_dir / "packed-refs", "r", encoding="utf-8") as f:
+            for line in f:
+                commit, _, name = line.strip().partition(" ")
+                if name == ref:
+                    return commit
+    except (OSError, UnicodeDecodeError):
+        pass
+    return None
 
-    return package_info_list[::-1]
+
+def _git_remote_to_pip_url(url) -> Optional[str]:
+    """
+    Convert a git remote into a URL pip understands (like pip does for
+    local paths and scp-like `user@host:path` remotes).
+    """
+    if re.match(r"\w+://", url):
+        return url
+    if os.path.exists(url):
+        return Path(url).absolute().as_uri()
+    match = _SCP_REMOTE_RE.match(url)
+    if match:
+        return f"ssh://{match.group(1) or ''}{match.group(2)}/{match.group(3)}"
+    return None
 
 
-def get_installed_packages(venv_location, venv_name) -> list:
-    """Get infos about installed packages.
+def _project_root(location, repo_root) -> Optional[str]:
     """
-    platform = get_platform()
-    venv_path = Path(venv_location) / venv_name
-    site_packages_dir = platform.site_packages_path(venv_path)
+    Return the path of the project (with `setup.py` or `pyproject.toml`)
+    relative to the repository root, `None` if it is the root.
+    """
+    path = Path(location)
+    for candidate in (path, *path.parents):
+        if (
+            (candidate / "setup.py").exists()
+            or (candidate / "pyproject.toml").exists()
+        ):
+            break
+        if candidate == Path(repo_root):
+            return None
+    else:
+        return None
 
-    # get list of installed packages
-    package_info_list = []
-    if not site_packages_dir.exists():
-        return package_info_list
-    site_packages = os.listdir(site_packages_dir)
+    if candidate == Path(repo_root):
+        return None
+    return candidate.relative_to(repo_root).as_posix()
 
-    for pkg in site_packages:
-        if ".dist-info" in pkg:
-            meta_file = site_packages_dir / pkg / "METADATA"
 
-            try:
-                with open(meta_file, "r", encoding="utf-8") as f:
-                    meta_data = f.readlines()
-            except FileNotFoundError:
-                logger.debug(f"File '{meta_file}' not found.")
-                continue
+def _editable_requirement(pkg_info, location) -> List[str]:
+    """
+    Return the lines of an editable distribution installed from
+    `location`, the same way `pip freeze` writes them.
+    """
+    location = os.path.normcase(os.path.abspath(location))
+    display = _name_version(pkg_info)
+
+    repo_root = _git_repo_root(location)
+    git_dir = _git_dir(repo_root) if repo_root is not None else None
+    if git_dir is None:
+        return [
+            f"# Editable install with no version control ({display})",
+            f"-e {location}",
+        ]
+
+    remote = _git_remote_url(git_dir)
+    if remote is None:
+        return [
+            f"# Editable Git install with no remote ({display})",
+            f"-e {location}",
+        ]
+
+    url = _git_remote_to_pip_url(remote)
+    if url is None:
+        return [
+            f"# Editable Git install ({display}) with either a deleted "
+            "local remote or invalid URI:",
+            f"# '{remote}'",
+            f"-e {location}",
+        ]
+
+    commit = _git_head_commit(git_dir)
+    if not url.lower().startswith("git:"):
+        url = f"git+{url}"
+    requirement = f"{url}@{commit}#egg={pkg_info.pkg_name.replace('-', '_')}"
+    subdirectory = _project_root(location, repo_root)
+    if subdirectory:
+        requirement += f"&subdirectory={subdirectory}"
+    return [f"-e {requirement}"]
+
+
+def _direct_url_requirement(pkg_info, direct_url) -> Optional[List[str]]:
+    """
+    Return the lines of a distribution installed from a URL, a local
+    directory or as editable (PEP 610 `direct_url.json`), or `None` if
+    it was installed from an index.
+    """
+    try:
+        info = json.loads(direct_url)
+        url = info["url"]
+    except (TypeError, ValueError, KeyError):
+        return None
+
+    if "dir_info" in info and info["dir_info"].get("editable"):
+        return _editable_requirement(pkg_info, _url_to_path(url))
+
+    requirement = f"{pkg_info.pkg_name} @ "
+    fragments = []
+    if "vcs_info" in info:
+        vcs_info = info["vcs_info"]
+        requirement += f"{vcs_info['vcs']}+{url}@{vcs_info['commit_id']}"
+    elif "archive_info" in info:
+        requirement += url
+        if info["archive_info"].get("hash"):
+            fragments.append(info["archive_info"]["hash"])
+    else:
+        requirement += url
+    if info.get("subdirectory"):
+        fragments.append(f"subdirectory={info['subdirectory']}")
+    if fragments:
+        requirement += "#" + "&".join(fragments)
+    return [requirement]
+
 
-            pkg_name = ""
-            pkg_version = ""
-            pkg_info_2 = ""
-            pkg_summary = ""
+def _egg_links(venv_path, probe=True) -> Dict[str, str]:
+    """
+    Return the project locations of legacy editable installs
+    (`<name>.egg-link` files in site-packages) by egg-link name.
+    """
+    egg_links = {}
+    for location in package_locations(venv_path, probe=probe)[:2]:
+        try:
+            with os.scandir(location) as it:
+                names = [
+                    entry.name for entry in it
+                    if entry.name.endswith(".egg-link")
+                ]
+        except OSError:
+            continue
 
-            # search for each str
-            for line in meta_data:
-                if "Name: " in line:
-                    pkg_name = line[5:].strip()
+        for name in names:
+            try:
+                with open(
+                    os.path.join(location, name), "r", encoding="utf-8"
+                ) as f:
+                    egg_links[name[:-len(".egg-link")]] = f.readline().strip()
+            except (OSError, UnicodeDecodeError):
+                continue
+    return egg_links
 
-                if "Version: " in line:
-                    pkg_version = line[8:].strip()
 
-                if "Author: " in line:
-                    pkg_info_2 = line[7:].strip()
+def freeze_requirements(venv_location, venv_name, probe=True) -> List[str]:
+    """
+    Return the installed packages of a venv as pinned requirements,
+    with the same lines as `pip freeze` (editables, direct URLs and
+    VCS checkouts included), from the installed-package snapshots.
+    With `probe=False` the interpreter isn't run (see
+    `get_venv_paths()`).
+    """
+    venv_path = os.path.abspath(os.path.join(venv_location, venv_name))
+    environment = marker_environment(venv_path, probe=probe)
+    skip = set(FREEZE_SKIP)
+    if (_version_tuple(environment.get("python_version", "")) or (0,)) < (3, 12):
+        skip |= FREEZE_SKIP_BEFORE_312
+
+    egg_links = None
+    entries = []
+    for pkg_info, _requires, direct_url in _iter_distributions(
+            venv_path,
+            probe=probe
+        ):
+        if _canonical_name(pkg_info.pkg_name) in skip:
+            continue
 
-                if "Summary: " in line:
-                    pkg_summary = line[8:].strip()
+        lines = None
+        if direct_url is not None:
+            lines = _direct_url_requirement(pkg_info, direct_url)
+        else:
+            if egg_links is None:
+                egg_links = _egg_links(venv_path, probe=probe)
+            for name in (
+                pkg_info.pkg_name,
+                re.sub(r"[^A-Za-z0-9.]+", "-", pkg_info.pkg_name)
+            ):
+                if name in egg_links:
+                    lines = _editable_requirement(pkg_info, egg_links[name])
+                    break
+        if lines is None:
+            lines = [_name_version(pkg_info)]
+        entries.append((pkg_info.pkg_name.lower(), lines))
+
+    entries.sort(key=lambda entry: entry[0])
+    return [line for _name, lines in entries for line in lines]
+
+
+def save_requirements(
+        venv_location,
+        venv_name,
+        save_path,
+        probe=True
+    ) -> None:
+    """
+    Write the frozen requirements of a venv to `save_path` (see
+    `freeze_requirements()` for `probe`). Raises `OSError`.
+    """
+    lines = freeze_requirements(venv_location, venv_name, probe=probe)
+    with open(save_path, "w", encoding="utf-8") as f:
+        f.write("".join(f"{line}\n" for line in lines))
 
-            if pkg_name:
-                pkg_info = PackageInfo(
-                    pkg_name,
-                    pkg_version,
-                    pkg_info_2,
-                    pkg_summary
-                )
-                package_info_list.append(pkg_info)
 
-    return package_info_list[::-1]
 
+#]===========================================================================[#
+#] CONSOLE LOGS [#===========================================================[#
+#]===========================================================================[#
 
+def new_console_log() -> Path:
+    """
+    Return the path of a new console transcript in `CONSOLE_LOG_DIR`.
+    Only the last `CONSOLE_LOG_LIMIT` transcripts are kept.
+    Raises `OSError` if the directory can't be created.
+    """
+    CONSOLE_LOG_DIR.mkdir(parents=True, exist_ok=True)
+    logs = sorted(CONSOLE_LOG_DIR.glob("console-*.log"))
+    for old_log in logs[:max(len(logs) - CONSOLE_LOG_LIMIT + 1, 0)]:
+        try:
+            old_log.unlink()
+        except OSError:
+            pass
 
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return CONSOLE_LOG_DIR / f"console-{stamp}-{time.time_ns() % 10**9:09d}.log"
 
 
 
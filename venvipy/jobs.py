@@ -0,0 +1,622 @@
+#    VenviPy - A Virtual Environment Manager for Python.
+#    Copyright (C) 2021 - Youssef Serestou - sinusphi.sq@gmail.com
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License or any
+#    later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of the GNU General Public License version 3 named LICENSE is
+#    in the root directory of VenviPy.
+#    If not, see <https://www.gnu.org/licenses/licenses.en.html#GPL>.
+
+# -*- coding: utf-8 -*-
+"""
+This module runs and keeps track of jobs: processes, Python callables
+and work done elsewhere (e.g. by `PipManager` or a worker thread) that
+is registered with `JobManager.track()`.
+
+Jobs have a priority, interactive jobs (started by the user) run before
+background jobs, and background threads call `yield_to_interactive()`
+to wait while interactive jobs are running. Finished jobs are kept in
+a history file.
+"""
+import os
+import json
+import time
+import shlex
+import codecs
+import logging
+import itertools
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from PyQt6.QtCore import (
+    pyqtSignal,
+    pyqtSlot,
+    QObject,
+    QProcess,
+    QTimer,
+    QCoreApplication
+)
+
+import get_data
+
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "Queued"
+JOB_RUNNING = "Running"
+JOB_DONE = "Done"
+JOB_FAILED = "Failed"
+JOB_CANCELLED = "Cancelled"
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_LABELS = {
+    PRIORITY_INTERACTIVE: "Interactive",
+    PRIORITY_BACKGROUND: "Background",
+}
+
+MAX_JOBS = min(8, (os.cpu_count() or 1) * 2)
+HISTORY_LIMIT = 500
+HISTORY_OUTPUT_TAIL = 4000  # characters
+HISTORY_SAVE_DELAY = 1000  # ms
+YIELD_LIMIT = 30  # seconds background threads wait at most
+
+_job_ids = itertools.count(1)
+
+# set while no interactive job is queued or running
+_interactive_idle = threading.Event()
+_interactive_idle.set()
+# when the interactive jobs started (`time.monotonic()`)
+_interactive_since = 0.0
+
+
+def yield_to_interactive(cancelled=None, poll=0.1, limit=YIELD_LIMIT):
+    """
+    Block the calling (background) thread while interactive jobs are
+    queued or running. Returns early once `cancelled()` is true, and
+    doesn't wait anymore once interactive jobs ran for `limit` seconds
+    without a break, so a job that is never completed can't stop the
+    background work. Never call this from the GUI thread.
+    """
+    while not _interactive_idle.wait(poll):
+        if cancelled is not None and cancelled():
+            return
+        if time.monotonic() - _interactive_since >= limit:
+            return
+
+
+
+#]===========================================================================[#
+#] JOBS [#===================================================================[#
+#]===========================================================================[#
+
+@dataclass(eq=False)
+class Job:
+    """
+    A process (`program` with `args`) or a callable (`func`) to run,
+    or work done elsewhere that is tracked. The output of a process is
+    collected in `output`, a callable's return value is added to it as
+    text. Tracked jobs can pass `cancel_callback` and `kill_callback`.
+    """
+    title: str
+    venv: str = ""
+    program: str = ""
+    args: List[str] = field(default_factory=list)
+    working_dir: str = ""
+    func: Optional[Callable[[], Any]] = None
+    priority: int = PRIORITY_INTERACTIVE
+    persist: bool = True
+    cancel_callback: Optional[Callable[[], Any]] = None
+    kill_callback: Optional[Callable[[], Any]] = None
+    id: int = field(default_factory=lambda: next(_job_ids))
+    state: str = JOB_QUEUED
+    exit_code: Optional[int] = None
+    output: List[str] = field(default_factory=list)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    command_line: str = ""
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds the job ran (so far), `None` if it never started.
+        """
+        if self.started_at is None:
+            return None
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+
+    @property
+    def active(self) -> bool:
+        return self.state in (JOB_QUEUED, JOB_RUNNING)
+
+
+    @property
+    def command(self) -> str:
+        """The command line of a process job.
+        """
+        if self.command_line or not self.program:
+            return self.command_line
+        return " ".join(shlex.quote(arg) for arg in [self.program, *self.args])
+
+
+    @property
+    def can_cancel(self) -> bool:
+        """Whether the job is queued or can be stopped while running.
+        """
+        if self.state == JOB_QUEUED:
+            return True
+        if self.state != JOB_RUNNING:
+            return False
+        return bool(self.program) or self.cancel_callback is not None
+
+
+    def to_record(self) -> Dict[str, Any]:
+        """Return the job as a dict for the history file.
+        """
+        return {
+            "title": self.title,
+            "venv": self.venv,
+            "command": self.command,
+            "priority": self.priority,
+            "state": self.state,
+            "exit_code": self.exit_code,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "output": "".join(self.output)[-HISTORY_OUTPUT_TAIL:],
+        }
+
+
+    @classmethod
+    def from_record(cls, record) -> "Job":
+        """Return a finished job from a history record.
+        """
+        return cls(
+            title=str(record.get("title", "")),
+            venv=str(record.get("venv", "")),
+            command_line=str(record.get("command", "")),
+            priority=int(record.get("priority", PRIORITY_INTERACTIVE)),
+            state=str(record.get("state", JOB_DONE)),
+            exit_code=record.get("exit_code"),
+            started_at=record.get("started_at"),
+            finished_at=record.get("finished_at"),
+            output=[str(record.get("output", ""))]
+        )
+
+
+
+#]===========================================================================[#
+#] SCHEDULER [#==============================================================[#
+#]===========================================================================[#
+
+class JobScheduler(QObject):
+    """
+    Run queued jobs by priority, then in submission order, at most
+    `max_jobs` at once. Processes are run with `QProcess`, callables in
+    a thread pool. Tracked jobs run elsewhere and don't take a slot.
+    `track()` and `complete()` can be called from any thread.
+    """
+    job_added = pyqtSignal(object)
+    job_started = pyqtSignal(object)
+    job_output = pyqtSignal(object, str)
+    job_finished = pyqtSignal(object)
+    all_finished = pyqtSignal()
+
+    _call_done = pyqtSignal(object, object, object)
+    _track_requested = pyqtSignal(object)
+    _complete_requested = pyqtSignal(object, object, object)
+
+    def __init__(self, max_jobs=MAX_JOBS, parent=None):
+        super().__init__(parent)
+
+        self.max_jobs = max(1, max_jobs)
+        self.jobs = []
+        self._queue = []
+        self._running = {}
+        self._tracked = {}
+        self._pool = None
+        self._call_done.connect(self.on_call_done)
+        self._track_requested.connect(self.on_track_requested)
+        self._complete_requested.connect(self.on_complete_requested)
+
+
+    def submit(self, job):
+        """Queue a job and start it if there's a free slot.
+        """
+        self.jobs.append(job)
+        self._queue.append(job)
+        self.job_added.emit(job)
+        self._start_jobs()
+        self._update_interactive()
+        return job
+
+
+    def track(self, job, owner=None):
+        """
+        Register a job that is already running elsewhere. If `owner`
+        (a `QObject` running the job) is destroyed before completing
+        it, the job is completed as cancelled.
+        """
+        self._track_requested.emit(job)
+        if owner is not None:
+            owner.destroyed.connect(
+                lambda: self.complete(job, None, JOB_CANCELLED)
+            )
+        return job
+
+
+    def complete(self, job, exit_code=None, state=None):
+        """
+        Record the end of a tracked job. Without `state` it's done for
+        exit code `0` (or `None`) and failed otherwise, unless it was
+        cancelled.
+        """
+        self._complete_requested.emit(job, exit_code, state)
+
+
+    def set_max_jobs(self, max_jobs):
+        """Change how many jobs can run at the same time.
+        """
+        self.max_jobs = max(1, max_jobs)
+        self._start_jobs()
+
+
+    def cancel(self, job):
+        """
+        Cancel a queued job, or ask a running one to stop (terminate
+        its process or call its `cancel_callback`).
+        """
+        if job in self._queue:
+            self._queue.remove(job)
+            self._finish(job, JOB_CANCELLED, None)
+        elif job.id in self._running:
+            job.state = JOB_CANCELLED
+            process = self._running[job.id]
+            if process is not None:
+                process.terminate()
+        elif job.id in self._tracked and job.cancel_callback is not None:
+            job.state = JOB_CANCELLED
+            job.cancel_callback()
+
+
+    def kill(self, job):
+        """Stop a running job right away.
+        """
+        if job.id in self._running:
+            job.state = JOB_CANCELLED
+            process = self._running[job.id]
+            if process is not None:
+                process.kill()
+        elif job.id in self._tracked:
+            callback = job.kill_callback or job.cancel_callback
+            if callback is not None:
+                job.state = JOB_CANCELLED
+                callback()
+        else:
+            self.cancel(job)
+
+
+    def cancel_all(self, jobs=None):
+        """Cancel all (or the given) queued and running jobs.
+        """
+        if jobs is None:
+            jobs = list(self.jobs)
+        jobs = [job for job in jobs if job.active]
+
+        # dequeue first, so no job starts while cancelling
+        queued = [job for job in jobs if job in self._queue]
+        self._queue = [job for job in self._queue if job not in queued]
+        for job in queued:
+            self._finish(job, JOB_CANCELLED, None)
+        for job in jobs:
+            if job.id in self._running or job.id in self._tracked:
+                self.cancel(job)
+
+
+    def shutdown(self):
+        """Cancel everything and stop the thread pool.
+        """
+        self.cancel_all()
+        for process in self._running.values():
+            if process is not None:
+                process.waitForFinished(1000)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._queue or self._running)
+
+
+    def _update_interactive(self):
+        """Let background threads know whether to wait.
+        """
+        interactive = any(
+            job.priority == PRIORITY_INTERACTIVE
+            for job in itertools.chain(
+                self._queue,
+                (job for job in self.jobs if job.id in self._running),
+                self._tracked.values()
+            )
+        )
+        global _interactive_since
+        if interactive:
+            if _interactive_idle.is_set():
+                _interactive_since = time.monotonic()
+            _interactive_idle.clear()
+        else:
+            _interactive_idle.set()
+
+
+    def _start_jobs(self):
+        """Start queued jobs while there are free slots.
+        """
+        while self._queue and len(self._running) < self.max_jobs:
+            job = min(self._queue, key=lambda job: (job.priority, job.id))
+            self._queue.remove(job)
+            job.state = JOB_RUNNING
+            job.started_at = time.time()
+            if job.func is not None:
+                self._running[job.id] = None
+                self._start_call(job)
+            else:
+                self._running[job.id] = self._start_process(job)
+            self.job_started.emit(job)
+
+
+    def _start_process(self, job):
+        """Start the process of a job.
+        """
+        process = QProcess(self)
+        process.setProcessChannelMode(
+            QProcess.ProcessChannelMode.MergedChannels
+        )
+        if job.working_dir:
+            process.setWorkingDirectory(job.working_dir)
+
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        process.readyReadStandardOutput.connect(
+            lambda: self._on_output(
+                job, decoder.decode(process.readAllStandardOutput().data())
+            )
+        )
+        process.finished.connect(
+            lambda code, status: self._on_process_finished(
+                job, process, code, status
+            )
+        )
+        process.errorOccurred.connect(
+            lambda error: self._on_process_error(job, process, error)
+        )
+        process.start(job.program, job.args)
+        return process
+
+
+    def _start_call(self, job):
+        """Run the callable of a job in the thread pool.
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=MAX_JOBS, thread_name_prefix="venvipy-job"
+            )
+
+        def run():
+            try:
+                result = job.func()
+            except Exception as e:  # pylint: disable=broad-except
+                self._call_done.emit(job, None, e)
+            else:
+                self._call_done.emit(job, result, None)
+
+        self._pool.submit(run)
+
+
+    def _on_output(self, job, text):
+        if text:
+            job.output.append(text)
+            self.job_output.emit(job, text)
+
+
+    def _on_process_finished(self, job, process, code, status):
+        if self._running.pop(job.id, None) is None:
+            return
+        process.deleteLater()
+        if job.state == JOB_CANCELLED:
+            state = JOB_CANCELLED
+        elif status == QProcess.ExitStatus.NormalExit and code == 0:
+            state = JOB_DONE
+        else:
+            state = JOB_FAILED
+        self._finish(job, state, code)
+
+
+    def _on_process_error(self, job, process, error):
+        if error != QProcess.ProcessError.FailedToStart:
+            return
+        if self._running.pop(job.id, None) is None:
+            return
+        process.deleteLater()
+        self._on_output(job, f"Could not start {job.program}\n")
+        self._finish(job, JOB_FAILED, None)
+
+
+    @pyqtSlot(object, object, object)
+    def on_call_done(self, job, result, error):
+        """Record the result of a callable job.
+        """
+        if job.id not in self._running:
+            return
+        del self._running[job.id]
+        if job.state == JOB_CANCELLED:
+            self._finish(job, JOB_CANCELLED, None)
+        elif error is not None:
+            self._on_output(job, f"{error}\n")
+            self._finish(job, JOB_FAILED, 1)
+        else:
+            if result is not None:
+                self._on_output(job, f"{result}\n")
+            self._finish(job, JOB_DONE, 0)
+
+
+    @pyqtSlot(object)
+    def on_track_requested(self, job):
+        """Register a tracked job as running.
+        """
+        job.state = JOB_RUNNING
+        job.started_at = time.time()
+        self.jobs.append(job)
+        self._tracked[job.id] = job
+        self.job_added.emit(job)
+        self.job_started.emit(job)
+        self._update_interactive()
+
+
+    @pyqtSlot(object, object, object)
+    def on_complete_requested(self, job, exit_code, state):
+        """Record the end of a tracked job.
+        """
+        if self._tracked.pop(job.id, None) is None:
+            return
+        if job.state == JOB_CANCELLED:
+            state = JOB_CANCELLED
+        elif state is None:
+            state = JOB_DONE if exit_code in (0, None) else JOB_FAILED
+        self._finish(job, state, exit_code)
+
+
+    def _finish(self, job, state, exit_code):
+        """Record the end of a job and start the next ones.
+        """
+        job.state = state
+        job.exit_code = exit_code
+        job.finished_at = time.time()
+        if job.started_at is None:
+            job.started_at = job.finished_at
+        logger.debug(f"Job '{job.title}' {state.lower()} ({exit_code})")
+        self.job_finished.emit(job)
+
+        self._start_jobs()
+        self._update_interactive()
+        if not self.busy:
+            self.all_finished.emit()
+
+
+
+#]===========================================================================[#
+#] JOB MANAGER [#============================================================[#
+#]===========================================================================[#
+
+class JobManager(JobScheduler):
+    """
+    The scheduler used for all jobs of the application. It keeps the
+    last `HISTORY_LIMIT` finished jobs in `get_data.JOB_HISTORY`.
+    """
+    history_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(MAX_JOBS, parent)
+
+        self.history = load_job_history()
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(HISTORY_SAVE_DELAY)
+        self._save_timer.timeout.connect(self.save_history)
+        self.job_finished.connect(self.on_job_finished)
+
+
+    @pyqtSlot(object)
+    def on_job_finished(self, job):
+        """Move a finished job to the history.
+        """
+        if job in self.jobs:
+            self.jobs.remove(job)
+        if not job.persist:
+            return
+        self.history.append(job)
+        del self.history[:-HISTORY_LIMIT]
+        self._save_timer.start()
+
+
+    def all_jobs(self) -> List[Job]:
+        """Return the finished jobs in the history and the current ones.
+        """
+        return self.history + self.jobs
+
+
+    def clear_history(self):
+        """Forget all finished jobs.
+        """
+        self.history = []
+        self.save_history()
+        self.history_changed.emit()
+
+
+    @pyqtSlot()
+    def save_history(self):
+        """Write the history file.
+        """
+        self._save_timer.stop()
+        save_job_history(self.history)
+
+
+    def shutdown(self):
+        super().shutdown()
+        self.save_history()
+
+
+def load_job_history() -> List[Job]:
+    """Return the finished jobs saved in `get_data.JOB_HISTORY`.
+    """
+    try:
+        with open(get_data.JOB_HISTORY, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        return [Job.from_record(record) for record in records][-HISTORY_LIMIT:]
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.debug(f"Failed to load job history: {e}")
+        return []
+
+
+def save_job_history(jobs) -> None:
+    """Write the last `HISTORY_LIMIT` finished jobs to the history file.
+    """
+    get_data.ensure_confdir()
+    content = json.dumps([job.to_record() for job in jobs[-HISTORY_LIMIT:]])
+    tmp_file = f"{get_data.JOB_HISTORY}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_file, get_data.JOB_HISTORY)
+    except OSError as e:
+        logger.warning(f"Failed to save job history: {e}")
+
+
+_job_manager = None
+
+
+def job_manager() -> JobManager:
+    """Return the `JobManager` of the application.
+    """
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(QCoreApplication.instance())
+    return _job_manager
+
+
+def shutdown_jobs():
+    """Stop all jobs and save the history.
+    """
+    if _job_manager is not None:
+        _job_manager.shutdown()
@@ -19,16 +19,686 @@
 """
 This module manages all pip processes.
 """
+import os
+import re
+import json
+import time
+import codecs
 import shlex
+import shutil
 import logging
+import itertools
 from pathlib import Path
+from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Optional
 
-from PyQt6.QtCore import pyqtSignal, pyqtSlot, QObject, QProcess
+from PyQt6.QtCore import (
+    pyqtSignal,
+    pyqtSlot,
+    QObject,
+    QProcess,
+    QTimer,
+    QCoreApplication
+)
 
+import get_data
 from platforms import get_platform
+import wheelhouse
+from jobs import Job, JOB_FAILED, job_manager
 
 logger = logging.getLogger(__name__)
 
+# set VENVIPY_PIP_HELPER=0 to start a new pip process for every command
+PIP_HELPER_ENABLED = os.environ.get("VENVIPY_PIP_HELPER", "1") != "0"
+PIP_HELPER_SCRIPT = Path(__file__).resolve().with_name("pip_helper.py")
+PIP_HELPER_COMMANDS = (
+    "list", "freeze", "show", "install", "uninstall", "wheel"
+)
+PIP_HELPER_IDLE_TIMEOUT = 300_000  # ms
+PIP_HELPER_LIMIT = 4
+PIP_HELPER_START_ATTEMPTS = 2
+PIP_RAW_PROGRESS_VERSION = (24, 1)  # first pip with `--progress-bar raw`
+
+BACKEND_PIP = "pip"
+BACKEND_UV = "uv"
+# operations that can run with uv, if it's on PATH and enabled with
+# VENVIPY_UV=1 (all of them) or a comma separated list of them; uv runs
+# bypass the pip helper and don't fill the wheelhouse, so pip is the
+# default
+UV_OPERATIONS = ("install", "uninstall", "freeze", "list", "venv")
+# pip options uv doesn't know, with the number of values they take
+UV_DROPPED_OPTIONS = {"--progress-bar": 1, "--no-cache-dir": 0}
+UV_UNSUPPORTED_OPTIONS = ("--user", "--upgrade-strategy", "--root")
+
+
+
+#]===========================================================================[#
+#] PIP PROGRESS [#===========================================================[#
+#]===========================================================================[#
+
+_SIZE_RE = re.compile(r"\((\d+(?:\.\d+)?)\s*([kMGT]?B)\)\s*$")
+_RAW_PROGRESS_RE = re.compile(r"^Progress (\d+) of (\d+)\s*$")
+_NAME_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+_SIZE_UNITS = {"B": 1, "kB": 10**3, "MB": 10**6, "GB": 10**9, "TB": 10**12}
+
+PHASE_RESOLVING = "Resolving"
+PHASE_DOWNLOADING = "Downloading"
+PHASE_BUILDING = "Building"
+PHASE_INSTALLING = "Installing"
+PHASE_DONE = "Done"
+PHASE_FAILED = "Failed"
+
+
+@dataclass(frozen=True)
+class PipProgress:
+    """
+    Snapshot of a running pip command. Sizes are in bytes, `0` if
+    unknown. `fraction` is `None` while the overall progress can't be
+    told, `eta` is `None` if there's no download running.
+    """
+    phase: str
+    package: str
+    package_done: int
+    package_total: int
+    done_bytes: int
+    total_bytes: int
+    collected: int
+    installed: int
+    to_install: int
+    throughput: float
+    eta: Optional[float]
+    fraction: Optional[float]
+
+
+class PipProgressParser:
+    """
+    Track the progress of `pip install` from its output: resolving and
+    collecting, downloading (with byte counts from the `Progress x of y`
+    lines of `--progress-bar raw`, or from the sizes pip prints),
+    building and installing. Every line is handled in constant time.
+    """
+    DOWNLOAD_SHARE = 0.9  # of the overall progress
+    RATE_INTERVAL = 0.5  # seconds
+    RATE_SMOOTHING = 0.3
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self.phase = PHASE_RESOLVING
+        self.package = ""
+        self.package_done = 0
+        self.package_total = 0
+        self.done_bytes = 0
+        self.total_bytes = 0
+        self.collected = 0
+        self.installed = 0
+        self.to_install = 0
+        self.throughput = 0.0
+        self.changed = False
+
+        self._downloading = False
+        self._fraction = None
+        self._rate_time = clock()
+        self._rate_bytes = 0
+
+
+    def feed_line(self, line):
+        """
+        Update the progress from one line of pip output. Return `True`
+        if the line only reports download progress and should be hidden.
+        """
+        text = line.strip()
+        if not text:
+            return False
+
+        if text.startswith("Progress "):
+            match = _RAW_PROGRESS_RE.match(text)
+            if match is not None:
+                self._on_raw_progress(int(match[1]), int(match[2]))
+                return True
+
+        if text.startswith("Collecting "):
+            self._finish_download()
+            self.phase = PHASE_RESOLVING
+            self.package = self._name(text[len("Collecting "):])
+            self.collected += 1
+        elif text.startswith(("Downloading ", "Using cached ", "Processing ")):
+            self._finish_download()
+            self._start_download(text)
+        elif text.startswith("Requirement already satisfied: "):
+            self.collected += 1
+        elif text.startswith(("Building wheel for ", "Preparing metadata ")):
+            self._finish_download()
+            self.phase = PHASE_BUILDING
+            if text.startswith("Building wheel for "):
+                self.package = self._name(text[len("Building wheel for "):])
+        elif text.startswith("Installing collected packages: "):
+            self._finish_download()
+            self.phase = PHASE_INSTALLING
+            self.package = ""
+            self.to_install = text.count(",") + 1
+        elif text.startswith("Attempting uninstall: "):
+            self.package = self._name(text[len("Attempting uninstall: "):])
+        elif text.startswith("Successfully installed "):
+            self._finish_download()
+            self.phase = PHASE_DONE
+            self.package = ""
+            self.installed = text.count(" ") - 1
+            self.to_install = max(self.to_install, self.installed)
+        elif text.startswith("ERROR: "):
+            self._finish_download()
+            self.phase = PHASE_FAILED
+        else:
+            return False
+
+        self.changed = True
+        return False
+
+
+    @staticmethod
+    def _name(text):
+        match = _NAME_RE.match(text)
+        return match[0] if match is not None else text
+
+
+    def _start_download(self, text):
+        """Handle the start of a download or of a local/cached file.
+        """
+        prefix, _, target = text.partition(" ")
+        if prefix == "Using":
+            target = target[len("cached "):]
+        match = _SIZE_RE.search(target)
+        size = 0
+        if match is not None:
+            size = int(float(match[1]) * _SIZE_UNITS[match[2]])
+            target = target[:match.start()].rstrip()
+
+        if self.phase in (PHASE_RESOLVING, PHASE_DOWNLOADING):
+            self.phase = PHASE_DOWNLOADING
+        self.package = target.rsplit("/", 1)[-1].split(" ", 1)[0]
+        self.package_total = size
+        self.total_bytes += size
+        if prefix == "Downloading":
+            self.package_done = 0
+            self._downloading = True
+        else:
+            # nothing to download
+            self.package_done = size
+            self.done_bytes += size
+            self._rate_bytes += size
+
+
+    def _on_raw_progress(self, done, total):
+        """Handle a `Progress x of y` line of the current download.
+        """
+        if not self._downloading:
+            return
+        if total and total != self.package_total:
+            self.total_bytes += total - self.package_total
+            self.package_total = total
+        done = min(done, self.package_total) if self.package_total else done
+        self.done_bytes += done - self.package_done
+        self.package_done = done
+        self._update_rate()
+        self.changed = True
+
+
+    def _finish_download(self):
+        """Count the rest of the current download as done.
+        """
+        if not self._downloading:
+            return
+        self._downloading = False
+        if self.package_total > self.package_done:
+            self.done_bytes += self.package_total - self.package_done
+            self.package_done = self.package_total
+        self._update_rate()
+
+
+    def _update_rate(self):
+        """Update the smoothed download throughput.
+        """
+        now = self._clock()
+        elapsed = now - self._rate_time
+        if elapsed < self.RATE_INTERVAL:
+            return
+
+        rate = (self.done_bytes - self._rate_bytes) / elapsed
+        if self.throughput:
+            rate = (
+                self.RATE_SMOOTHING * rate
+                + (1 - self.RATE_SMOOTHING) * self.throughput
+            )
+        self.throughput = rate
+        self._rate_time = now
+        self._rate_bytes = self.done_bytes
+
+
+    def snapshot(self) -> PipProgress:
+        """Return the current progress and reset `changed`.
+        """
+        self.changed = False
+
+        if self.phase == PHASE_DONE:
+            fraction = 1.0
+        elif self.phase == PHASE_INSTALLING:
+            fraction = self.DOWNLOAD_SHARE
+        elif self.total_bytes:
+            fraction = self.DOWNLOAD_SHARE * self.done_bytes / self.total_bytes
+        else:
+            fraction = None
+        # more packages can be found while resolving, don't go backwards
+        if fraction is not None and self._fraction is not None:
+            fraction = max(fraction, self._fraction)
+        if fraction is not None:
+            self._fraction = fraction
+
+        eta = None
+        if self._downloading and self.throughput > 0:
+            eta = (self.total_bytes - self.done_bytes) / self.throughput
+
+        return PipProgress(
+            phase=self.phase,
+            package=self.package,
+            package_done=self.package_done,
+            package_total=self.package_total,
+            done_bytes=self.done_bytes,
+            total_bytes=self.total_bytes,
+            collected=self.collected,
+            installed=self.installed,
+            to_install=self.to_install,
+            throughput=self.throughput,
+            eta=eta,
+            fraction=fraction
+        )
+
+
+def raw_progress_options(venv_path) -> list:
+    """
+    Return the options making pip report download progress as
+    `Progress x of y` lines, if the pip of the venv supports it.
+    """
+    version = get_data.get_pip_version(venv_path, probe=False)
+    if not version:
+        return []
+    numbers = tuple(int(n) for n in re.findall(r"\d+", version)[:2])
+    if numbers >= PIP_RAW_PROGRESS_VERSION:
+        return ["--progress-bar", "raw"]
+    return []
+
+
+
+#]===========================================================================[#
+#] UV BACKEND [#=============================================================[#
+#]===========================================================================[#
+
+_uv_path = None
+
+
+def find_uv() -> Optional[str]:
+    """Return the path of the `uv` binary on PATH, or `None`.
+    """
+    global _uv_path
+    if _uv_path is None:
+        _uv_path = shutil.which("uv") or ""
+    return _uv_path or None
+
+
+def select_backend(operation) -> str:
+    """
+    Return the backend to run `operation` ("install", "uninstall",
+    "freeze", "list" or "venv") with: uv if it's on PATH and enabled
+    for the operation by `VENVIPY_UV`, pip otherwise (the default).
+    """
+    setting = os.environ.get("VENVIPY_UV", "0").strip().lower()
+    if setting in ("", "0", "no", "off", "false"):
+        return BACKEND_PIP
+    if setting not in ("1", "yes", "on", "true", "auto"):
+        if operation not in {op.strip() for op in setting.split(",")}:
+            return BACKEND_PIP
+    if operation not in UV_OPERATIONS or find_uv() is None:
+        return BACKEND_PIP
+    return BACKEND_UV
+
+
+def uv_pip_args(pip_args, venv_python) -> Optional[list]:
+    """
+    Return the `uv` arguments running `pip_args` for the interpreter
+    `venv_python`, or `None` if uv can't run them.
+    """
+    if not pip_args or pip_args[0] not in UV_OPERATIONS:
+        return None
+
+    uv_args = ["pip", pip_args[0], "--python", str(venv_python)]
+    args = iter(pip_args[1:])
+    for arg in args:
+        option = arg.split("=", 1)[0]
+        if option in UV_UNSUPPORTED_OPTIONS:
+            return None
+        if option in UV_DROPPED_OPTIONS:
+            if "=" not in arg:
+                for _ in range(UV_DROPPED_OPTIONS[option]):
+                    next(args, None)
+            continue
+        uv_args.append(arg)
+    return uv_args
+
+
+
+#]===========================================================================[#
+#] PIP HELPER [#=============================================================[#
+#]===========================================================================[#
+
+class PipHelper(QObject):
+    """
+    Keep a `pip_helper.py` process running for a virtual environment,
+    so pip is imported once and back-to-back commands start instantly.
+
+    Requests are queued and run one after another. If the helper dies
+    while running a request, that request fails and the helper restarts
+    for the queued ones. If it can't start at all, queued requests are
+    reported as `unavailable` so the caller can fall back to running
+    `python -m pip`. After `PIP_HELPER_IDLE_TIMEOUT` ms without requests
+    the helper exits.
+    """
+    started = pyqtSignal(int)
+    output = pyqtSignal(int, str, str)
+    finished = pyqtSignal(int, int)
+    unavailable = pyqtSignal(int)
+
+
+    def __init__(self, venv_python, working_dir, parent=None):
+        super().__init__(parent)
+
+        self.venv_python = str(venv_python)
+        self.working_dir = str(working_dir)
+        self.available = True
+
+        self._ids = itertools.count(1)
+        self._queue = []
+        self._running = None
+        self._process = None
+        self._ready = False
+        self._fork = False
+        self._restarting = False
+        self._buffer = b""
+        self._failed_starts = 0
+        self.venv_stamp = None
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(PIP_HELPER_IDLE_TIMEOUT)
+        self._idle_timer.timeout.connect(self.stop)
+
+
+    @property
+    def busy(self):
+        """Whether requests are running or waiting.
+        """
+        return self._running is not None or bool(self._queue)
+
+
+    def submit(self, args):
+        """
+        Queue the pip command `args` (e.g. `["install", "requests"]`)
+        and return its request id.
+        """
+        request_id = next(self._ids)
+        request = {"id": request_id, "cmd": args[0], "args": args[1:]}
+        self._queue.append(request)
+        self._idle_timer.stop()
+
+        if self._process is None:
+            self._start()
+        elif self._ready:
+            self._send(request)
+        return request_id
+
+
+    def cancel(self, request_id):
+        """Cancel a queued or running request.
+        """
+        queued = [r for r in self._queue if r["id"] == request_id]
+        if request_id != self._running and not queued:
+            return
+
+        if self._ready:
+            self._send({"cmd": "cancel", "id": request_id})
+        if queued:
+            self._queue.remove(queued[0])
+            self.finished.emit(request_id, -1)
+            self._set_idle()
+        elif self._process is not None and not self._fork:
+            # the request runs inside the helper, restart it
+            self._process.kill()
+
+
+    def stop(self):
+        """Let an idle helper exit.
+        """
+        if self._process is not None and not self.busy:
+            self._process.closeWriteChannel()
+
+
+    def shutdown(self):
+        """Stop the helper, also if requests are running.
+        """
+        self._idle_timer.stop()
+        self._queue.clear()
+        if self._process is not None:
+            process = self._process
+            self._process = None
+            process.kill()
+            process.waitForFinished(1000)
+
+
+    def _start(self):
+        """Start the helper process.
+        """
+        self._ready = False
+        self._fork = False
+        self._restarting = False
+        self._buffer = b""
+        self._process = QProcess(self)
+        self._process.setWorkingDirectory(self.working_dir)
+        self._process.readyReadStandardOutput.connect(self.on_ready_read)
+        self._process.readyReadStandardError.connect(self.on_ready_read_stderr)
+        self._process.finished.connect(self.on_process_finished)
+        self._process.errorOccurred.connect(self.on_error_occurred)
+        self._process.start(self.venv_python, [str(PIP_HELPER_SCRIPT)])
+
+
+    def _send(self, message):
+        """Write a JSON line to the helper.
+        """
+        self._process.write((json.dumps(message) + "\n").encode("utf-8"))
+
+
+    def _set_idle(self):
+        """Start the idle timer if there's nothing to do.
+        """
+        if not self.busy:
+            self._idle_timer.start()
+
+
+    @pyqtSlot()
+    def on_ready_read(self):
+        """Handle the events written by the helper.
+        """
+        process = self.sender()
+        if process is not self._process:
+            return
+
+        self._buffer += process.readAllStandardOutput().data()
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            try:
+                event = json.loads(line.decode("utf-8"))
+            except ValueError:
+                logger.debug(f"Invalid pip helper output: {line!r}")
+                continue
+            self.on_event(event)
+
+
+    @pyqtSlot()
+    def on_ready_read_stderr(self):
+        """Log what the helper writes to `stderr` outside of requests.
+        """
+        process = self.sender()
+        message = process.readAllStandardError().data().decode(
+            errors="replace"
+        )
+        logger.debug(f"pip helper: {message.strip()}")
+
+
+    def on_event(self, event):
+        """Handle a single event of the helper.
+        """
+        kind = event.get("event")
+        request_id = event.get("id")
+
+        if kind == "ready":
+            logger.debug(
+                f"pip helper ready (pip {event.get('pip')}, "
+                f"pid {event.get('pid')})"
+            )
+            self._ready = True
+            self._fork = bool(event.get("fork"))
+            self._failed_starts = 0
+            for request in self._queue:
+                self._send(request)
+            self._set_idle()
+
+        elif kind == "error":
+            # pip can't be imported, no point in trying again
+            logger.debug(f"pip helper: {event.get('message')}")
+            self.available = False
+
+        elif kind == "started":
+            self._queue = [r for r in self._queue if r["id"] != request_id]
+            self._running = request_id
+            self.started.emit(request_id)
+
+        elif kind == "output":
+            self.output.emit(
+                request_id, event.get("stream", "stdout"), event.get("text", "")
+            )
+
+        elif kind == "exit":
+            if self._running == request_id:
+                self._running = None
+            if event.get("restart"):
+                # the helper exits, restart it for the queued requests
+                self._restarting = True
+            self.finished.emit(request_id, event.get("code", 1))
+            self._set_idle()
+
+
+    @pyqtSlot(QProcess.ProcessError)
+    def on_error_occurred(self, error):
+        """Handle a helper process that could not be started.
+        """
+        if error == QProcess.ProcessError.FailedToStart:
+            self.on_process_finished(-1, QProcess.ExitStatus.CrashExit)
+
+
+    @pyqtSlot(int, QProcess.ExitStatus)
+    def on_process_finished(self, exit_code, exit_status):
+        """Recover from the helper process exiting.
+        """
+        process = self.sender()
+        if process is not self._process:
+            return
+
+        logger.debug(f"pip helper exited with {exit_code}")
+        self._process = None
+        process.deleteLater()
+
+        if self._running is not None:
+            request_id, self._running = self._running, None
+            self.output.emit(
+                request_id, "stderr", "The pip helper stopped unexpectedly."
+            )
+            self.finished.emit(request_id, -1)
+
+        if not self._ready and not self._restarting:
+            self._failed_starts += 1
+            if self._failed_starts >= PIP_HELPER_START_ATTEMPTS:
+                self.available = False
+
+        self._ready = False
+        self._restarting = False
+        if not self._queue:
+            return
+        if self.available:
+            self._start()
+            return
+
+        queue, self._queue = self._queue, []
+        for request in queue:
+            self.unavailable.emit(request["id"])
+
+
+_pip_helpers = OrderedDict()
+
+
+def _venv_stamp(venv_python):
+    """
+    Return a stamp of the venv of an interpreter, it changes when the
+    venv is removed and created again.
+    """
+    try:
+        st = os.stat(Path(venv_python).parent.parent / "pyvenv.cfg")
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def get_pip_helper(venv_python, working_dir):
+    """
+    Return the `PipHelper` of an interpreter, or `None` if the helper
+    is disabled or doesn't work with this virtual environment.
+    """
+    if not PIP_HELPER_ENABLED or not PIP_HELPER_SCRIPT.is_file():
+        return None
+
+    key = str(venv_python)
+    stamp = _venv_stamp(venv_python)
+    helper = _pip_helpers.get(key)
+    if helper is not None and helper.venv_stamp != stamp and not helper.busy:
+        # the venv was created again, the helper runs the old one
+        helper.shutdown()
+        helper.deleteLater()
+        del _pip_helpers[key]
+        helper = None
+    if helper is not None:
+        _pip_helpers.move_to_end(key)
+        return helper if helper.available else None
+
+    # stop the least recently used helpers that are idle
+    for old_key, old_helper in list(_pip_helpers.items()):
+        if len(_pip_helpers) < PIP_HELPER_LIMIT:
+            break
+        if not old_helper.busy:
+            old_helper.shutdown()
+            old_helper.deleteLater()
+            del _pip_helpers[old_key]
+
+    helper = PipHelper(
+        venv_python, working_dir, parent=QCoreApplication.instance()
+    )
+    helper.venv_stamp = stamp
+    _pip_helpers[key] = helper
+    return helper
+
+
+def shutdown_pip_helpers():
+    """Stop all pip helper processes.
+    """
+    for helper in _pip_helpers.values():
+        helper.shutdown()
+    _pip_helpers.clear()
+
 
 
 #]===========================================================================[#
@@ -43,6 +713,7 @@ class PipManager(QObject):
     finished = pyqtSignal()
     failed = pyqtSignal()
     text_changed = pyqtSignal(str)
+    progress_changed = pyqtSignal(object)
 
 
     def __init__(self, venv_dir, venv_name, parent=None):
@@ -62,40 +733,273 @@ class PipManager(QObject):
         )
 
         # started
-        self._process.started.connect(self.started)
+        self._process.started.connect(self.on_started)
 
         # updated
         self._process.stateChanged.connect(self.on_state_changed)
 
         # finished
-        self._process.finished.connect(
-            lambda _code, _status: self.finished.emit()
-        )
         self._process.finished.connect(self.on_finished)
+        self._process.errorOccurred.connect(self.on_process_error)
+
+        self.exit_code = None
+        self._job = None
+        self._helper = None
+        self._request = None
+        self._stopping = False
+        self._cancelled = False
+        self._announced = False
+        self._prefetching = False
+        self._using_uv = False
+        self._wheels_used = set()
+        self._venv_python = None
+        self._args = []
+        self._step_args = []
+        self._stdout_decoder = None
+        self._stderr_decoder = None
+        self._progress = PipProgressParser()
+        self._partial_line = ""
 
 
     def run_pip(self, command="", options=None):
         """
         Run pip commands using the virtual environment interpreter.
+        Commands supported by the pip helper are sent to it, others
+        start a new `python -m pip` process. Plain package installs
+        first fetch the wheels into the wheelhouse, then install from
+        there. If uv is selected for the command, it runs `uv pip`
+        instead and falls back to pip if that fails.
         """
         if options is None:
             options = []
 
         venv_path = Path(self._venv_dir) / self._venv_name
         platform = get_platform()
-        venv_python = platform.venv_python_path(venv_path)
+        self._venv_python = str(platform.venv_python_path(venv_path))
+        self._args = shlex.split(command) + options
+        if self._args[:1] == ["install"] and "--progress-bar" not in self._args:
+            self._args[1:1] = raw_progress_options(venv_path)
 
-        if command == "pipdeptree":
-            args = ["-m", "pipdeptree"] + options
+        self._progress = PipProgressParser()
+        self._partial_line = ""
+        self.exit_code = None
+        self._announced = False
+        self._cancelled = False
+        self._wheels_used = set()
+
+        uv_args = None
+        if self._args and select_backend(self._args[0]) == BACKEND_UV:
+            if self._args[0] == "install":
+                uv_args = uv_pip_args(
+                    wheelhouse.online_install_args(self._args),
+                    self._venv_python
+                )
+            else:
+                uv_args = uv_pip_args(self._args, self._venv_python)
+        self._using_uv = uv_args is not None
+
+        backend = BACKEND_UV if self._using_uv else BACKEND_PIP
+        self._job = job_manager().track(Job(
+            title=f"{backend} {self._args[0] if self._args else ''}".strip(),
+            venv=str(venv_path),
+            program=find_uv() if self._using_uv else self._venv_python,
+            args=uv_args if self._using_uv else ["-m", "pip"] + self._args,
+            working_dir=self._venv_dir,
+            cancel_callback=self.process_terminate,
+            kill_callback=self.process_stop
+        ), owner=self)
+
+        if self._using_uv:
+            self.run_step(uv_args)
         else:
-            args = ["-m", "pip"] + shlex.split(command) + options
+            self.start_pip_steps()
+
+
+    def start_pip_steps(self):
+        """Run the current command with pip.
+        """
+        prefetch = wheelhouse.prefetch_args(
+            self._args,
+            get_data.installed_versions(
+                Path(self._venv_dir) / self._venv_name, probe=False
+            )
+        )
+        self._prefetching = prefetch is not None
+        if self._prefetching:
+            self.run_step(prefetch)
+        elif self._args[:1] == ["install"]:
+            self.run_step(wheelhouse.online_install_args(self._args))
+        else:
+            self.run_step(self._args)
+
+
+    def run_step(self, args):
+        """Run one pip (or uv) command of the current run.
+        """
+        self._step_args = args
+
+        helper = None
+        if not self._using_uv and args and args[0] in PIP_HELPER_COMMANDS:
+            helper = get_pip_helper(self._venv_python, self._venv_dir)
+
+        if helper is None:
+            self.start_process()
+            return
+
+        if helper is not self._helper:
+            if self._helper is not None:
+                self._helper.started.disconnect(self.on_helper_started)
+                self._helper.output.disconnect(self.on_helper_output)
+                self._helper.finished.disconnect(self.on_helper_finished)
+                self._helper.unavailable.disconnect(self.on_helper_unavailable)
+            self._helper = helper
+            helper.started.connect(self.on_helper_started)
+            helper.output.connect(self.on_helper_output)
+            helper.finished.connect(self.on_helper_finished)
+            helper.unavailable.connect(self.on_helper_unavailable)
+
+        self._stopping = False
+        self._request = helper.submit(args)
+
+
+    def start_process(self):
+        """Run the current pip command in a new process.
+        """
+        # multi-byte characters can be split between two reads
+        self._stdout_decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._stderr_decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        if self._using_uv:
+            # uv reports everything on stderr, errors by its exit code
+            self._process.setProcessChannelMode(
+                QProcess.ProcessChannelMode.MergedChannels
+            )
+            self._process.start(find_uv(), self._step_args)
+            return
 
-        self._process.start(str(venv_python), args)
+        self._process.setProcessChannelMode(
+            QProcess.ProcessChannelMode.SeparateChannels
+        )
+        self._process.start(self._venv_python, ["-m", "pip"] + self._step_args)
 
 
     def process_stop(self):
         """Stop the process."""
-        self._process.close()
+        self._cancelled = True
+        if self._request is not None:
+            self._stopping = True
+            self._helper.cancel(self._request)
+        else:
+            self._process.close()
+
+
+    def process_terminate(self):
+        """Ask the process to stop, letting pip clean up.
+        """
+        self._cancelled = True
+        if self._request is not None:
+            self._stopping = True
+            self._helper.cancel(self._request)
+        else:
+            self._process.terminate()
+
+
+    def complete_job(self, exit_code, state=None):
+        """Record the end of the current run in the job manager.
+        """
+        if self._job is not None:
+            job_manager().complete(self._job, exit_code, state)
+            self._job = None
+
+
+    def on_step_finished(self, exit_code, state=None):
+        """
+        Run the command with pip if uv failed, and install from the
+        wheelhouse after fetching the wheels (or from the index if that
+        failed). Otherwise the run is complete.
+        """
+        logger.debug(f"Exit code: {exit_code}")
+        self.handle_stdout("", final=True)
+        if self._using_uv:
+            self._using_uv = False
+            if (exit_code != 0 or state is not None) and not self._cancelled:
+                message = "uv failed, running pip instead...\n"
+                logger.warning(message.strip())
+                self.record_output(message)
+                self.text_changed.emit(message)
+                self.start_pip_steps()
+                return
+        elif self._step_args[:1] in (["wheel"], ["install"]):
+            wheelhouse.update_wheelhouse_later(self._wheels_used)
+
+        if self._prefetching and not self._cancelled:
+            self._prefetching = False
+            if exit_code == 0:
+                self.run_step(wheelhouse.offline_install_args(self._args))
+            else:
+                logger.debug("Fetching wheels failed, installing from index")
+                self.run_step(wheelhouse.online_install_args(self._args))
+            return
+
+        logger.debug("Done")
+        self.text_changed.emit("\n\nPress [ESC] to continue...\n")
+        if state is None and not self._cancelled:
+            self.exit_code = exit_code
+        self.complete_job(exit_code, state)
+        self.finished.emit()
+
+
+    def handle_stdout(self, text, final=False):
+        """
+        Send the complete lines of `text` to `update_status()`, after
+        the progress parser saw them. `Progress x of y` lines are only
+        shown as progress.
+        """
+        text = self._partial_line + text
+        if final:
+            lines, self._partial_line = [text], ""
+        else:
+            *lines, self._partial_line = text.split("\n")
+
+        visible = [line for line in lines if not self._progress.feed_line(line)]
+        if self._progress.changed:
+            self.progress_changed.emit(self._progress.snapshot())
+
+        message = "\n".join(visible).strip()
+        if message:
+            logger.debug(message)
+            self._wheels_used.update(wheelhouse.wheel_names(message))
+            self.record_output(message)
+            self.text_changed.emit(message)
+
+
+    def handle_stderr(self, message):
+        """
+        Show `message` written to `stderr`. It stops the run, unless
+        wheels are being fetched (then the exit code decides).
+        """
+        logger.error(message)
+        self.record_output(message)
+        self.text_changed.emit(message)
+        if self._prefetching:
+            return False
+        self.failed.emit()
+        return True
+
+
+    def record_output(self, message):
+        """Keep the output of the current run in its job.
+        """
+        if self._job is not None:
+            self._job.output.append(f"{message}\n")
+
+
+    @pyqtSlot()
+    def on_started(self):
+        """Forward the start of the first command of a run.
+        """
+        if not self._announced:
+            self._announced = True
+            self.started.emit()
 
 
     @pyqtSlot(QProcess.ProcessState)
@@ -106,40 +1010,94 @@ class PipManager(QObject):
             logger.debug("Started")
         elif state == QProcess.ProcessState.Running:
             logger.debug("Running")
-        elif state == QProcess.ProcessState.NotRunning:
-            logger.debug("Done")
-            self.text_changed.emit(
-                "\n\nPress [ESC] to continue...\n"
-            )
 
 
     @pyqtSlot(int, QProcess.ExitStatus)
     def on_finished(self, exitCode, exitStatus):
-        """Show exit code when finished.
+        """Continue or complete the run when the process finished.
         """
-        logger.debug(f"Exit code: {exitCode}")
         self._process.kill()
+        if exitStatus == QProcess.ExitStatus.NormalExit:
+            self.on_step_finished(exitCode)
+        else:
+            self.on_step_finished(exitCode, JOB_FAILED)
+
+
+    @pyqtSlot(QProcess.ProcessError)
+    def on_process_error(self, error):
+        """Complete the run if a pip process could not be started.
+        """
+        if error == QProcess.ProcessError.FailedToStart:
+            logger.error(f"Could not start {self._venv_python}")
+            self._prefetching = False
+            self.on_step_finished(None, JOB_FAILED)
 
 
     @pyqtSlot()
     def on_ready_read_stdout(self):
         """Read from `stdout` and send the output to `update_status()`.
         """
-        message = self._process.readAllStandardOutput().data().decode().strip()
-        logger.debug(message)
-        self.text_changed.emit(message)
+        self.handle_stdout(self._stdout_decoder.decode(
+            self._process.readAllStandardOutput().data()
+        ))
 
 
     @pyqtSlot()
     def on_ready_read_stderr(self):
         """Read from `stderr`, then kill the process.
         """
-        message = self._process.readAllStandardError().data().decode().strip()
-        logger.error(message)
-        self.text_changed.emit(message)
-        self.failed.emit()
-        self._process.kill()
+        message = self._stderr_decoder.decode(
+            self._process.readAllStandardError().data()
+        ).strip()
+        if self.handle_stderr(message):
+            self._process.kill()
+
 
+    @pyqtSlot(int)
+    def on_helper_started(self, request_id):
+        """Forward the start of the current request.
+        """
+        if request_id == self._request:
+            logger.debug("Running")
+            self.on_started()
+
+
+    @pyqtSlot(int, str, str)
+    def on_helper_output(self, request_id, stream, text):
+        """
+        Handle the output of the current request like the output of a
+        pip process, writing to `stderr` stops it.
+        """
+        if request_id != self._request or self._stopping:
+            return
+
+        if stream == "stdout":
+            self.handle_stdout(text)
+            return
+
+        if self.handle_stderr(text.strip()):
+            self._stopping = True
+            self._helper.cancel(request_id)
+
+
+    @pyqtSlot(int, int)
+    def on_helper_finished(self, request_id, exit_code):
+        """Continue or complete the run when the current request finished.
+        """
+        if request_id != self._request:
+            return
+
+        self._request = None
+        self.on_step_finished(exit_code)
+
+
+    @pyqtSlot(int)
+    def on_helper_unavailable(self, request_id):
+        """Fall back to a pip process if the helper can't run.
+        """
+        if request_id == self._request:
+            self._request = None
+            self.start_process()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,369 @@
+#    VenviPy - A Virtual Environment Manager for Python.
+#    Copyright (C) 2021 - Youssef Serestou - sinusphi.sq@gmail.com
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License or any
+#    later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of the GNU General Public License version 3 named LICENSE is
+#    in the root directory of VenviPy.
+#    If not, see <https://www.gnu.org/licenses/licenses.en.html#GPL>.
+
+# -*- coding: utf-8 -*-
+"""
+Long-lived pip helper. This script is run by the interpreter of a
+virtual environment (`python pip_helper.py`), imports pip once and
+then runs pip commands sent as JSON lines on stdin:
+
+    {"id": 1, "cmd": "install", "args": ["--upgrade", "requests"]}
+    {"cmd": "cancel", "id": 1}
+    {"cmd": "exit"}
+
+It answers with JSON lines on stdout:
+
+    {"event": "ready", "pip": "24.0", "pid": 1234}
+    {"event": "started", "id": 1}
+    {"event": "output", "id": 1, "stream": "stdout", "text": "..."}
+    {"event": "exit", "id": 1, "code": 0, "restart": false}
+
+Where `os.fork()` is available every command runs in a forked child,
+so it starts instantly and can't leave state behind in the helper.
+Otherwise commands run in-process and the helper exits after a command
+that changed the environment (`"restart": true`).
+
+It only uses the standard library and runs on Python 3.6+, since it's
+executed by the interpreter of the venv, not by VenviPy.
+"""
+import io
+import os
+import sys
+import json
+import codecs
+import select
+import signal
+from contextlib import redirect_stdout, redirect_stderr
+
+
+COMMANDS = ("list", "freeze", "show", "install", "uninstall", "wheel")
+MUTATING_COMMANDS = ("install", "uninstall")
+CHUNK_SIZE = 65536
+
+_out_fd = None
+
+# don't let the VenviPy modules next to this script shadow anything
+if sys.path and sys.path[0] == os.path.dirname(os.path.abspath(__file__)):
+    del sys.path[0]
+
+
+
+#]===========================================================================[#
+#] PROTOCOL [#===============================================================[#
+#]===========================================================================[#
+
+def send(message):
+    """Write one JSON line to the original stdout.
+    """
+    data = (json.dumps(message) + "\n").encode("utf-8")
+    while data:
+        written = os.write(_out_fd, data)
+        data = data[written:]
+
+
+class LineReader:
+    """
+    Split the bytes read from a file descriptor into lines without
+    blocking on partial input.
+    """
+    def __init__(self, fd):
+        self.fd = fd
+        self.buffer = b""
+        self.eof = False
+
+
+    def read_lines(self):
+        """Read what is available and return the complete lines.
+        """
+        chunk = os.read(self.fd, CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            lines = [self.buffer] if self.buffer.strip() else []
+            self.buffer = b""
+            return lines
+
+        self.buffer += chunk
+        *lines, self.buffer = self.buffer.split(b"\n")
+        return lines
+
+
+def parse_request(line):
+    """Return the request of a JSON line, or `None` if it's invalid.
+    """
+    try:
+        request = json.loads(line.decode("utf-8"))
+    except ValueError:
+        return None
+    return request if isinstance(request, dict) else None
+
+
+def queue_request(line, pending):
+    """
+    Append the request of `line` to `pending`. A cancel request removes
+    its target from `pending` and its id is returned.
+    """
+    request = parse_request(line)
+    if request is None:
+        return None
+    if request.get("cmd") == "cancel":
+        pending[:] = [r for r in pending if r.get("id") != request.get("id")]
+        return request.get("id")
+    pending.append(request)
+    return None
+
+
+
+#]===========================================================================[#
+#] RUN PIP [#================================================================[#
+#]===========================================================================[#
+
+def pip_state():
+    """
+    Return a stamp of the imported pip package, it changes when pip
+    itself gets upgraded or removed.
+    """
+    import pip
+    try:
+        st = os.stat(os.path.dirname(pip.__file__))
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def run_pip(args):
+    """Run pip with `args` in this process and return the exit code.
+    """
+    from pip._internal.cli.main import main as pip_main
+    try:
+        return pip_main(list(args)) or 0
+    except SystemExit as e:
+        # `sys.exit()` means success, `sys.exit("message")` failure
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+
+
+def run_forked(request, reader_stdin, pending):
+    """
+    Run a request in a forked child and stream its output. Requests
+    arriving meanwhile are appended to `pending`, a cancel request
+    kills the child. Return the exit code.
+    """
+    out_read, out_write = os.pipe()
+    err_read, err_write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # child: pip writes to the pipes and must not read our requests
+        try:
+            os.close(out_read)
+            os.close(err_read)
+            os.close(_out_fd)
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0)
+            os.dup2(out_write, 1)
+            os.dup2(err_write, 2)
+            sys.stdout = io.TextIOWrapper(
+                io.FileIO(1, "w", closefd=False),
+                encoding="utf-8",
+                errors="replace",
+                line_buffering=True
+            )
+            sys.stderr = io.TextIOWrapper(
+                io.FileIO(2, "w", closefd=False),
+                encoding="utf-8",
+                errors="replace",
+                line_buffering=True
+            )
+            code = run_pip(request.get("args", []))
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except BaseException:  # pylint: disable=broad-except
+            code = 1
+        os._exit(code)
+
+    os.close(out_write)
+    os.close(err_write)
+    streams = {out_read: "stdout", err_read: "stderr"}
+    decoders = {
+        fd: codecs.getincrementaldecoder("utf-8")("replace")
+        for fd in streams
+    }
+    watched = [out_read, err_read, reader_stdin.fd]
+    while out_read in watched or err_read in watched:
+        readable, _, _ = select.select(watched, [], [])
+        for fd in readable:
+            if fd == reader_stdin.fd:
+                for line in reader_stdin.read_lines():
+                    if queue_request(line, pending) == request["id"]:
+                        os.kill(pid, signal.SIGTERM)
+                if reader_stdin.eof:
+                    # VenviPy is gone, don't leave pip running
+                    os.kill(pid, signal.SIGTERM)
+                    watched.remove(fd)
+                continue
+
+            chunk = os.read(fd, CHUNK_SIZE)
+            if not chunk:
+                text = decoders[fd].decode(b"", True)
+                watched.remove(fd)
+                os.close(fd)
+            else:
+                text = decoders[fd].decode(chunk)
+            if text:
+                send({
+                    "event": "output",
+                    "id": request["id"],
+                    "stream": streams[fd],
+                    "text": text
+                })
+
+    _, status = os.waitpid(pid, 0)
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+class _StreamWriter(io.TextIOBase):
+    """
+    Text stream that sends everything written as output events.
+    """
+    def __init__(self, request_id, stream):
+        super().__init__()
+        self.request_id = request_id
+        self.stream = stream
+
+
+    def writable(self):
+        return True
+
+
+    def write(self, text):
+        if text:
+            send({
+                "event": "output",
+                "id": self.request_id,
+                "stream": self.stream,
+                "text": text
+            })
+        return len(text)
+
+
+def run_in_process(request):
+    """Run a request in this process and return the exit code.
+    """
+    stdout = _StreamWriter(request["id"], "stdout")
+    stderr = _StreamWriter(request["id"], "stderr")
+    stdin = sys.stdin
+    sys.stdin = io.StringIO()
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                return run_pip(request.get("args", []))
+            except Exception as e:  # pylint: disable=broad-except
+                stderr.write(f"{type(e).__name__}: {e}\n")
+                return 1
+    finally:
+        sys.stdin = stdin
+
+
+
+#]===========================================================================[#
+#] MAIN LOOP [#==============================================================[#
+#]===========================================================================[#
+
+def main():
+    global _out_fd
+
+    # keep the protocol channel for us, stray prints go to stderr
+    _out_fd = os.dup(1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    try:
+        import pip
+        from pip._internal.cli.main import main as _pip_main  # noqa: F401
+        # command modules are imported lazily by pip, do it once here
+        from pip._internal.commands import create_command
+        for command in COMMANDS:
+            create_command(command)
+    except Exception as e:  # pylint: disable=broad-except
+        send({"event": "error", "message": f"Could not import pip: {e}"})
+        return 1
+
+    can_fork = hasattr(os, "fork")
+    send({
+        "event": "ready",
+        "pip": pip.__version__,
+        "pid": os.getpid(),
+        "fork": can_fork
+    })
+
+    state = pip_state()
+    reader = LineReader(sys.stdin.fileno())
+    pending = []
+    while True:
+        if not pending:
+            if reader.eof:
+                return 0
+            if can_fork:
+                select.select([reader.fd], [], [])
+            for line in reader.read_lines():
+                queue_request(line, pending)
+            continue
+
+        request = pending.pop(0)
+        command = request.get("cmd")
+        if command == "exit":
+            return 0
+        if "id" not in request:
+            continue
+
+        send({"event": "started", "id": request["id"]})
+        args = request.get("args", [])
+        if command not in COMMANDS or not isinstance(args, list):
+            send({
+                "event": "output",
+                "id": request["id"],
+                "stream": "stderr",
+                "text": f"Unsupported command: {command!r}\n"
+            })
+            send({"event": "exit", "id": request["id"], "code": 2})
+            continue
+
+        request["args"] = [command] + [str(arg) for arg in args]
+        if can_fork:
+            code = run_forked(request, reader, pending)
+        else:
+            code = run_in_process(request)
+
+        # the imported pip must match the installed one
+        restart = command in MUTATING_COMMANDS and (
+            not can_fork or pip_state() != state
+        )
+        send({
+            "event": "exit",
+            "id": request["id"],
+            "code": code,
+            "restart": restart
+        })
+        if restart:
+            return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,7 +23,6 @@ import os
 import logging
 import webbrowser
 from pathlib import Path
-import subprocess
 
 from PyQt6.QtGui import (
     QIcon,
@@ -33,11 +32,13 @@ from PyQt6.QtGui import (
     QStandardItemModel,
     QAction
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QModelIndex
 from PyQt6.QtWidgets import (
     QFileDialog,
     QDialog,
     QHBoxLayout,
+    QVBoxLayout,
+    QWidget,
     QLabel,
     QLineEdit,
     QApplication,
@@ -54,10 +55,10 @@ from PyQt6.QtWidgets import (
 import venvipy_rc  # pylint: disable=unused-import
 import get_data
 import creator
+import wheelhouse
 from dialogs import ConsoleDialog
 from manage_pip import PipManager
 
-from platforms import get_platform
 from styles.theme import PACKAGE_DIALOG_QSS
 from styles.custom import package_installer_title_text
 
@@ -66,13 +67,16 @@ logger = logging.getLogger(__name__)
 
 
 class ResultsTable(QTableView):
-    """Contains the results from PyPI.
+    """Contains the results from PyPI. Several rows can be selected.
     """
     context_triggered = pyqtSignal()
+    basket_triggered = pyqtSignal()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+
         self.delete_icon = QIcon(
             self.style().standardIcon(QStyle.StandardPixmap.SP_TrashIcon)
         )
@@ -91,6 +95,17 @@ class ResultsTable(QTableView):
             return selected_item
 
 
+    def get_selected_items(self):
+        """
+        Return a `list` of `str` from `name` column of the selected rows,
+        in the order they are shown.
+        """
+        return [
+            index.data()
+            for index in sorted(self.selectionModel().selectedRows())
+        ]
+
+
     def contextMenuEvent(self, event):
 
         idx = self.indexAt(event.pos())
@@ -101,16 +116,33 @@ class ResultsTable(QTableView):
             if not idx.isValid():
                 return
 
-        self.selectRow(idx.row())
+        # keep a multi-row selection if the click is inside of it
+        if not self.selectionModel().isRowSelected(idx.row(), QModelIndex()):
+            self.selectRow(idx.row())
+        selected = len(self.selectionModel().selectedRows())
 
         menu = QMenu(self)
 
-        install_action = QAction(QIcon.fromTheme("software-install"), "&Install module", self)
+        install_action = QAction(
+            QIcon.fromTheme("software-install"),
+            f"&Install {selected} modules" if selected > 1 else "&Install module",
+            self
+        )
         install_action.triggered.connect(self.context_triggered.emit)
         menu.addAction(install_action)
 
+        basket_action = QAction(
+            QIcon.fromTheme("list-add"),
+            "Add to install &basket",
+            self
+        )
+        basket_action.triggered.connect(self.basket_triggered.emit)
+        menu.addAction(basket_action)
+
         open_pypi_action = QAction(self.info_icon, "&Open on PyPI", self)
-        open_pypi_action.triggered.connect(lambda: self.open_on_pypi(event))
+        open_pypi_action.triggered.connect(
+            lambda: self.open_on_pypi(event, idx.siblingAtColumn(0).data())
+        )
         menu.addAction(open_pypi_action)
 
         pos = event.globalPos()
@@ -120,18 +152,278 @@ class ResultsTable(QTableView):
         menu.exec(pos)
 
 
-    def open_on_pypi(self, event):
+    def open_on_pypi(self, event, package=None):
         """
         Open pypi.org and show the project page
         of the selected package.
         """
         url = "https://pypi.org/project"
-        package = self.get_selected_item()
+        if package is None:
+            package = self.get_selected_item()
         webbrowser.open("/".join([url, package]))
 
 
 
-class PackageInstaller(QDialog):
+def format_requirement(name, extras="", version=""):
+    """
+    Return the requirement for `name` with the comma separated `extras`
+    and a `version`. A plain version is pinned (`==`), a version with an
+    operator (e.g. `>=2.0` or `~=1.4`) is used as it is. Raise
+    `ValueError` if the result isn't a valid requirement.
+    """
+    extras = ",".join(
+        extra.strip() for extra in extras.split(",") if extra.strip()
+    )
+    requirement = f"{name}[{extras}]" if extras else name
+
+    version = version.strip()
+    if version:
+        if version[0] in "<>=!~":
+            requirement += version
+        else:
+            requirement += f"=={version}"
+
+    if not wheelhouse.is_plain_requirement(requirement):
+        raise ValueError(f"Invalid requirement: '{requirement}'")
+    return requirement
+
+
+
+class InstallBasket(QWidget):
+    """
+    Collects packages from the results table to install them with one
+    pip run, so pip resolves the dependencies once. Extras and a version
+    can be set for every package by editing its row.
+    """
+    install_requested = pyqtSignal(list)
+
+    COLUMNS = ["Package", "Extras", "Version"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.model = QStandardItemModel(0, len(self.COLUMNS), self)
+        self.model.setHorizontalHeaderLabels(self.COLUMNS)
+        self.model.rowsInserted.connect(self.update_buttons)
+        self.model.rowsRemoved.connect(self.update_buttons)
+
+        basket_label = QLabel("Install &basket:")
+
+        self.basket_table = QTableView(
+            selectionBehavior=QAbstractItemView.SelectionBehavior.SelectRows,
+            selectionMode=QAbstractItemView.SelectionMode.ExtendedSelection,
+            editTriggers=(
+                QAbstractItemView.EditTrigger.DoubleClicked
+                | QAbstractItemView.EditTrigger.EditKeyPressed
+                | QAbstractItemView.EditTrigger.SelectedClicked
+            ),
+            alternatingRowColors=True
+        )
+        self.basket_table.setModel(self.model)
+        self.basket_table.verticalHeader().hide()
+        self.basket_table.horizontalHeader().setStretchLastSection(True)
+        self.basket_table.setColumnWidth(0, 200)
+        self.basket_table.setColumnWidth(1, 150)
+        self.basket_table.setToolTip(
+            "Double-click 'Extras' or 'Version' to edit them, e.g. "
+            "'socks,security' or '2.31.0' (pin) or '>=2.0'"
+        )
+        basket_label.setBuddy(self.basket_table)
+
+        self.remove_button = QPushButton(
+            "&Remove",
+            clicked=self.remove_selected
+        )
+        self.clear_button = QPushButton(
+            "C&lear",
+            clicked=self.clear
+        )
+        self.install_button = QPushButton(
+            "Install &all",
+            clicked=self.request_install
+        )
+
+        button_layout = QVBoxLayout()
+        button_layout.addWidget(self.install_button)
+        button_layout.addWidget(self.remove_button)
+        button_layout.addWidget(self.clear_button)
+        button_layout.addStretch(1)
+
+        table_layout = QHBoxLayout()
+        table_layout.setContentsMargins(0, 0, 0, 0)
+        table_layout.addWidget(self.basket_table)
+        table_layout.addLayout(button_layout)
+
+        v_layout = QVBoxLayout(self)
+        v_layout.setContentsMargins(0, 0, 0, 0)
+        v_layout.addWidget(basket_label)
+        v_layout.addLayout(table_layout)
+
+        self.update_buttons()
+
+
+    def add_packages(self, names):
+        """Add packages that aren't in the basket yet.
+        """
+        in_basket = {name.lower() for name, _, _ in self.packages()}
+        for name in names:
+            if not name or name.lower() in in_basket:
+                continue
+            in_basket.add(name.lower())
+
+            name_item = QStandardItem(name)
+            name_item.setEditable(False)
+            self.model.appendRow(
+                [name_item, QStandardItem(""), QStandardItem("")]
+            )
+
+
+    def packages(self):
+        """Return `(name, extras, version)` tuples of the basket.
+        """
+        return [
+            tuple(
+                self.model.item(row, column).text()
+                for column in range(len(self.COLUMNS))
+            )
+            for row in range(self.model.rowCount())
+        ]
+
+
+    def requirements(self):
+        """Return the requirements of the packages in the basket.
+        """
+        return [format_requirement(*package) for package in self.packages()]
+
+
+    def remove_selected(self):
+        """Remove the selected packages.
+        """
+        rows = self.basket_table.selectionModel().selectedRows()
+        for index in sorted(rows, reverse=True):
+            self.model.removeRow(index.row())
+
+
+    def clear(self):
+        """Remove all packages.
+        """
+        self.model.removeRows(0, self.model.rowCount())
+
+
+    def update_buttons(self):
+        count = self.model.rowCount()
+        self.install_button.setText(
+            f"Install &all ({count})" if count else "Install &all"
+        )
+        buttons = (self.install_button, self.remove_button, self.clear_button)
+        for button in buttons:
+            button.setEnabled(count > 0)
+
+
+    def request_install(self):
+        """Emit the requirements of the basket, if they are valid.
+        """
+        try:
+            requirements = self.requirements()
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid requirement", f"{e}\n")
+            return
+        if requirements:
+            self.install_requested.emit(requirements)
+
+
+
+class InstallPackagesMixin:
+    """
+    Install the selected search results, or the packages of the basket,
+    with one pip run. Used by windows providing `results_table`,
+    `basket`, `console`, `pkg_name_line`, `venv_location` and
+    `venv_name`.
+    """
+    def install_package(self):
+        """
+        Get the names of the selected items from the results table. Then
+        install the selected packages into the virtual environment.
+        """
+        self.install_packages(self.results_table.get_selected_items())
+
+
+    def add_to_basket(self):
+        """Add the selected packages to the install basket.
+        """
+        self.basket.add_packages(self.results_table.get_selected_items())
+
+
+    def install_basket(self, requirements):
+        """
+        Install the packages of the basket. The basket is emptied if
+        pip succeeds, so a failed install keeps the pins and extras.
+        """
+        self.install_packages(requirements, clear_basket=True)
+
+
+    def install_packages(self, requirements, clear_basket=False):
+        """
+        Install `requirements` into the virtual environment with one
+        pip run. Return `True` if the install was started.
+        """
+        if not requirements:
+            return False
+
+        packages = ", ".join(f"'{requirement}'" for requirement in requirements)
+        msg_box_question = QMessageBox.question(
+            self,
+            "Confirm", f"Are you sure you want to install {packages}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel
+        )
+
+        if msg_box_question != QMessageBox.StandardButton.Yes:
+            return False
+
+        if len(requirements) == 1:
+            self.console.setWindowTitle(f"Installing {requirements[0]}")
+        else:
+            self.console.setWindowTitle(
+                f"Installing {len(requirements)} packages"
+            )
+
+        self.manager = PipManager(
+            self.venv_location,
+            self.venv_name
+        )
+        # open the console when recieving signal from manager
+        self.manager.started.connect(self.console.exec)
+        self.manager.text_changed.connect(self.console.update_status)
+        self.manager.progress_changed.connect(self.console.update_progress)
+        if clear_basket:
+            manager = self.manager
+            manager.finished.connect(
+                lambda: self.on_basket_installed(manager)
+            )
+
+        # start installing the selected packages
+        logger.debug(f"Installing {packages}...")
+        self.manager.run_pip(creator.cmds[0], [creator.opts[0], *requirements])
+
+        # clear the content when closing console
+        if self.console.close:
+            self.console.console_window.clear()
+
+            # clear input
+            self.pkg_name_line.clear()
+            self.pkg_name_line.setFocus()
+        return True
+
+
+    def on_basket_installed(self, manager):
+        """Empty the basket if pip installed its packages.
+        """
+        if manager.exit_code == 0:
+            self.basket.clear()
+
+
+
+class PackageInstaller(InstallPackagesMixin, QDialog):
     """
     The package installer dialog.
     """
@@ -170,7 +462,8 @@ class PackageInstaller(QDialog):
             "and install them into your virtual environment. "
         )
         subtitle_label_2 = QLabel(
-            "      Use right-click for more info. "
+            "      Select several packages to install them at once, "
+            "use right-click for more info. "
         )
 
         line_1 = QFrame(self)
@@ -199,7 +492,8 @@ class PackageInstaller(QDialog):
             alternatingRowColors=True,
             sortingEnabled=True,
             doubleClicked=self.install_package,
-            context_triggered=self.install_package  # signal
+            context_triggered=self.install_package,  # signal
+            basket_triggered=self.add_to_basket  # signal
         )
 
         # hide vertical header
@@ -214,6 +508,11 @@ class PackageInstaller(QDialog):
         self.results_table_model = QStandardItemModel(0, 3, self)
         self.results_table.setModel(self.results_table_model)
 
+        # packages to install with one pip run
+        self.basket = InstallBasket(self)
+        self.basket.setMaximumHeight(160)
+        self.basket.install_requested.connect(self.install_basket)
+
         line_2 = QFrame(self)
         line_2.setFixedHeight(8)
         line_2.setFrameShape(QFrame.Shape.HLine)
@@ -228,8 +527,9 @@ class PackageInstaller(QDialog):
         grid_layout.addWidget(self.pkg_name_line, 4, 1, 1, 1)
         grid_layout.addWidget(self.search_button, 4, 2, 1, 1)
         grid_layout.addWidget(self.results_table, 5, 0, 1, 3)
-        grid_layout.addWidget(line_2, 6, 0, 1, 3)
-        grid_layout.addWidget(exit_button, 7, 2, 1, 1)
+        grid_layout.addWidget(self.basket, 6, 0, 1, 3)
+        grid_layout.addWidget(line_2, 7, 0, 1, 3)
+        grid_layout.addWidget(exit_button, 8, 2, 1, 1)
 
         horizontal_layout.addLayout(grid_layout)
 
@@ -269,6 +569,7 @@ class PackageInstaller(QDialog):
 
         # clear input
         self.results_table_model.clear()
+        self.basket.clear()
         self.pkg_name_line.clear()
         self.pkg_name_line.setFocus()
 
@@ -317,46 +618,12 @@ class PackageInstaller(QDialog):
                 self.pkg_name_line.setFocus()
 
 
-    def install_package(self):
-        """
-        Get the name of the selected item from the results table. Then install
-        the selected package into the created virtual environment.
-        """
-        indexes = self.results_table.selectionModel().selectedRows()
-        for index in sorted(indexes):
-            self.pkg = index.data()
-
-        msg_box_question = QMessageBox.question(
-            self,
-            "Confirm", f"Are you sure you want to install '{self.pkg}'?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel
-        )
-
-        if msg_box_question == QMessageBox.StandardButton.Yes:
-            self.console.setWindowTitle(f"Installing {self.pkg}")
-
+    def install_packages(self, requirements, clear_basket=False):
+        started = super().install_packages(requirements, clear_basket)
+        if started:
             # changes (may) have been made to venv
             self.venv_modified += 1
-
-            self.manager = PipManager(
-                self.venv_location,
-                self.venv_name
-            )
-            # open the console when recieving signal from manager
-            self.manager.started.connect(self.console.exec)
-            self.manager.text_changed.connect(self.console.update_status)
-
-            # start installing the selected package
-            logger.debug(f"Installing '{self.pkg}'...")
-            self.manager.run_pip(creator.cmds[0], [creator.opts[0], self.pkg])
-
-            # clear the content when closing console
-            if self.console.close:
-                self.console.console_window.clear()
-
-                # clear input
-                self.pkg_name_line.clear()
-                self.pkg_name_line.setFocus()
+        return started
 
 
     def save_requirements(self):
@@ -399,20 +666,16 @@ class PackageInstaller(QDialog):
             if not save_path:
                 return
 
-            platform = get_platform()
-            venv_python = platform.venv_python_path(venv_dir)
             try:
-                with open(save_path, "w", encoding="utf-8") as f:
-                    subprocess.run([
-                        str(venv_python),
-                        "-m",
-                        "pip",
-                        "freeze"],
-                        stdout=f,
-                        check=False,
-                    )
-            except subprocess.CalledProcessError as e:
+                get_data.save_requirements(
+                    self.venv_location, self.venv_name, save_path, probe=False
+                )
+            except OSError as e:
                 logger.debug(f"Failed to save requirements: {e}")
+                QMessageBox.warning(
+                    self, "Error", f"Could not save requirements:\n{e}"
+                )
+                return
 
             logger.debug(f"Saved '{save_path}'")
 
@@ -21,6 +21,7 @@ This module contains the package manager.
 """
 import os
 import logging
+import itertools
 import webbrowser
 
 from PyQt6.QtGui import (
@@ -30,7 +31,7 @@ from PyQt6.QtGui import (
     QStandardItemModel,
     QAction
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QThread
 from PyQt6.QtWidgets import (
     QDialog,
     QHBoxLayout,
@@ -50,6 +51,7 @@ from PyQt6.QtWidgets import (
 import venvipy_rc  # pylint: disable=unused-import
 import get_data
 from dialogs import ConsoleDialog
+from creator import PackageScanWorker
 from manage_pip import PipManager
 from styles.theme import PACKAGE_DIALOG_QSS
 from styles.custom import (
@@ -158,6 +160,8 @@ class PackageManager(QDialog):
     """
     The package manager dialog.
     """
+    start_package_scan = pyqtSignal(int, str, str)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -173,6 +177,17 @@ class PackageManager(QDialog):
         self._load_active_venv()
         self.console = ConsoleDialog(self)
 
+        # read the installed packages in the background
+        self._scan_tokens = itertools.count(1)
+        self._scan_token = None
+        self.scan_thread = QThread(self)
+        self.package_scanner = PackageScanWorker()
+        self.package_scanner.moveToThread(self.scan_thread)
+        self.start_package_scan.connect(self.package_scanner.scan)
+        self.package_scanner.found.connect(self.on_packages_found)
+        self.package_scanner.finished.connect(self.on_package_scan_finished)
+        self.scan_thread.start()
+
         self.setStyleSheet(PACKAGE_DIALOG_QSS)
 
 
@@ -244,6 +259,7 @@ class PackageManager(QDialog):
         # set table view model
         self.packages_table_model = QStandardItemModel(0, 4, self)
         self.packages_table.setModel(self.packages_table_model)
+        self.packages_table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
 
         line_2 = QFrame(self)
         line_2.setFixedHeight(8)
@@ -306,6 +322,21 @@ class PackageManager(QDialog):
         self.close()
 
 
+    def done(self, result):
+        """Stop reading packages when the dialog is closed.
+        """
+        self.cancel_package_scan()
+        super().done(result)
+
+
+    def shutdown_threads(self):
+        """Stop the background thread before the application quits.
+        """
+        self.cancel_package_scan()
+        self.scan_thread.quit()
+        self.scan_thread.wait()
+
+
     def launch(self):
         """Launches the manager.
         """
@@ -391,21 +422,60 @@ class PackageManager(QDialog):
     def pop_packages_table(self):
         """Fill (refresh) the packages table content.
         """
+        self.cancel_package_scan()
         self.packages_table_model.setRowCount(0)
         venv_path = os.path.join(self.venv_location, self.venv_name)
         if not os.path.isdir(venv_path):
             return
 
-        for info in get_data.get_installed_packages(
+        self._scan_token = next(self._scan_tokens)
+        self.start_package_scan.emit(
+            self._scan_token,
             self.venv_location,
             self.venv_name
-        ):
-            self.packages_table_model.insertRow(0)
-
-            for i, text in enumerate((
-                info.pkg_name,
-                info.pkg_version,
-                info.pkg_info_2,
-                info.pkg_summary
-            )):
-                self.packages_table_model.setItem(0, i, QStandardItem(text))
+        )
+
+
+    def cancel_package_scan(self):
+        """Stop reading the installed packages, if running.
+        """
+        if self._scan_token is not None:
+            self.package_scanner.cancel(self._scan_token)
+            self._scan_token = None
+
+
+    @pyqtSlot(int, list)
+    def on_packages_found(self, token, packages):
+        """Append a batch of installed packages to the table.
+        """
+        if token != self._scan_token:
+            return
+
+        for info in packages:
+            self.packages_table_model.appendRow([
+                QStandardItem(text) for text in (
+                    info.pkg_name,
+                    info.pkg_version,
+                    info.pkg_info_2,
+                    info.pkg_summary
+                )
+            ])
+
+
+    @pyqtSlot(int)
+    def on_package_scan_finished(self, token):
+        """Sort the table once all packages arrived.
+        """
+        if token != self._scan_token:
+            return
+
+        self._scan_token = None
+
+        # sort by name first, so rows that compare equal in the sort
+        # column keep the same order regardless of arrival order
+        header = self.packages_table.horizontalHeader()
+        self.packages_table_model.sort(0, Qt.SortOrder.AscendingOrder)
+        self.packages_table.sortByColumn(
+            header.sortIndicatorSection(),
+            header.sortIndicatorOrder()
+        )
@@ -60,7 +60,7 @@ class Platform:
     def default_python_search_path(self) -> str:
         return str(Path.home())
 
-    def site_packages_path(self, venv_dir: Path) -> Path:
+    def site_packages_path(self, venv_dir: Path, version: str = "") -> Path:
         lib_dir = venv_dir / "lib"
         if not lib_dir.exists():
             lib_dir = venv_dir / "Lib"
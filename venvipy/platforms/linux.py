@@ -21,6 +21,7 @@ Linux platform implementation.
 """
 from pathlib import Path
 import os
+import re
 import shlex
 import shutil
 import stat
@@ -41,14 +42,32 @@ class LinuxPlatform(Platform):
         return "/usr/local/bin"
 
 
-    def site_packages_path(self, venv_dir):
+    def site_packages_path(self, venv_dir, version=""):
         lib_dir = venv_dir / "lib"
         if not lib_dir.exists():
             return lib_dir / "site-packages"
-        python_dirs = [p for p in lib_dir.iterdir() if p.is_dir()]
-        if not python_dirs:
+
+        # prefer the dir of the `X.Y` version in `pyvenv.cfg`, it's the
+        # one in use if `lib/` still contains dirs of an older version
+        if version:
+            for name in (f"python{version}", f"pypy{version}"):
+                site_dir = lib_dir / name / "site-packages"
+                if site_dir.is_dir():
+                    return site_dir
+
+        # otherwise take the highest version that has a `site-packages`
+        site_dirs = [p for p in lib_dir.glob("*/site-packages") if p.is_dir()]
+        if not site_dirs:
             return lib_dir / "site-packages"
-        return python_dirs[0] / "site-packages"
+        return max(site_dirs, key=self._version_key)
+
+
+    @staticmethod
+    def _version_key(site_dir):
+        """Sort key of a `lib/<name>X.Y/site-packages` dir by version.
+        """
+        numbers = re.findall(r"\d+", site_dir.parent.name)
+        return tuple(int(n) for n in numbers), site_dir.parent.name
 
 
     def _desktop_dir(self) -> Path:
@@ -50,7 +50,7 @@ class WindowsPlatform(Platform):
     def default_python_search_path(self) -> str:
         return str(Path.home())
 
-    def site_packages_path(self, venv_dir: Path) -> Path:
+    def site_packages_path(self, venv_dir: Path, version: str = "") -> Path:
         return venv_dir / "Lib" / "site-packages"
 
     def launcher_path(self, launcher_key: str) -> Path:
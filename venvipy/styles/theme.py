@@ -266,6 +266,18 @@ dark = f"""
         background-color: {COLORS["panel_alt"]};
     }}
 
+    QSpinBox {{
+        background-color: {COLORS["surface_alt"]};
+        color: {COLORS["text"]};
+        border: 1px solid {COLORS["border"]};
+        border-radius: 6px;
+        padding: 4px 6px;
+    }}
+
+    QSpinBox:focus {{
+        border-color: {COLORS["accent"]};
+    }}
+
     QTableView {{
         background-color: {COLORS["surface_alt"]};
         alternate-background-color: {COLORS["surface"]};
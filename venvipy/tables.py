@@ -20,6 +20,7 @@
 This module contains the tables.
 """
 import os
+import sys
 import shlex
 import subprocess
 import tempfile
@@ -29,7 +30,15 @@ import logging
 from functools import partial
 
 from PyQt6.QtGui import QIcon, QCursor, QAction
-from PyQt6.QtCore import pyqtSignal, QThread, QTimer
+from PyQt6.QtCore import (
+    Qt,
+    pyqtSignal,
+    QThread,
+    QTimer,
+    QModelIndex,
+    QAbstractTableModel,
+    QSortFilterProxyModel
+)
 from PyQt6.QtWidgets import (
     QStyle,
     QTableView,
@@ -41,9 +50,18 @@ from PyQt6.QtWidgets import (
 
 import get_data
 import creator
-from dialogs import ConsoleDialog, ProgBarDialog
+import wheelhouse
+from dialogs import ConsoleDialog, ProgBarDialog, BatchDialog
+from jobs import Job
 from creator import InstallWorker
-from manage_pip import PipManager
+from manage_pip import (
+    PipManager,
+    BACKEND_UV,
+    find_uv,
+    raw_progress_options,
+    select_backend,
+    uv_pip_args
+)
 from platforms import get_platform
 
 
@@ -74,6 +92,13 @@ class BaseTable(QTableView):
             return selected_item
 
 
+    def get_selected_items(self):
+        """
+        Return a `list` of `str` from `name` column of the selected rows.
+        """
+        return [index.data() for index in self.selectionModel().selectedRows()]
+
+
     def get_comment(self):
         """
         Return `str` from `comment` column of the selected row.
@@ -85,6 +110,342 @@ class BaseTable(QTableView):
 
 
 
+def _format_size(size):
+    """Return a human readable file size.
+    """
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB", "GB", "TB"):
+        size /= 1024
+        if size < 1024:
+            break
+    return f"{size:.1f} {unit}"
+
+
+
+class VenvModel(QAbstractTableModel):
+    """
+    Model of the venvs found. The `VenvInfo` fields are stored in
+    one list per column instead of one `QStandardItem` per cell.
+    The disk usage and the health status are kept in extra columns,
+    which are filled in later by `set_size()` and `set_health()`.
+    """
+    HEADERS = (
+        "Venv",
+        "Version",
+        "Packages",
+        "Installed",
+        "Description",
+        "Size",
+        "Status"
+    )
+    FIELDS = (
+        "venv_name",
+        "venv_version",
+        "site_packages",
+        "is_installed",
+        "venv_comment"
+    )
+    SIZE_COLUMN = len(FIELDS)
+    STATUS_COLUMN = SIZE_COLUMN + 1
+
+    # sort order of the health status
+    SEVERITY = {
+        get_data.HEALTH_OK: 0,
+        get_data.HEALTH_WARNING: 1,
+        get_data.HEALTH_BROKEN: 2
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._columns = tuple([] for _ in self.FIELDS)
+        self._sizes = []
+        self._health = []
+        self._rows = {}  # venv name -> row
+
+
+    @property
+    def _all_columns(self):
+        return self._columns + (self._sizes, self._health)
+
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns[0])
+
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.SIZE_COLUMN:
+                size = self._sizes[index.row()]
+                return "" if size is None else _format_size(size)
+            if column == self.STATUS_COLUMN:
+                venv_health = self._health[index.row()]
+                return "" if venv_health is None else venv_health.status
+            return self._columns[column][index.row()]
+
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if column == self.STATUS_COLUMN:
+                venv_health = self._health[index.row()]
+                if venv_health is not None and venv_health.problems:
+                    return "\n".join(venv_health.problems)
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if column == self.SIZE_COLUMN:
+                return (
+                    Qt.AlignmentFlag.AlignRight
+                    | Qt.AlignmentFlag.AlignVCenter
+                )
+        return None
+
+
+    def headerData(
+            self,
+            section,
+            orientation,
+            role=Qt.ItemDataRole.DisplayRole
+        ):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.HEADERS[section]
+        return None
+
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """
+        Sort the rows by the case-folded text (or the size) of
+        `column`, then by venv name. Selected rows stay selected.
+        """
+        names = self._columns[0]
+        if column == self.SIZE_COLUMN:
+            sizes = self._sizes
+            def sort_key(row):
+                size = sizes[row]
+                return (-1 if size is None else size, names[row].casefold())
+        elif column == self.STATUS_COLUMN:
+            health = self._health
+            def sort_key(row):
+                severity = -1 if health[row] is None else self.SEVERITY.get(
+                    health[row].status, -1
+                )
+                return (severity, names[row].casefold())
+        elif 0 <= column < len(self.FIELDS):
+            values = self._columns[column]
+            def sort_key(row):
+                return (values[row].casefold(), names[row].casefold())
+        else:
+            return
+
+        new_order = sorted(
+            range(len(names)),
+            key=sort_key,
+            reverse=order == Qt.SortOrder.DescendingOrder
+        )
+
+        self.layoutAboutToBeChanged.emit()
+        for values in self._all_columns:
+            values[:] = [values[row] for row in new_order]
+
+        new_rows = [0] * len(new_order)
+        for new_row, old_row in enumerate(new_order):
+            new_rows[old_row] = new_row
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent, [
+            self.index(new_rows[index.row()], index.column())
+            for index in persistent
+        ])
+        self._reindex()
+        self.layoutChanged.emit()
+
+
+    def _reindex(self):
+        self._rows = {name: row for row, name in enumerate(self._columns[0])}
+
+
+    def venv_names(self):
+        """Return a view of the names of all venvs in the model.
+        """
+        return self._rows.keys()
+
+
+    def get_venv(self, venv_name):
+        """Return the `VenvInfo` of `venv_name` or `None`.
+        """
+        row = self._rows.get(venv_name)
+        if row is None:
+            return None
+        return get_data.VenvInfo(*(values[row] for values in self._columns))
+
+
+    def venvs(self):
+        """Return the `VenvInfo` of all venvs in the model.
+        """
+        return [get_data.VenvInfo(*fields) for fields in zip(*self._columns)]
+
+
+    def venvs_without_size(self):
+        """Return the names of the venvs whose size is unknown.
+        """
+        return [
+            name for name, size in zip(self._columns[0], self._sizes)
+            if size is None
+        ]
+
+
+    def set_size(self, venv_name, size):
+        """Set the disk usage (bytes or `None`) of a venv.
+        """
+        row = self._rows.get(venv_name)
+        if row is None or self._sizes[row] == size:
+            return
+
+        self._sizes[row] = size
+        index = self.index(row, self.SIZE_COLUMN)
+        self.dataChanged.emit(index, index)
+
+
+    def venvs_without_health(self):
+        """Return the names of the venvs that haven't been checked.
+        """
+        return [
+            name for name, venv_health in zip(self._columns[0], self._health)
+            if venv_health is None
+        ]
+
+
+    def broken_rows(self):
+        """Return the rows of the venvs found broken.
+        """
+        return [
+            row for row, venv_health in enumerate(self._health)
+            if venv_health is not None
+            and venv_health.status == get_data.HEALTH_BROKEN
+        ]
+
+
+    def set_health(self, venv_name, venv_health):
+        """Set the `VenvHealth` of a venv.
+        """
+        row = self._rows.get(venv_name)
+        if row is None or self._health[row] == venv_health:
+            return
+
+        self._health[row] = venv_health
+        index = self.index(row, self.STATUS_COLUMN)
+        self.dataChanged.emit(index, index)
+
+
+    def clear(self):
+        """Remove all venvs.
+        """
+        self.beginResetModel()
+        for values in self._all_columns:
+            values.clear()
+        self._rows.clear()
+        self.endResetModel()
+
+
+    def add_venvs(self, venv_infos):
+        """Append venvs that are not in the model yet.
+        """
+        venv_infos = [
+            info for info in venv_infos if info.venv_name not in self._rows
+        ]
+        if not venv_infos:
+            return
+
+        first = len(self._columns[0])
+        self.beginInsertRows(
+            QModelIndex(), first, first + len(venv_infos) - 1
+        )
+        for row, info in enumerate(venv_infos, first):
+            self._rows[info.venv_name] = row
+            for values, field in zip(self._columns, self.FIELDS):
+                # most versions and flags repeat, so share the strings
+                values.append(sys.intern(getattr(info, field)))
+            self._sizes.append(None)
+            self._health.append(None)
+        self.endInsertRows()
+
+
+    def update_venv(self, venv_info):
+        """
+        Replace the fields of an existing venv. Return `True`
+        if the venv is in the model and anything changed.
+        """
+        row = self._rows.get(venv_info.venv_name)
+        if row is None:
+            return False
+
+        changed = []
+        for column, (values, field) in enumerate(
+                zip(self._columns, self.FIELDS)
+            ):
+            value = getattr(venv_info, field)
+            if values[row] != value:
+                values[row] = sys.intern(value)
+                changed.append(column)
+
+        if not changed:
+            return False
+
+        self.dataChanged.emit(
+            self.index(row, changed[0]), self.index(row, changed[-1])
+        )
+        return True
+
+
+    def remove_venvs(self, venv_names):
+        """Remove the rows of `venv_names`.
+        """
+        rows = sorted(
+            self._rows[name] for name in venv_names if name in self._rows
+        )
+        if not rows:
+            return
+
+        # remove bottom-up in runs of adjacent rows
+        while rows:
+            last = rows.pop()
+            first = last
+            while rows and rows[-1] == first - 1:
+                first = rows.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for values in self._all_columns:
+                del values[first:last + 1]
+            self.endRemoveRows()
+        self._reindex()
+
+
+
+class VenvFilterProxyModel(QSortFilterProxyModel):
+    """
+    Filter the venv table by a text found in any column. Sorting
+    is passed on to the source model, so it runs on Python keys
+    instead of comparing the rows cell by cell.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setFilterKeyColumn(-1)
+
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+
+
 class VenvTable(BaseTable):
     """List the virtual environments found.
     """
@@ -92,6 +453,7 @@ class VenvTable(BaseTable):
     finished = pyqtSignal()
     text_changed = pyqtSignal(str)
     refresh = pyqtSignal()
+    venv_changed = pyqtSignal(str)
     start_installer = pyqtSignal()
     start_pkg_manager = pyqtSignal()
 
@@ -137,6 +499,9 @@ class VenvTable(BaseTable):
         self.m_install_worker.text_changed.connect(
             self.console.update_status
         )
+        self.m_install_worker.progress_changed.connect(
+            self.console.update_progress
+        )
 
         # perform a proper stop using quit() and wait()
         self.thread.finished.connect(self.thread.quit)
@@ -149,7 +514,14 @@ class VenvTable(BaseTable):
         if not idx.isValid():
             return
 
-        self.selectRow(idx.row())
+        # keep a multi-row selection if the click is inside of it
+        if not self.selectionModel().isRowSelected(idx.row(), QModelIndex()):
+            self.selectRow(idx.row())
+
+        venvs = self.get_selected_items()
+        if len(venvs) > 1:
+            self.batch_context_menu(event, venvs)
+            return
 
         #]===================================================================[#
         #] ACTIONS [#========================================================[#
@@ -271,10 +643,19 @@ class VenvTable(BaseTable):
         list_deptree_action = QAction(
             "Display &dependency tree",
             self,
-            statusTip="List dependencies with 'pipdeptree'"
+            statusTip="List the installed packages and their dependencies"
         )
         list_deptree_action.triggered.connect(
-            lambda: self.deptree_packages(event, style=3)
+            lambda: self.deptree_packages(event)
+        )
+
+        list_reverse_deptree_action = QAction(
+            "Display &reverse dependency tree",
+            self,
+            statusTip="List the installed packages and what requires them"
+        )
+        list_reverse_deptree_action.triggered.connect(
+            lambda: self.deptree_packages(event, reverse=True)
         )
 
         open_venv_dir_action = QAction(
@@ -328,6 +709,8 @@ class VenvTable(BaseTable):
         context_menu.addMenu(details_sub_menu)
         details_sub_menu.addAction(list_packages_action)
         details_sub_menu.addAction(list_freeze_action)
+        details_sub_menu.addAction(list_deptree_action)
+        details_sub_menu.addAction(list_reverse_deptree_action)
 
         context_menu.addMenu(comment_sub_menu)
         comment_sub_menu.addAction(comment_add_action)
@@ -345,12 +728,11 @@ class VenvTable(BaseTable):
         """Test wether the Python version required is installed.
         """
         cfg_file = os.path.join(venv_path, "pyvenv.cfg")
-        is_installed = get_data.get_config(cfg_file, "installed")
-        version = get_data.get_config(cfg_file, "version")
-        py_path = get_data.get_config(cfg_file, "py_path")
+        venv_config = get_data.read_venv_config(cfg_file)
+        is_installed = get_data.is_python_installed(venv_config.py_path)
         msg_txt = (
-            f"This environment requires {version} \n"
-            f"from {py_path} which is \nnot installed.\n"
+            f"This environment requires {venv_config.version} \n"
+            f"from {venv_config.py_path} which is \nnot installed.\n"
         )
 
         if is_installed == "no":
@@ -402,25 +784,9 @@ class VenvTable(BaseTable):
             QMessageBox.information(self, "Info", "Python binary not found in this environment.")
             return False
 
-        try:
-            result = subprocess.run(
-                [str(venv_python), "-m", "pip", "--version"],
-                capture_output=True,
-                check=False,          # <-- wichtig
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-            )
-
-        except OSError as e:
-            QMessageBox.information(self, "Info", f"Could not run Python:\n{e}")
-            return False
-
-        if result.returncode == 0:
+        if get_data.get_pip_version(venv_path, probe=False) is not None:
             return True
 
-        details = (result.stderr or result.stdout or "").strip()
-        logger.debug(f"pip --version failed (rc={result.returncode}):\n{details}")
         QMessageBox.information(self, "Info", "This environment has no Pip installed.")
         return False
 
@@ -450,6 +816,7 @@ class VenvTable(BaseTable):
             self.manager = PipManager(active_dir, venv)
             self.manager.started.connect(self.console.exec)
             self.manager.text_changed.connect(self.console.update_status)
+            self.manager.progress_changed.connect(self.console.update_progress)
 
             self.manager.run_pip(creator.cmds[0], [creator.opts[0], f"{pkg}"])
 
@@ -514,13 +881,25 @@ class VenvTable(BaseTable):
                     "-m",
                     "pip",
                     *shlex.split(creator.cmds[0]),
+                    *wheelhouse.find_links_options(),
+                    *raw_progress_options(Path(active_dir) / venv),
                     creator.opts[1],
                     file_path,
                 ]
                 self.console.setWindowTitle(
                     "Installing from requirements file"
                 )
-                wrapper = partial(self.m_install_worker.run_process, cmd)
+                uv_args = None
+                if select_backend("install") == BACKEND_UV:
+                    uv_args = uv_pip_args(cmd[3:], venv_bin)
+                if uv_args is not None:
+                    wrapper = partial(
+                        self.m_install_worker.run_process,
+                        [find_uv(), *uv_args],
+                        fallback=cmd
+                    )
+                else:
+                    wrapper = partial(self.m_install_worker.run_process, cmd)
                 QTimer.singleShot(0, wrapper)
 
                 # clear the content on window close
@@ -549,6 +928,7 @@ class VenvTable(BaseTable):
                     self.manager = PipManager(active_dir, venv)
                     self.manager.started.connect(self.console.exec)
                     self.manager.text_changed.connect(self.console.update_status)
+                    self.manager.progress_changed.connect(self.console.update_progress)
                     self.manager.run_pip(
                         creator.cmds[0], [project_dir]
                     )
@@ -592,6 +972,8 @@ class VenvTable(BaseTable):
                     "-m",
                     "pip",
                     *shlex.split(creator.cmds[0]),
+                    *wheelhouse.find_links_options(),
+                    *raw_progress_options(Path(active_dir) / venv),
                     formatted_project_url,
                 ]
                 self.console.setWindowTitle(
@@ -607,13 +989,13 @@ class VenvTable(BaseTable):
 
     def save_requires(self, event):
         """
-        Pip freeze a requirements of the selected environment.
+        Freeze a requirements of the selected environment.
         """
         active_dir = get_data.get_active_dir_str()
         venv = self.get_selected_item()
         venv_dir = Path(active_dir) / venv
 
-        if self.has_pip(active_dir, venv):
+        if self.venv_exists(venv_dir):
             save_file = QFileDialog.getSaveFileName(
                 self,
                 "Save requirements",
@@ -624,20 +1006,16 @@ class VenvTable(BaseTable):
             if not save_path:
                 return
 
-            platform = get_platform()
-            venv_python = platform.venv_python_path(venv_dir)
             try:
-                with open(save_path, "w", encoding="utf-8") as f:
-                    subprocess.run([
-                        str(venv_python),
-                        "-m",
-                        "pip",
-                        "freeze"],
-                        stdout=f,
-                        check=False,
-                    )
-            except subprocess.CalledProcessError as e:
+                get_data.save_requirements(
+                    active_dir, venv, save_path, probe=False
+                )
+            except OSError as e:
                 logger.debug(f"Failed to save requirements: {e}")
+                QMessageBox.warning(
+                    self, "Error", f"Could not save requirements:\n{e}"
+                )
+                return
 
             logger.debug(f"Saved '{save_path}'")
             message_txt = f"Saved requirements in \n{save_path}"
@@ -652,8 +1030,7 @@ class VenvTable(BaseTable):
         """
         Open console dialog and list the installed packages. The argument
         `style` controls which style the output should have: `style=1` for
-        `pip list`, `style=2` for `pip freeze` and style=3 for a dependency
-        output via `pipdeptree`.
+        `pip list` and `style=2` for `pip freeze`.
         """
         active_dir = get_data.get_active_dir_str()
         venv = self.get_selected_item()
@@ -678,55 +1055,29 @@ class VenvTable(BaseTable):
         self.list_packages(event, style)
 
 
-    def deptree_packages(self, event, style):
+    def deptree_packages(self, event, reverse=False):
         """
-        Test if `pipdeptree` is installed and ask user wether to
-        install it if it's not. Then call `self.list_packages()`
+        Print the dependency tree of the installed packages to the
+        console window, or with `reverse=True` what requires them. The
+        graph is built from the package metadata, nothing is run in
+        or installed into the environment.
         """
         active_dir = get_data.get_active_dir_str()
         venv = self.get_selected_item()
-        platform = get_platform()
-        venv_python = platform.venv_python_path(Path(active_dir) / venv)
-        pipdeptree_result = subprocess.run(
-            [str(venv_python), "-m", "pipdeptree", "--version"],
-            capture_output=True,
-            check=False,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        )
-        has_pipdeptree = pipdeptree_result.returncode == 0
-        message_txt = (
-            "This requires pipdeptree             \nto be installed.\n\n"
-            "Do you want to install it?\n"
-        )
-
-        if has_pipdeptree:
-            self.list_packages(event, style)
-        else:
-            if self.has_pip(active_dir, venv):
-                msg_box_confirm = QMessageBox.question(
-                    self,
-                    "Confirm",
-                    message_txt,
-                    QMessageBox.StandardButton.Yes
-                    | QMessageBox.StandardButton.Cancel
-                )
-                if msg_box_confirm == QMessageBox.StandardButton.Yes:
-                    self.progress_bar.setWindowTitle("Installing")
-                    self.progress_bar.status_label.setText(
-                        "Installing pipdeptree..."
-                    )
-                    logger.debug("Installing pipdeptree...")
+        if not self.venv_exists(Path(active_dir) / venv):
+            return
 
-                    self.manager = PipManager(active_dir, venv)
-                    self.manager.run_pip(
-                        creator.cmds[0], [creator.opts[0], "pipdeptree"]
-                    )
-                    self.manager.started.connect(self.progress_bar.exec)
-                    self.manager.finished.connect(self.progress_bar.close)
-                    self.manager.process_stop()
-                    self.list_packages(event, style)
+        graph = get_data.get_dependency_graph(active_dir, venv, probe=False)
+        tree = get_data.format_dependency_tree(graph, reverse=reverse)
+
+        if reverse:
+            self.console.setWindowTitle(f"Reverse dependencies in: {venv}")
+        else:
+            self.console.setWindowTitle(f"Dependencies in: {venv}")
+        self.console.console_window.clear()
+        self.console.update_status(tree or "No packages installed.")
+        self.console.update_status("\n\nPress [ESC] to continue...\n")
+        self.console.exec()
 
 
     def comment_add(self, event):
@@ -763,8 +1114,8 @@ class VenvTable(BaseTable):
                 # keep the old description
                 creator.save_comment(venvipy_cfg, comment_old)
 
-        # refresh venv table
-        self.refresh.emit()
+        # refresh the row of this venv
+        self.venv_changed.emit(venv)
 
 
     def comment_remove(self, event):
@@ -786,7 +1137,7 @@ class VenvTable(BaseTable):
             if msg_box_warning == QMessageBox.StandardButton.Yes:
                 os.remove(venvipy_cfg)
                 logger.debug(f"Successfully deleted '{venvipy_cfg}'")
-                self.refresh.emit()
+                self.venv_changed.emit(venv)
 
 
     def open_venv_dir(self, event):
@@ -957,7 +1308,165 @@ class VenvTable(BaseTable):
             if msg_box_critical == QMessageBox.StandardButton.Yes:
                 shutil.rmtree(venv_path)
                 logger.debug(f"Successfully deleted '{venv_path}'")
-                self.refresh.emit()
+                self.venv_changed.emit(venv)
+
+
+
+    #]=======================================================================[#
+    #] BATCH OPERATIONS [#===================================================[#
+    #]=======================================================================[#
+
+    def batch_context_menu(self, event, venvs):
+        """Show the actions available for several selected venvs.
+        """
+        count = len(venvs)
+        context_menu = QMenu(self)
+
+        upgrade_pip_action = context_menu.addAction(
+            self.reload_icon, f"&Upgrade Pip in {count} environments"
+        )
+        upgrade_pip_action.triggered.connect(
+            lambda: self.batch_install(venvs, [creator.opts[0], "pip"])
+        )
+
+        install_wheel_action = context_menu.addAction(
+            self.desk_icon, f"Install &Wheel in {count} environments"
+        )
+        install_wheel_action.triggered.connect(
+            lambda: self.batch_install(venvs, [creator.opts[0], "wheel"])
+        )
+
+        install_package_action = context_menu.addAction(
+            self.computer_icon, f"&Install package in {count} environments"
+        )
+        install_package_action.triggered.connect(
+            lambda: self.batch_install_package(venvs)
+        )
+
+        uninstall_package_action = context_menu.addAction(
+            self.delete_icon, f"U&ninstall package from {count} environments"
+        )
+        uninstall_package_action.triggered.connect(
+            lambda: self.batch_uninstall_package(venvs)
+        )
+
+        save_requires_action = context_menu.addAction(
+            self.save_icon, f"&Save requirements of {count} environments"
+        )
+        save_requires_action.triggered.connect(
+            lambda: self.batch_save_requires(venvs)
+        )
+
+        context_menu.exec(event.globalPos())
+
+
+    def pip_jobs(self, venvs, pip_args, title):
+        """
+        Return a `Job` running pip with `pip_args` for every venv. Whether
+        pip is installed isn't checked here, the job fails if it's not.
+        """
+        active_dir = get_data.get_active_dir_str()
+        platform = get_platform()
+        jobs = []
+        for venv in venvs:
+            venv_path = Path(active_dir) / venv
+            jobs.append(Job(
+                title=f"{title} in {venv}",
+                venv=str(venv_path),
+                program=str(platform.venv_python_path(venv_path)),
+                args=["-m", "pip", *pip_args],
+                working_dir=active_dir
+            ))
+        return jobs
+
+
+    def run_batch(self, title, venvs, jobs):
+        """Run the jobs of `venvs` (one each) in a `BatchDialog`.
+        """
+        logger.debug(f"{title}: {len(jobs)} jobs")
+        batch_dialog = BatchDialog(title, jobs, self, labels=venvs)
+        batch_dialog.exec()
+        batch_dialog.deleteLater()
+
+
+    def batch_install(self, venvs, options):
+        """Run `pip install <options>` in every venv.
+        """
+        pip_args = [
+            *shlex.split(creator.cmds[0]),
+            *wheelhouse.find_links_options(),
+            *options
+        ]
+        title = f"Installing {options[-1]}"
+        self.run_batch(
+            f"{title} in {len(venvs)} environments",
+            venvs,
+            self.pip_jobs(venvs, pip_args, title)
+        )
+
+
+    def batch_install_package(self, venvs):
+        """Ask for a requirement and install it in every venv.
+        """
+        requirement, ok = QInputDialog.getText(
+            self,
+            "Install package",
+            "Enter requirement (e.g. requests>=2.31):" + " " * 40
+        )
+        if ok and requirement.strip():
+            self.batch_install(venvs, shlex.split(requirement))
+
+
+    def batch_uninstall_package(self, venvs):
+        """Ask for a package name and uninstall it from every venv.
+        """
+        package, ok = QInputDialog.getText(
+            self,
+            "Uninstall package",
+            "Enter package name:" + " " * 60
+        )
+        if not ok or not package.strip():
+            return
+
+        title = f"Removing {package.strip()}"
+        self.run_batch(
+            f"{title} from {len(venvs)} environments",
+            venvs,
+            self.pip_jobs(
+                venvs, ["uninstall", "--yes", *shlex.split(package)], title
+            )
+        )
+
+
+    def batch_save_requires(self, venvs):
+        """
+        Save the requirements of every venv as `<venv>-requirements.txt`
+        in a directory (`_` replaces the separators of nested venvs).
+        """
+        active_dir = get_data.get_active_dir_str()
+        save_dir = QFileDialog.getExistingDirectory(
+            self, "Save requirements in", active_dir
+        )
+        if not save_dir:
+            return
+
+        jobs = []
+        for venv in venvs:
+            file_name = venv.replace(os.sep, "_")
+            save_path = Path(save_dir) / f"{file_name}-requirements.txt"
+
+            def save(venv=venv, save_path=save_path):
+                get_data.save_requirements(active_dir, venv, save_path)
+                return f"Saved requirements in {save_path}"
+
+            jobs.append(Job(
+                title=f"Saving requirements of {venv}",
+                venv=str(Path(active_dir) / venv),
+                func=save
+            ))
+        self.run_batch(
+            f"Saving requirements of {len(venvs)} environments", venvs, jobs
+        )
 
 
 
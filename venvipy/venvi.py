@@ -24,6 +24,7 @@ import os
 import csv
 import getopt
 import logging
+import itertools
 from functools import partial
 from pathlib import Path
 
@@ -33,7 +34,18 @@ sys.path.insert(0, str(CURRENT_DIR))
 os.chdir(CURRENT_DIR)
 
 from PyQt6 import QtCore
-from PyQt6.QtCore import Qt, QRect, QSize, pyqtSlot
+from PyQt6.QtCore import (
+    Qt,
+    QItemSelection,
+    QItemSelectionModel,
+    QRect,
+    QSize,
+    QThread,
+    QTimer,
+    QFileSystemWatcher,
+    pyqtSignal,
+    pyqtSlot
+)
 from PyQt6.QtGui import (
     QIcon,
     QPixmap,
@@ -64,6 +76,7 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QLineEdit,
     QTabWidget,
+    QSpinBox,
     QWidgetAction
 )
 
@@ -77,11 +90,26 @@ from pkg_installer import PackageInstaller
 from pkg_manager import PackageManager
 from dialogs import (
     InfoAboutVenviPy,
+    JobsDialog,
     LauncherDialog,
     show_launcher_apply_result
 )
+from creator import VenvScanWorker, DiskUsageWorker, HealthCheckWorker
+from manage_pip import shutdown_pip_helpers
+from jobs import (
+    Job,
+    JOB_CANCELLED,
+    PRIORITY_BACKGROUND,
+    job_manager,
+    shutdown_jobs
+)
 from platforms import get_platform
-from tables import VenvTable, InterpreterTable
+from tables import (
+    VenvTable,
+    VenvModel,
+    VenvFilterProxyModel,
+    InterpreterTable
+)
 
 
 LOG_FORMAT = "[%(levelname)s] - { %(name)s }: %(message)s"
@@ -92,11 +120,36 @@ logger = logging.getLogger()
 # to respect prompt_shown from launcher_state.json again.
 FORCE_PROMPT_SHOWN_FALSE = False
 
+# delay (ms) before a tab reacts to changes in its watched directories
+WATCH_DEBOUNCE_MS = 300
+# max number of directories watched per tab
+WATCH_LIMIT = 2048
+# delay (ms) before the next inactive tab is loaded in the background
+IDLE_LOAD_DELAY_MS = 500
+
+
+def _in_venv_scope(venv_name, scope, exact):
+    """
+    Return `True` if `venv_name` is `scope` or (unless `exact`)
+    lies below it. The empty scope contains all venvs.
+    """
+    if exact or venv_name == scope:
+        return venv_name == scope
+    return scope == "" or venv_name.startswith(scope + os.sep)
+
+
+
 
 class MainWindow(QMainWindow):
     """
     The main window.
     """
+    start_venv_scan = pyqtSignal(int, str, int)
+    start_venv_refresh = pyqtSignal(int, str, list, int)
+    start_venv_revalidate = pyqtSignal(int, str, int)
+    start_size_measure = pyqtSignal(int, str, list)
+    start_health_check = pyqtSignal(int, str, list)
+
     def __init__(self):
         super().__init__()
 
@@ -125,6 +178,51 @@ class MainWindow(QMainWindow):
         self.pkg_installer = PackageInstaller()
         self.pkg_manager = PackageManager()
 
+        # all long-running operations are registered as jobs
+        self.job_manager = job_manager()
+        self._background_jobs = {}
+        self.jobs_dialog = None
+
+        # scan venv directories in the background
+        self._scan_tokens = itertools.count(1)
+        self._scan_tabs = {}
+        self._refresh_tabs = {}
+        self.scan_thread = QThread(self)
+        self.venv_scanner = VenvScanWorker()
+        self.venv_scanner.moveToThread(self.scan_thread)
+        self.start_venv_scan.connect(self.venv_scanner.scan)
+        self.venv_scanner.found.connect(self.on_venvs_found)
+        self.venv_scanner.finished.connect(self.on_venv_scan_finished)
+        self.start_venv_refresh.connect(self.venv_scanner.refresh)
+        self.start_venv_revalidate.connect(self.venv_scanner.revalidate)
+        self.venv_scanner.refreshed.connect(self.on_venvs_refreshed)
+
+        # check the health of venvs (on the scan thread)
+        self._health_tabs = {}
+        self.health_checker = HealthCheckWorker()
+        self.health_checker.moveToThread(self.scan_thread)
+        self.start_health_check.connect(self.health_checker.check)
+        self.health_checker.checked.connect(self.on_venvs_checked)
+        self.health_checker.finished.connect(self.on_health_check_finished)
+        self.scan_thread.start()
+
+        # measure the disk usage of venvs in the background
+        self._size_tabs = {}
+        self.size_thread = QThread(self)
+        self.size_worker = DiskUsageWorker()
+        self.size_worker.moveToThread(self.size_thread)
+        self.start_size_measure.connect(self.size_worker.measure)
+        self.size_worker.measured.connect(self.on_venv_size_measured)
+        self.size_worker.finished.connect(self.on_venv_sizes_finished)
+        self.size_thread.start()
+
+        # load inactive tabs one by one when idle
+        self.idle_load_timer = QTimer(
+            self,
+            singleShot=True,
+            interval=IDLE_LOAD_DELAY_MS
+        )
+        self.idle_load_timer.timeout.connect(self.load_next_venv_tab)
 
         #]===================================================================[#
         #] ICONS [#==========================================================[#
@@ -302,6 +400,7 @@ class MainWindow(QMainWindow):
             self.create_venv_tab(initial_title, initial_dir)
 
         self.on_venv_tab_changed(self.venv_tabs.currentIndex())
+        self.idle_load_timer.start()
 
 
         #]===================================================================[#
@@ -344,6 +443,19 @@ class MainWindow(QMainWindow):
             triggered=self.open_launcher_dialog
         )
 
+        self.action_show_jobs = QAction(
+            QIcon(
+                self.style().standardIcon(
+                    QStyle.StandardPixmap.SP_FileDialogDetailedView
+                )
+            ),
+            "&Jobs",
+            self,
+            statusTip="Show running and finished jobs",
+            shortcut="Ctrl+J",
+            triggered=self.show_jobs_dialog
+        )
+
         self.always_save_tabs_checkbox = QCheckBox("Always save tabs", self)
         self.always_save_tabs_checkbox.setChecked(
             self.tab_save_pref.get("always_save_tabs", False)
@@ -417,6 +529,7 @@ class MainWindow(QMainWindow):
         menu_venv.addAction(self.action_new_venv)
         menu_venv.addAction(self.action_select_active_dir)
         menu_venv.addAction(self.action_create_launcher)
+        menu_venv.addAction(self.action_show_jobs)
         menu_venv.addAction(self.action_always_save_tabs)
         menu_venv.addSeparator()
         menu_venv.addAction(self.action_exit)
@@ -510,6 +623,28 @@ class MainWindow(QMainWindow):
             if table is not None and hasattr(table, "thread"):
                 table.thread.exit()
 
+        self.idle_load_timer.stop()
+        shutdown_jobs()
+        for token in list(self._scan_tabs):
+            self.venv_scanner.cancel(token)
+        for token in list(self._health_tabs):
+            self.health_checker.cancel(token)
+        self._scan_tabs.clear()
+        self._refresh_tabs.clear()
+        self._health_tabs.clear()
+        self.scan_thread.quit()
+        self.scan_thread.wait()
+
+        for token in list(self._size_tabs):
+            self.size_worker.cancel(token)
+        self._size_tabs.clear()
+        self.size_thread.quit()
+        self.size_thread.wait()
+
+        self.pkg_manager.shutdown_threads()
+        shutdown_pip_helpers()
+        get_data.save_venv_catalog()
+
 
     def handle_tab_persistence_on_close(self):
         """Ask whether to save tabs (or auto-save) when closing.
@@ -720,28 +855,539 @@ class MainWindow(QMainWindow):
         self.venv_wizard.basic_settings.pop_combo_box()
 
 
-    def pop_venv_table(self, tab_widget=None):
-        """Populate the venv table view.
+    def pop_venv_table(self, tab_widget=None, use_cache=False):
+        """
+        Populate the venv table view. The directory is scanned in
+        the background and rows are added as the venvs are found.
+        If the table already lists this directory, the rows are kept and
+        only updated where they differ once the new scan is complete.
+
+        With `use_cache=True` the venvs known from the catalog are shown
+        instantly and only what changed on disk since is read again.
         """
         tab_data = self.get_tab_data(tab_widget)
         if tab_data is None:
             return
 
+        self.cancel_venv_scan(tab_data)
+        tab_data["loaded"] = True
+
+        path = tab_data["path"]
+        depth = tab_data.get("depth", 1)
+        listing = (path, depth) if path else None
+
+        if tab_data.get("listing") != listing:
+            self.cancel_venv_sizes(tab_data)
+            self.cancel_health_check(tab_data)
+            self.clear_venv_rows(tab_data)
+            tab_data["watch_extra"] = set()
+            cached = get_data.get_cached_venvs(path, depth) if (
+                use_cache and listing
+            ) else None
+            if cached is not None:
+                self.add_venv_rows(tab_data, cached)
+                self.sort_venv_table(tab_data)
+                tab_data["listing"] = listing
+                self.refresh_venv_table(tab_data, revalidate=True)
+                return
+
+            tab_data["listing"] = None
+            self.update_venv_watcher(tab_data)
+
+        if listing is None:
+            return
+
+        # rows are shown already, so collect until the scan is complete
+        if tab_data["listing"] is not None:
+            tab_data["scan_results"] = []
+        tab_data["listing"] = listing
+
+        token = next(self._scan_tokens)
+        tab_data["scan_token"] = token
+        self._scan_tabs[token] = tab_data
+        self.track_background_job(
+            token, "Scan venvs", path, partial(self.cancel_venv_scan, tab_data)
+        )
+        self.start_venv_scan.emit(token, path, depth)
+
+
+    def clear_venv_rows(self, tab_data):
+        """Remove all rows from the model of a tab.
+        """
+        tab_data["model"].clear()
+
+
+    def add_venv_rows(self, tab_data, venv_infos):
+        """Append rows for `venv_infos` to the model of a tab.
+        """
+        tab_data["model"].add_venvs(venv_infos)
+
+
+    def apply_venv_changes(self, tab_data, scopes):
+        """
+        Update the rows of a tab from `(scope, exact, venv_infos)` tuples.
+        Rows within a scope that are missing in `venv_infos` are removed,
+        changed rows are updated in place and new venvs are appended.
+        Untouched rows (and so the selection and scroll position) are kept.
+        Return `True` if anything changed.
+        """
         model = tab_data["model"]
-        model.setRowCount(0)
+        venv_names = model.venv_names()
+
+        stale = set()
+        fresh = {}
+        for scope, exact, venv_infos in scopes:
+            stale.update(
+                name for name in venv_names
+                if _in_venv_scope(name, scope, exact)
+            )
+            fresh.update((info.venv_name, info) for info in venv_infos)
+
+        removed = stale - fresh.keys()
+        model.remove_venvs(removed)
+
+        changed = bool(removed)
+        added = []
+        for name, info in fresh.items():
+            if name not in venv_names:
+                added.append(info)
+            elif model.update_venv(info):
+                changed = True
+
+        model.add_venvs(added)
+        return changed or bool(added)
+
+
+    def sort_venv_table(self, tab_data):
+        """Sort the rows of a tab by the current sort indicator.
+        """
+        header = tab_data["table"].horizontalHeader()
+        tab_data["model"].sort(
+            header.sortIndicatorSection(),
+            header.sortIndicatorOrder()
+        )
+
+
+    def cancel_venv_scan(self, tab_data):
+        """Stop a running scan of a tab, if any.
+        """
+        tab_data.pop("scan_results", None)
+        token = tab_data.pop("scan_token", None)
+        if token is not None and self._scan_tabs.pop(token, None):
+            self.venv_scanner.cancel(token)
+            self.complete_background_job(token, JOB_CANCELLED)
+
+
+    @pyqtSlot(int, list)
+    def on_venvs_found(self, token, venv_infos):
+        """Add a batch of scanned venvs to the table of the scanning tab.
+        """
+        tab_data = self._scan_tabs.get(token)
+        if tab_data is None:
+            return
+
+        # rows are shown already, so collect until the scan is complete
+        if "scan_results" in tab_data:
+            tab_data["scan_results"].extend(venv_infos)
+            return
 
-        for info in get_data.get_venvs(tab_data["path"]):
-            model.insertRow(0)
-            for i, text in enumerate((
-                    info.venv_name,
-                    info.venv_version,
-                    info.site_packages,
-                    info.is_installed,
-                    info.venv_comment
-            )):
-                model.setItem(0, i, QStandardItem(text))
+        self.add_venv_rows(tab_data, venv_infos)
 
-        model.sort(0, Qt.SortOrder.AscendingOrder)
+
+    @pyqtSlot(int)
+    def on_venv_scan_finished(self, token):
+        """Sort the table once the scan of a tab is complete.
+        """
+        tab_data = self._scan_tabs.pop(token, None)
+        if tab_data is None:
+            return
+
+        tab_data.pop("scan_token", None)
+        self.complete_background_job(token)
+        scan_results = tab_data.pop("scan_results", None)
+        if scan_results is not None:
+            self.apply_venv_changes(tab_data, [("", False, scan_results)])
+
+        self.sort_venv_table(tab_data)
+        self.update_venv_watcher(tab_data)
+        self.measure_venv_sizes(tab_data, tab_data["model"].venv_names())
+        self.check_venvs_health(tab_data, tab_data["model"].venv_names())
+
+        # changes seen while scanning
+        if tab_data["changed_paths"]:
+            tab_data["watch_timer"].start()
+
+        self.idle_load_timer.start()
+
+
+    def load_venv_tab(self, tab_widget=None):
+        """Populate a tab unless it has been populated already.
+        """
+        tab_data = self.get_tab_data(tab_widget)
+        if tab_data is not None and not tab_data["loaded"]:
+            self.pop_venv_table(tab_data, use_cache=True)
+
+
+    @pyqtSlot()
+    def load_next_venv_tab(self):
+        """
+        Populate the next tab that hasn't been shown yet. Continued
+        from `on_venv_scan_finished()` until all tabs are loaded.
+        """
+        if self._scan_tabs or self._refresh_tabs:
+            return  # wait for the running scan
+
+        for tab_data in self.venv_tabs_data:
+            if not tab_data["loaded"]:
+                logger.debug(f"Loading tab '{tab_data['title']}' in background")
+                self.pop_venv_table(tab_data, use_cache=True)
+                return
+
+
+    def refresh_venv_table(self, tab_widget=None, paths=None, revalidate=False):
+        """
+        Rescan only `paths` of a tab (default: its whole directory) in
+        the background and apply the differences to the existing rows.
+        With `revalidate=True` the paths that changed since the catalog
+        snapshot are rescanned.
+        """
+        tab_data = self.get_tab_data(tab_widget)
+        if tab_data is None:
+            return
+
+        if tab_data.get("listing") is None:
+            self.pop_venv_table(tab_data)
+            return
+
+        path, depth = tab_data["listing"]
+        if paths is None:
+            paths = [path]
+
+        token = next(self._scan_tokens)
+        self._refresh_tabs[token] = (tab_data, tab_data["listing"])
+        if revalidate:
+            self.start_venv_revalidate.emit(token, path, depth)
+        else:
+            self.start_venv_refresh.emit(token, path, sorted(paths), depth)
+
+
+    @pyqtSlot(int, list, list, dict)
+    def on_venvs_refreshed(self, token, scopes, watch_dirs, dir_stamps):
+        """Apply the result of a partial rescan to the rows of a tab.
+        """
+        tab_data, listing = self._refresh_tabs.pop(token, (None, None))
+        if (
+            tab_data is None
+            or self.venv_tab_map.get(tab_data["widget"]) is not tab_data
+            or tab_data.get("listing") != listing
+            or "scan_token" in tab_data  # a full scan covers it
+        ):
+            return
+
+        # keep an eye on folders that may become venvs
+        tab_data["watch_extra"].update(watch_dirs)
+
+        path, depth = listing
+        changed = self.apply_venv_changes(tab_data, scopes)
+        if changed:
+            self.sort_venv_table(tab_data)
+        reread = {
+            info.venv_name for _, _, venv_infos in scopes for info in venv_infos
+        }
+        if changed or dir_stamps or reread:
+            # the whole directory was rescanned
+            full_scan = any(
+                scope == "" and not exact for scope, exact, _ in scopes
+            )
+            get_data.cache_venvs(
+                path,
+                depth,
+                tab_data["model"].venvs(),
+                dir_stamps,
+                full_scan=full_scan,
+                reread=reread
+            )
+
+        self.update_venv_watcher(tab_data)
+        self.measure_venv_sizes(tab_data, reread)
+        self.check_venvs_health(tab_data, reread)
+        self.idle_load_timer.start()
+
+
+    def measure_venv_sizes(self, tab_data, venv_names=()):
+        """
+        Measure the disk usage of `venv_names` and of all venvs of
+        a tab without a size in the background. Unchanged venvs are
+        answered from the cache.
+        """
+        if tab_data.get("listing") is None:
+            return
+
+        model = tab_data["model"]
+        names = set(venv_names)
+        names.update(model.venvs_without_size())
+        names.intersection_update(model.venv_names())
+        if not names:
+            return
+
+        self.cancel_venv_sizes(tab_data)
+        token = next(self._scan_tokens)
+        tab_data["size_token"] = token
+        self._size_tabs[token] = tab_data
+        self.track_background_job(
+            token,
+            "Measure disk usage",
+            tab_data["listing"][0],
+            partial(self.cancel_venv_sizes, tab_data)
+        )
+        self.start_size_measure.emit(
+            token, tab_data["listing"][0], sorted(names)
+        )
+
+
+    def cancel_venv_sizes(self, tab_data):
+        """Stop measuring the venvs of a tab, if running.
+        """
+        token = tab_data.pop("size_token", None)
+        if token is not None and self._size_tabs.pop(token, None):
+            self.size_worker.cancel(token)
+            self.complete_background_job(token, JOB_CANCELLED)
+
+
+    @pyqtSlot(int, str, object)
+    def on_venv_size_measured(self, token, venv_name, size):
+        """Show the disk usage of a venv.
+        """
+        tab_data = self._size_tabs.get(token)
+        if tab_data is not None:
+            tab_data["model"].set_size(venv_name, size)
+
+
+    @pyqtSlot(int)
+    def on_venv_sizes_finished(self, token):
+        """Resort the table if it's sorted by size.
+        """
+        tab_data = self._size_tabs.pop(token, None)
+        if tab_data is None:
+            return
+
+        tab_data.pop("size_token", None)
+        self.complete_background_job(token)
+        header = tab_data["table"].horizontalHeader()
+        if header.sortIndicatorSection() == VenvModel.SIZE_COLUMN:
+            self.sort_venv_table(tab_data)
+
+
+    def check_venvs_health(self, tab_data, venv_names=()):
+        """
+        Check the health of `venv_names` and of all venvs of a tab
+        that haven't been checked yet in the background.
+        """
+        if tab_data.get("listing") is None:
+            return
+
+        model = tab_data["model"]
+        names = set(venv_names)
+        names.update(model.venvs_without_health())
+        names.intersection_update(model.venv_names())
+        if not names:
+            return
+
+        self.cancel_health_check(tab_data)
+        token = next(self._scan_tokens)
+        tab_data["health_token"] = token
+        self._health_tabs[token] = tab_data
+        self.track_background_job(
+            token,
+            "Check venv health",
+            tab_data["listing"][0],
+            partial(self.cancel_health_check, tab_data)
+        )
+        self.start_health_check.emit(
+            token, tab_data["listing"][0], sorted(names)
+        )
+
+
+    def cancel_health_check(self, tab_data):
+        """Stop checking the venvs of a tab, if running.
+        """
+        token = tab_data.pop("health_token", None)
+        if token is not None and self._health_tabs.pop(token, None):
+            self.health_checker.cancel(token)
+            self.complete_background_job(token, JOB_CANCELLED)
+
+
+    @pyqtSlot(int, list)
+    def on_venvs_checked(self, token, results):
+        """Show the health status of a batch of venvs.
+        """
+        tab_data = self._health_tabs.get(token)
+        if tab_data is None:
+            return
+
+        model = tab_data["model"]
+        for venv_name, venv_health in results:
+            model.set_health(venv_name, venv_health)
+
+
+    @pyqtSlot(int)
+    def on_health_check_finished(self, token):
+        """Resort the table if it's sorted by status.
+        """
+        tab_data = self._health_tabs.pop(token, None)
+        if tab_data is None:
+            return
+
+        tab_data.pop("health_token", None)
+        self.complete_background_job(token)
+        header = tab_data["table"].horizontalHeader()
+        if header.sortIndicatorSection() == VenvModel.STATUS_COLUMN:
+            self.sort_venv_table(tab_data)
+
+
+    def show_jobs_dialog(self):
+        """Show the jobs panel.
+        """
+        if self.jobs_dialog is None:
+            self.jobs_dialog = JobsDialog(self.job_manager, self)
+        self.jobs_dialog.show()
+        self.jobs_dialog.raise_()
+        self.jobs_dialog.activateWindow()
+
+
+    def track_background_job(self, token, title, path, cancel):
+        """
+        Show the background request with `token` in the jobs panel.
+        Background jobs aren't kept in the job history.
+        """
+        self._background_jobs[token] = self.job_manager.track(Job(
+            title=title,
+            venv=path,
+            priority=PRIORITY_BACKGROUND,
+            persist=False,
+            cancel_callback=cancel
+        ))
+
+
+    def complete_background_job(self, token, state=None):
+        """Record the end of the background request with `token`.
+        """
+        job = self._background_jobs.pop(token, None)
+        if job is not None:
+            self.job_manager.complete(job, None, state)
+
+
+    def select_broken_venvs(self, tab_widget=None):
+        """Select all venvs of a tab that were found broken.
+        """
+        tab_data = self.get_tab_data(tab_widget)
+        if tab_data is None:
+            return
+
+        table = tab_data["table"]
+        proxy = table.model()
+        model = tab_data["model"]
+        selection = QItemSelection()
+        for row in model.broken_rows():
+            index = proxy.mapFromSource(model.index(row, 0))
+            if index.isValid():
+                selection.select(index, index)
+
+        table.selectionModel().select(
+            selection,
+            QItemSelectionModel.SelectionFlag.ClearAndSelect
+            | QItemSelectionModel.SelectionFlag.Rows
+        )
+        self.statusBar().showMessage(
+            f"{len(selection)} broken venv(s) selected", 5000
+        )
+
+
+    def on_venv_changed(self, tab_widget, venv_name):
+        """Refresh the row of a venv that was modified or deleted.
+        """
+        tab_data = self.get_tab_data(tab_widget)
+        if tab_data is None or not tab_data["path"]:
+            return
+
+        self.refresh_venv_table(
+            tab_data, [os.path.join(tab_data["path"], venv_name)]
+        )
+
+
+    def update_venv_watcher(self, tab_data):
+        """
+        Watch the directory of a tab, the folders leading to its venvs
+        and (within `WATCH_LIMIT`) the venv folders themselves.
+        """
+        wanted = set()
+        listing = tab_data.get("listing")
+        if listing is not None and "scan_token" not in tab_data:
+            path = listing[0]
+            wanted.add(path)
+            venv_paths = [
+                os.path.join(path, name)
+                for name in tab_data["model"].venv_names()
+            ]
+            for venv_path in venv_paths:
+                parent = os.path.dirname(venv_path)
+                while len(parent) > len(path) and parent not in wanted:
+                    wanted.add(parent)
+                    parent = os.path.dirname(parent)
+
+            if len(wanted) + len(venv_paths) <= WATCH_LIMIT:
+                wanted.update(venv_paths)
+
+            tab_data["watch_extra"] = {
+                extra for extra in tab_data["watch_extra"]
+                if extra not in wanted and os.path.isdir(extra)
+            }
+            for extra in sorted(tab_data["watch_extra"]):
+                if len(wanted) >= WATCH_LIMIT:
+                    break
+                wanted.add(extra)
+
+        watcher = tab_data["watcher"]
+        watched = set(watcher.directories())
+        if watched - wanted:
+            watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            watcher.addPaths(list(wanted - watched))
+
+
+    def on_venv_dir_changed(self, tab_widget, path):
+        """Collect changed directories and restart the debounce timer.
+        """
+        tab_data = self.get_tab_data(tab_widget)
+        if tab_data is None:
+            return
+
+        tab_data["changed_paths"].add(path)
+        tab_data["watch_timer"].start()
+
+
+    def on_venv_watch_timeout(self, tab_widget):
+        """Rescan the directories that changed since the last refresh.
+        """
+        tab_data = self.get_tab_data(tab_widget)
+        if tab_data is None or "scan_token" in tab_data:
+            return
+
+        paths = tab_data["changed_paths"]
+        tab_data["changed_paths"] = set()
+        if paths:
+            self.refresh_venv_table(tab_data, paths)
+
+
+    def set_scan_depth(self, tab_widget, depth):
+        """Change how deep a tab searches for venvs and reload it.
+        """
+        tab_data = self.get_tab_data(tab_widget)
+        if tab_data is None or tab_data.get("depth", 1) == depth:
+            return
+
+        tab_data["depth"] = depth
+        self.pop_venv_table(tab_widget, use_cache=True)
 
 
     def update_label(self, tab_data=None):
@@ -797,7 +1443,7 @@ class MainWindow(QMainWindow):
         if active_dir != "":
             tab_data["path"] = active_dir
             self.set_active_dir(active_dir)
-            self.pop_venv_table(tab_data["widget"])
+            self.pop_venv_table(tab_data["widget"], use_cache=True)
             self.update_label(tab_data)
 
 
@@ -821,7 +1467,7 @@ class MainWindow(QMainWindow):
                     if current_index >= 0:
                         self.venv_tabs.setTabText(current_index, title)
                     self.set_active_dir(directory)
-                    self.pop_venv_table(current_data["widget"])
+                    self.pop_venv_table(current_data["widget"], use_cache=True)
                     self.update_label(current_data)
                     return
 
@@ -831,7 +1477,7 @@ class MainWindow(QMainWindow):
             self.set_active_dir(directory)
 
 
-    def create_venv_tab(self, title, active_dir):
+    def create_venv_tab(self, title, active_dir, depth=1):
         """Create a new venv tab.
         """
         tab_widget = QWidget(self)
@@ -871,8 +1517,40 @@ class MainWindow(QMainWindow):
         )
         active_dir_button.setFixedSize(30, 30)
 
+        depth_spin_box = QSpinBox(
+            prefix="Depth: ",
+            minimum=1,
+            maximum=get_data.SCAN_MAX_DEPTH,
+            value=max(1, min(depth, get_data.SCAN_MAX_DEPTH)),
+            toolTip="How many folder levels to search for venvs",
+            statusTip="Search subfolders for nested virtual environments"
+        )
+        depth_spin_box.setFixedHeight(30)
+        depth_spin_box.valueChanged.connect(
+            partial(self.set_scan_depth, tab_widget)
+        )
+
+        filter_line = QLineEdit(
+            placeholderText="Filter venvs",
+            clearButtonEnabled=True,
+            toolTip="Show only venvs containing this text",
+            statusTip="Filter the venv table"
+        )
+        filter_line.setFixedSize(200, 30)
+
+        select_broken_button = QToolButton(
+            text="!",
+            toolTip="Select broken venvs",
+            statusTip="Select all venvs the health check found broken",
+            clicked=partial(self.select_broken_venvs, tab_widget)
+        )
+        select_broken_button.setFixedSize(30, 30)
+
         header_layout.addWidget(label)
         header_layout.addStretch(1)
+        header_layout.addWidget(filter_line)
+        header_layout.addWidget(select_broken_button)
+        header_layout.addWidget(depth_spin_box)
         header_layout.addWidget(new_venv_button)
         header_layout.addWidget(add_tab_button)
         header_layout.addWidget(reload_button)
@@ -884,7 +1562,8 @@ class MainWindow(QMainWindow):
             editTriggers=QAbstractItemView.EditTrigger.NoEditTriggers,
             alternatingRowColors=True,
             sortingEnabled=True,
-            refresh=partial(self.pop_venv_table, tab_widget),
+            refresh=partial(self.refresh_venv_table, tab_widget),
+            venv_changed=partial(self.on_venv_changed, tab_widget),
             start_installer=self.pkg_installer.launch,
             start_pkg_manager=self.pkg_manager.launch
         )
@@ -898,25 +1577,42 @@ class MainWindow(QMainWindow):
         h_header_venv_table.setStretchLastSection(True)
 
         # set table view model
-        model_venv_table = QStandardItemModel(0, 4, tab_widget)
-        model_venv_table.setHorizontalHeaderLabels([
-            "Venv",
-            "Version",
-            "Packages",
-            "Installed",
-            "Description"
-        ])
-        venv_table.setModel(model_venv_table)
+        model_venv_table = VenvModel(tab_widget)
+        proxy_venv_table = VenvFilterProxyModel(tab_widget)
+        proxy_venv_table.setSourceModel(model_venv_table)
+        venv_table.setModel(proxy_venv_table)
+        filter_line.textChanged.connect(proxy_venv_table.setFilterFixedString)
+        venv_table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+
+        # show status and size before description, which fills up the rest
+        h_header_venv_table.moveSection(VenvModel.SIZE_COLUMN, 4)
+        h_header_venv_table.moveSection(VenvModel.STATUS_COLUMN, 4)
 
         # adjust column width
         venv_table.setColumnWidth(0, 225)
         venv_table.setColumnWidth(1, 120)
         venv_table.setColumnWidth(2, 100)
         venv_table.setColumnWidth(3, 80)
+        venv_table.setColumnWidth(VenvModel.SIZE_COLUMN, 90)
+        venv_table.setColumnWidth(VenvModel.STATUS_COLUMN, 80)
 
         tab_layout.addLayout(header_layout)
         tab_layout.addWidget(venv_table)
 
+        # update the table when the directory content changes
+        watcher = QFileSystemWatcher(tab_widget)
+        watcher.directoryChanged.connect(
+            partial(self.on_venv_dir_changed, tab_widget)
+        )
+        watch_timer = QTimer(
+            tab_widget,
+            singleShot=True,
+            interval=WATCH_DEBOUNCE_MS
+        )
+        watch_timer.timeout.connect(
+            partial(self.on_venv_watch_timeout, tab_widget)
+        )
+
         self.venv_tabs.addTab(tab_widget, title)
         tab_data = {
             "widget": tab_widget,
@@ -924,13 +1620,21 @@ class MainWindow(QMainWindow):
             "table": venv_table,
             "model": model_venv_table,
             "path": active_dir,
-            "title": title
+            "title": title,
+            "depth": depth_spin_box.value(),
+            "loaded": False,
+            "listing": None,
+            "watcher": watcher,
+            "watch_timer": watch_timer,
+            "watch_extra": set(),
+            "changed_paths": set()
         }
         self.venv_tabs_data.append(tab_data)
         self.venv_tab_map[tab_widget] = tab_data
 
+        # the table is populated when the tab is shown first
+        # or later in the background (see `load_next_venv_tab()`)
         self.update_label(tab_data)
-        self.pop_venv_table(tab_widget)
 
         return tab_data
 
@@ -956,7 +1660,11 @@ class MainWindow(QMainWindow):
         for tab in tabs:
             path = tab.get("path", "")
             title = tab.get("title") or self.next_venv_tab_title(path)
-            self.create_venv_tab(title, path)
+            try:
+                depth = int(tab.get("depth", 1))
+            except (TypeError, ValueError):
+                depth = 1
+            self.create_venv_tab(title, path, depth)
 
         active_index = state.get("active_index", 0)
         if 0 <= active_index < self.venv_tabs.count():
@@ -976,7 +1684,8 @@ class MainWindow(QMainWindow):
                 continue
             tabs.append({
                 "title": self.venv_tabs.tabText(i),
-                "path": tab_data.get("path", "")
+                "path": tab_data.get("path", ""),
+                "depth": tab_data.get("depth", 1)
             })
 
         active_index = self.venv_tabs.currentIndex()
@@ -1081,6 +1790,7 @@ class MainWindow(QMainWindow):
 
         self.set_active_dir(tab_data["path"])
         self.update_label(tab_data)
+        self.load_venv_tab(tab_data)
 
 
     def launch_venv_wizard(self):
@@ -1097,9 +1807,9 @@ class MainWindow(QMainWindow):
         tab_widget = self._wizard_refresh_tab
 
         if tab_widget is not None and tab_widget in self.venv_tab_map:
-            self.pop_venv_table(tab_widget)
+            self.refresh_venv_table(tab_widget)
         else:
-            self.pop_venv_table()
+            self.refresh_venv_table()
 
         self._wizard_refresh_tab = None
 
@@ -1121,6 +1831,10 @@ class MainWindow(QMainWindow):
             self.venv_tabs_data.remove(tab_data)
 
         if tab_data:
+            self.cancel_venv_scan(tab_data)
+            self.cancel_venv_sizes(tab_data)
+            self.cancel_health_check(tab_data)
+            tab_data["watch_timer"].stop()
             table = tab_data.get("table")
 
             if table and hasattr(table, "thread"):
@@ -1217,7 +1931,6 @@ def main():
     get_data.get_python_installs(True)
     main_window.pop_interpreter_table()
     main_window.venv_wizard.basic_settings.pop_combo_box()
-    main_window.pop_venv_table()
     main_window.update_label()
     main_window.show()
 
@@ -0,0 +1,350 @@
+#    VenviPy - A Virtual Environment Manager for Python.
+#    Copyright (C) 2021 - Youssef Serestou - sinusphi.sq@gmail.com
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License or any
+#    later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of the GNU General Public License version 3 named LICENSE is
+#    in the root directory of VenviPy.
+#    If not, see <https://www.gnu.org/licenses/licenses.en.html#GPL>.
+
+# -*- coding: utf-8 -*-
+"""
+This module manages the wheelhouse, a directory of wheels shared by
+all venvs (`get_data.WHEELHOUSE_DIR`).
+
+Plain package installs first run `pip wheel` into the wheelhouse, which
+only downloads (or builds) wheels that aren't there yet, then install
+with `--no-index --find-links <wheelhouse>`. Other installs get the
+wheelhouse as an additional `--find-links` location.
+
+The wheels are recorded by file name and SHA-256 hash in
+`get_data.WHEELHOUSE_INDEX`, together with the time they were last
+used. The least recently used wheels are removed when the wheelhouse
+grows above `WHEELHOUSE_LIMIT`.
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import get_data
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 2048  # MiB
+
+
+def _limit_from_env() -> int:
+    """
+    Return the size limit set in MiB by `VENVIPY_WHEELHOUSE_LIMIT` in
+    bytes, or the default if it's not a number.
+    """
+    value = os.environ.get("VENVIPY_WHEELHOUSE_LIMIT", "").strip()
+    if value:
+        try:
+            return max(0, int(value)) * 1024 ** 2
+        except ValueError:
+            logger.warning(
+                f"Invalid VENVIPY_WHEELHOUSE_LIMIT '{value}', "
+                f"using {DEFAULT_LIMIT} MiB"
+            )
+    return DEFAULT_LIMIT * 1024 ** 2
+
+
+WHEELHOUSE_ENABLED = os.environ.get("VENVIPY_WHEELHOUSE", "1") != "0"
+WHEELHOUSE_LIMIT = _limit_from_env()  # bytes
+PRUNE_GRACE = 3600  # seconds a used wheel is kept in any case
+
+# options of `pip install` that `pip wheel` understands too
+SHARED_FLAGS = ("--pre", "--no-deps", "--prefer-binary")
+SHARED_OPTIONS = ("--progress-bar", "-c", "--constraint")
+# options only meaning something to `pip install`
+INSTALL_FLAGS = (
+    "-U", "--upgrade", "-I", "--ignore-installed", "--force-reinstall"
+)
+INSTALL_OPTIONS = ("--upgrade-strategy",)
+REQUIREMENT_OPTIONS = ("-r", "--requirement")
+
+PLAIN_REQUIREMENT = re.compile(
+    r"^[A-Za-z0-9][A-Za-z0-9._-]*"  # name
+    r"(\[[A-Za-z0-9._,\s-]*\])?"  # extras
+    r"(\s*(===|==|!=|~=|<=|>=|<|>)\s*[A-Za-z0-9.*+!_-]+"
+    r"(\s*,\s*(===|==|!=|~=|<=|>=|<|>)\s*[A-Za-z0-9.*+!_-]+)*)?$"  # versions
+)
+WHEEL_NAME = re.compile(r"([^\s/\\'\"]+\.whl)\b")
+
+_lock = threading.Lock()
+
+
+
+#]===========================================================================[#
+#] PIP ARGUMENTS [#==========================================================[#
+#]===========================================================================[#
+
+def find_links_options() -> List[str]:
+    """
+    Return the options adding the wheelhouse as a `--find-links`
+    location (pip warns about missing ones, so it's created).
+    """
+    if not WHEELHOUSE_ENABLED:
+        return []
+    ensure_wheelhouse()
+    return ["--find-links", str(get_data.WHEELHOUSE_DIR)]
+
+
+def is_plain_requirement(spec) -> bool:
+    """
+    Return `True` if `spec` names a package from an index, like
+    `requests` or `requests[socks]>=2.0`, not a path, URL or VCS link.
+    """
+    return PLAIN_REQUIREMENT.match(spec.strip()) is not None
+
+
+def _requirement_lines(path) -> Optional[List[str]]:
+    """
+    Return the requirements of a requirements file without comments,
+    `None` if it can't be read.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    requirements = []
+    for line in lines:
+        line = line.split(" #", 1)[0].strip()
+        if line and not line.startswith("#"):
+            requirements.append(line)
+    return requirements
+
+
+def is_plain_requirements_file(path) -> bool:
+    """Return `True` if every line of a requirements file is plain.
+    """
+    requirements = _requirement_lines(path)
+    if requirements is None:
+        return False
+    return all(is_plain_requirement(line) for line in requirements)
+
+
+def prefetch_args(install_args, installed=None) -> Optional[List[str]]:
+    """
+    Return the `pip wheel` arguments that put everything `install_args`
+    needs into the wheelhouse, or `None` if the install can't be served
+    from it (paths, URLs, editables or unknown options) or there's
+    nothing to fetch.
+
+    `installed` maps the canonical names of the packages installed in
+    the venv to their versions (see `get_data.installed_versions()`).
+    Requirements they satisfy aren't fetched, as `pip wheel` would
+    fetch their whole dependency closure for a no-op install. Installs
+    that upgrade or reinstall fetch everything, since `pip wheel` gets
+    the newest matching versions they install.
+    """
+    if not WHEELHOUSE_ENABLED or install_args[:1] != ["install"]:
+        return None
+
+    upgrade = any(arg in INSTALL_FLAGS for arg in install_args[1:])
+
+    def satisfied(requirements):
+        return installed is not None and not upgrade and all(
+            get_data.requirement_satisfied(requirement, installed)
+            for requirement in requirements
+        )
+
+    wheel_args = []
+    specs = 0
+    args = iter(install_args[1:])
+    for arg in args:
+        option, has_value, value = arg.partition("=")
+        if option in INSTALL_FLAGS and not has_value:
+            continue
+        if option in SHARED_FLAGS and not has_value:
+            wheel_args.append(arg)
+        elif option in INSTALL_OPTIONS + SHARED_OPTIONS + REQUIREMENT_OPTIONS:
+            if not has_value:
+                value = next(args, None)
+                if value is None:
+                    return None
+            if option in REQUIREMENT_OPTIONS:
+                if not is_plain_requirements_file(value):
+                    return None
+                if satisfied(_requirement_lines(value)):
+                    continue
+                specs += 1
+            if option not in INSTALL_OPTIONS:
+                wheel_args.extend([option, value])
+        elif not arg.startswith("-") and is_plain_requirement(arg):
+            if satisfied([arg]):
+                continue
+            wheel_args.append(arg)
+            specs += 1
+        else:
+            return None
+
+    if not specs:
+        return None
+
+    ensure_wheelhouse()
+    wheel_dir = str(get_data.WHEELHOUSE_DIR)
+    return ["wheel", "--wheel-dir", wheel_dir, "--find-links", wheel_dir] + (
+        wheel_args
+    )
+
+
+def offline_install_args(install_args) -> List[str]:
+    """Return `install_args` installing from the wheelhouse only.
+    """
+    return install_args[:1] + ["--no-index"] + find_links_options() + (
+        install_args[1:]
+    )
+
+
+def online_install_args(install_args) -> List[str]:
+    """Return `install_args` preferring wheels from the wheelhouse.
+    """
+    return install_args[:1] + find_links_options() + install_args[1:]
+
+
+def wheel_names(text) -> Set[str]:
+    """Return the file names of the wheels mentioned in pip output.
+    """
+    return set(WHEEL_NAME.findall(text))
+
+
+
+#]===========================================================================[#
+#] INDEX [#==================================================================[#
+#]===========================================================================[#
+
+def ensure_wheelhouse():
+    """Create the wheelhouse directory.
+    """
+    get_data.ensure_confdir()
+    get_data.WHEELHOUSE_DIR.mkdir(exist_ok=True)
+
+
+def _file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_index() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(get_data.WHEELHOUSE_INDEX, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _save_index(index) -> None:
+    tmp_file = f"{get_data.WHEELHOUSE_INDEX}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp_file, get_data.WHEELHOUSE_INDEX)
+    except OSError as e:
+        logger.warning(f"Failed to save wheelhouse index: {e}")
+
+
+def _prune(index, limit, now) -> None:
+    """Remove the least recently used wheels until `limit` is met.
+    """
+    total = sum(record["size"] for record in index.values())
+    for name, record in sorted(
+            index.items(),
+            key=lambda item: item[1]["last_used"]
+        ):
+        if total <= limit or now - record["last_used"] < PRUNE_GRACE:
+            break
+        try:
+            os.remove(get_data.WHEELHOUSE_DIR / name)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove '{name}' from wheelhouse: {e}")
+            continue
+        logger.debug(f"Removed '{name}' from wheelhouse")
+        total -= record["size"]
+        del index[name]
+
+
+def update_wheelhouse(used: Iterable[str] = (), limit=WHEELHOUSE_LIMIT):
+    """
+    Record new and changed wheels in the index, mark the `used` ones
+    as recently used and prune the wheelhouse down to `limit` bytes.
+    """
+    if not WHEELHOUSE_ENABLED:
+        return
+
+    with _lock:
+        index = _load_index()
+        now = time.time()
+        files = {}
+        try:
+            with os.scandir(get_data.WHEELHOUSE_DIR) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".whl") and entry.is_file():
+                        files[entry.name] = entry.stat()
+        except OSError:
+            return
+
+        for name in index.keys() - files.keys():
+            del index[name]
+
+        for name, st in files.items():
+            record = index.get(name)
+            if (
+                record is not None
+                and record.get("size") == st.st_size
+                and record.get("mtime") == st.st_mtime_ns
+            ):
+                continue
+            try:
+                sha256 = _file_hash(get_data.WHEELHOUSE_DIR / name)
+            except OSError:
+                continue
+            logger.debug(f"Added '{name}' to wheelhouse")
+            index[name] = {
+                "sha256": sha256,
+                "size": st.st_size,
+                "mtime": st.st_mtime_ns,
+                "last_used": now,
+            }
+
+        for name in used:
+            if name in index:
+                index[name]["last_used"] = now
+
+        _prune(index, limit, now)
+        _save_index(index)
+
+
+def update_wheelhouse_later(used: Iterable[str] = ()):
+    """Run `update_wheelhouse()` in a separate thread.
+    """
+    if WHEELHOUSE_ENABLED:
+        threading.Thread(
+            target=update_wheelhouse,
+            args=(set(used),),
+            name="venvipy-wheelhouse",
+            daemon=True
+        ).start()
@@ -24,7 +24,6 @@ import sys
 import os
 import csv
 import logging
-import subprocess
 from functools import partial
 from pathlib import Path
 
@@ -65,7 +64,7 @@ import venvipy_rc  # pylint: disable=unused-import
 import get_data
 import creator
 from dialogs import ProgBarDialog, ConsoleDialog
-from pkg_installer import ResultsTable
+from pkg_installer import ResultsTable, InstallBasket, InstallPackagesMixin
 from creator import CreationWorker
 from manage_pip import PipManager
 from platforms import get_platform
@@ -556,7 +555,7 @@ class BasicSettings(QWizardPage):
         binary_path = Path(
             self.venv_location
         ) / self.venv_name / platform.venv_bin_dir_name()
-        version = get_data.get_config(cfg_file, cfg="version")
+        version = get_data.read_venv_config(cfg_file).version
         default_msg = (
             f"Virtual environment created \nsuccessfully. \n\n"
             f"New {version[:-2]} executable in \n"
@@ -579,7 +578,7 @@ class BasicSettings(QWizardPage):
 
 
 
-class InstallPackages(QWizardPage):
+class InstallPackages(InstallPackagesMixin, QWizardPage):
     """
     Install packages via Pip into the created virtual environment.
     """
@@ -591,7 +590,8 @@ class InstallPackages(QWizardPage):
             "Specify the packages you want to install into the virtual "
             "environment. For more options right-click on the item you "
             "want to install. "
-            "You can install multiple packages. When finished "
+            "You can install multiple packages at once by selecting "
+            "them or adding them to the basket. When finished "
             "click next."
         )
 
@@ -619,7 +619,8 @@ class InstallPackages(QWizardPage):
             alternatingRowColors=True,
             sortingEnabled=True,
             doubleClicked=self.install_package,
-            context_triggered=self.install_package
+            context_triggered=self.install_package,
+            basket_triggered=self.add_to_basket
         )
 
         # hide vertical header
@@ -639,6 +640,12 @@ class InstallPackages(QWizardPage):
         grid_layout.addWidget(self.search_button, 0, 2, 1, 1)
         grid_layout.addWidget(self.results_table, 1, 0, 1, 3)
 
+        # packages to install with one pip run
+        self.basket = InstallBasket(self)
+        self.basket.setMaximumHeight(140)
+        self.basket.install_requested.connect(self.install_basket)
+        grid_layout.addWidget(self.basket, 2, 0, 1, 3)
+
 
     def initializePage(self):
         self.python_version = self.field("python_version")
@@ -658,6 +665,7 @@ class InstallPackages(QWizardPage):
 
         # clear all inputs and contents
         self.results_table_model.clear()
+        self.basket.clear()
         self.pkg_name_line.clear()
         self.pkg_name_line.setFocus()
 
@@ -699,6 +707,7 @@ class InstallPackages(QWizardPage):
         self.manager = PipManager(self.venv_location, self.venv_name)
         self.manager.started.connect(self.console.exec)
         self.manager.text_changed.connect(self.console.update_status)
+        self.manager.progress_changed.connect(self.console.update_progress)
 
         # start installing packages from requirements file
         self.manager.run_pip(
@@ -743,45 +752,6 @@ class InstallPackages(QWizardPage):
                 )
 
 
-    def install_package(self):
-        """
-        Get the name of the selected item from the results table. Then install
-        the selected package into the created virtual environment.
-        """
-        indexes = self.results_table.selectionModel().selectedRows()
-        for index in sorted(indexes):
-            self.pkg = index.data()
-
-        msg_box_question = QMessageBox.question(
-            self,
-            "Confirm", f"Are you sure you want to install '{self.pkg}'?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel
-        )
-
-        if msg_box_question == QMessageBox.StandardButton.Yes:
-            self.console.setWindowTitle(f"Installing {self.pkg}")
-
-            self.manager = PipManager(
-                self.venv_location,
-                self.venv_name
-            )
-            # open the console when recieving signal from manager
-            self.manager.started.connect(self.console.exec)
-            self.manager.text_changed.connect(self.console.update_status)
-
-            # start installing the selected package
-            logger.debug(f"Installing '{self.pkg}'...")
-            self.manager.run_pip(creator.cmds[0], [creator.opts[0], self.pkg])
-
-            # clear the content when closing console
-            if self.console.close:
-                self.console.console_window.clear()
-
-                # clear search input line
-                self.pkg_name_line.clear()
-                self.pkg_name_line.setFocus()
-
-
     def save_requirements(self):
         """
         Ask if user want to save a requirements of the
@@ -821,20 +791,17 @@ class InstallPackages(QWizardPage):
                 self.setEnabled(True)
                 return
 
-            platform = get_platform()
-            venv_python = platform.venv_python_path(venv_dir)
             try:
-                with open(save_path, "w", encoding="utf-8") as f:
-                    subprocess.run([
-                        str(venv_python),
-                        "-m",
-                        "pip",
-                        "freeze"],
-                        stdout=f,
-                        check=False,
-                    )
-            except subprocess.CalledProcessError as e:
+                get_data.save_requirements(
+                    self.venv_location, self.venv_name, save_path, probe=False
+                )
+            except OSError as e:
                 logger.debug(f"Failed to save requirements: {e}")
+                QMessageBox.warning(
+                    self, "Error", f"Could not save requirements:\n{e}"
+                )
+                self.setEnabled(True)
+                return
 
             logger.debug(f"Saved '{save_path}'")
             QMessageBox.information(